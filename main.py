@@ -70,6 +70,30 @@ def run_sub_task(action):
     game.stop(False)
 
 
+def run_benchmark_action():
+    """比较截图方式的耗时和 CPU 占用"""
+    from module.game import cloud_game
+    game.start()
+    cloud_game.benchmark_capture()
+    game.stop(False)
+
+
+def run_benchmark_match_action():
+    """比较金字塔匹配与原分辨率匹配的结果和耗时，不需要启动游戏"""
+    from utils.image_utils import ImageUtils
+    results = ImageUtils.benchmark_pyramid_match(logger=log)
+    if results["mismatches"]:
+        sys.exit(1)
+
+
+def run_benchmark_ocr_replace_action():
+    """比较OCR文字替换引擎与逐条替换的结果和耗时，不需要启动游戏"""
+    from module.ocr.replacer import OcrReplacer
+    results = OcrReplacer.benchmark(logger=log)
+    if results["mismatches"]:
+        sys.exit(1)
+
+
 '''def run_notify_action():
     notif.notify(content=cfg.notify_template['TestMessage'], image="./assets/app/images/March7th.jpg", level=NotificationLevel.ALL)
     
@@ -87,6 +111,14 @@ def main(action=None):
     elif action in ["daily", "power", "currencywars", "currencywarsloop", "fight", "universe", "forgottenhall", "purefiction", "apocalyptic", "redemption"]:
         run_sub_task(action)
 
+    elif action == "benchmark":
+        run_benchmark_action()
+
+    elif action == "benchmark_match":
+        run_benchmark_match_action()
+
+    elif action == "benchmark_ocr_replace":
+        run_benchmark_ocr_replace_action()
 
     else:
         log.error(f"未知任务: {action}")
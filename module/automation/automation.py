@@ -1,15 +1,23 @@
 import time
 import math
-import cv2
-import numpy as np
 
 from .screenshot import Screenshot
+from .frame import Frame
+from .frame_source import ScreencastFrameSource, PrefetchFrameSource
+from .template_regions import TemplateRegionIndex
+from .template_bank import TemplateBank
+from .wait import wait_for_any
+from .change_detector import ChangeDetector
+from .color_mask import ColorMask
+from .pixel_signature import PixelAnchorIndex
 from utils.logger.logger import Logger
 from typing import Optional
 from utils.singleton import SingletonMeta
 from utils.image_utils import ImageUtils
 from module.game import get_game_controller
-from module.ocr import ocr
+from module.ocr import ocr, digit_reader
+from module.ocr.text_index import OcrTextIndex
+from module.config import cfg
 
 
 class Automation(metaclass=SingletonMeta):
@@ -24,9 +32,16 @@ class Automation(metaclass=SingletonMeta):
         """
         self.window_title = window_title
         self.logger = logger
-        self.screenshot = None
+        self.frame = None  # 当前截图帧
+        self._find_cache_frame_id = None  # 查找结果缓存对应的截图帧ID
+        self._find_cache = {}  # 当前截图帧上的查找结果缓存
+        self._text_index = None  # 当前 OCR 结果的文本查询索引
         self._init_input()
-        self.img_cache = {}
+        self._init_frame_source()
+        self._init_template_regions()
+        self.template_bank = TemplateBank("./assets/images", self.logger)
+        self.template_bank.preload_async()
+        self.pixel_anchors = PixelAnchorIndex(cfg.pixel_signature_min_hits)
 
     def _init_input(self):
         """
@@ -42,6 +57,55 @@ class Automation(metaclass=SingletonMeta):
         self.secretly_press_key = self.input_handler.secretly_press_key
         self.press_mouse = self.input_handler.press_mouse
         self.secretly_write = self.input_handler.secretly_write
+        self.input_sequence = self.input_handler.sequence
+
+    def _init_frame_source(self):
+        """
+        初始化帧源，推送和预取都未开启时截图始终走拉取路径。
+        """
+        self.frame_source = None
+        if cfg.cloud_game_prefetch_enable and not cfg.cloud_game_screencast_enable:
+            self.frame_source = PrefetchFrameSource(
+                get_game_controller(),
+                Screenshot.take_full_frame,
+                self.logger,
+                depth=cfg.cloud_game_prefetch_depth,
+                max_frame_age=cfg.cloud_game_prefetch_max_frame_age,
+            )
+        if cfg.cloud_game_screencast_enable:
+            self.frame_source = ScreencastFrameSource(
+                get_game_controller(),
+                self.logger,
+                max_fps=cfg.cloud_game_screencast_max_fps,
+                max_frame_age=cfg.cloud_game_screencast_max_frame_age,
+                buffer_size=cfg.cloud_game_screencast_buffer_size,
+                image_format=cfg.cloud_game_screencast_format,
+                quality=cfg.cloud_game_screencast_quality,
+            )
+
+    def _init_template_regions(self):
+        """
+        初始化模板区域索引，未开启时模板始终在整张截图中查找。
+        """
+        self.template_regions = None
+        if cfg.template_region_enable:
+            self.template_regions = TemplateRegionIndex(
+                "./assets/config/template_regions.json",
+                "./settings/template_regions.json",
+                margin=cfg.template_region_margin,
+                min_hits=cfg.template_region_min_hits,
+                trusted_hits=cfg.template_region_trusted_hits,
+                logger=self.logger,
+            )
+
+    @property
+    def screenshot(self):
+        """当前截图的 PIL 图片对象，兼容直接读取截图的旧代码"""
+        return self.frame.image if self.frame is not None else None
+
+    @screenshot.setter
+    def screenshot(self, image):
+        self.frame = Frame(image=image) if image is not None else None
 
     def take_screenshot(self, crop=(0, 0, 1, 1)):
         """
@@ -52,10 +116,10 @@ class Automation(metaclass=SingletonMeta):
         start_time = time.time()
         while True:
             try:
-                result = Screenshot.take_screenshot(self.window_title, crop=crop)
+                result = Screenshot.take_screenshot(self.window_title, crop=crop, frame_source=self.frame_source)
                 if result:
-                    self.screenshot, self.screenshot_pos, self.screenshot_scale_factor = result
-                    return result
+                    self.frame, self.screenshot_pos, self.screenshot_scale_factor = result
+                    return self.screenshot, self.screenshot_pos, self.screenshot_scale_factor
                 else:
                     self.logger.error("截图失败：没有找到游戏窗口")
             except Exception as e:
@@ -64,6 +128,78 @@ class Automation(metaclass=SingletonMeta):
             if time.time() - start_time > 60:
                 raise RuntimeError("截图超时")
 
+    def use_frame(self, frame, crop=(0, 0, 1, 1)):
+        """
+        把已有截图帧的指定区域设为当前截图，之后可以用 take_screenshot=False 在该区域内查找，
+        同一帧上的多次查找不需要重复截图。
+        :param frame: 完整截图帧。
+        :param crop: 裁剪区域，格式为(x, y, width, height)的比例值，默认为全屏。
+        """
+        self.frame, self.screenshot_pos, self.screenshot_scale_factor = Screenshot.crop_frame(frame.root, crop)
+
+    def wait_for_any(self, conditions, timeout, interval=0.2):
+        """
+        等待任意一个条件满足，每张新截图只截取一次，所有条件共用。
+        :param conditions: 等待条件列表，见 module.automation.wait。
+        :param timeout: 超时时间（秒）。
+        :param interval: 两次截图之间的最小间隔（秒）。
+        :return: 第一个满足的条件，超时返回None。
+        """
+        change_detector = None
+        if cfg.change_detect_enable:
+            change_detector = ChangeDetector(
+                pixel_threshold=cfg.change_detect_pixel_threshold,
+                max_skip_time=cfg.change_detect_max_skip_time,
+            )
+        try:
+            return wait_for_any(self, conditions, timeout, interval, change_detector)
+        finally:
+            if change_detector is not None and change_detector.skipped:
+                self.logger.debug(f"画面未变化，跳过 {change_detector.skipped} 次检查，实际检查 {change_detector.checked} 次")
+
+    def frame_after(self, action_id=None, min_change=0.0, crop=(0, 0, 1, 1), timeout=1.0, reference=None, interval=0.05, full_frame=False):
+        """
+        等待输入操作之后截取的第一帧，可以要求区域内的画面相对操作前有变化，用来代替操作后固定时间的等待。
+        满足条件时该帧会成为当前截图，之后可以用 take_screenshot=False 在其上查找。
+        :param action_id: 输入操作编号，默认为最近一次操作。
+        :param min_change: 区域内变化像素的最小比例，为0时只要求帧在操作之后截取。
+        :param crop: 检查区域，格式为(x, y, width, height)的比例值。
+        :param timeout: 超时时间（秒）。
+        :param reference: 操作前的参照帧，默认为操作前截取的当前截图；没有可用参照帧时不检查变化。
+        :param interval: 两次截图之间的间隔（秒）。
+        :param full_frame: 是否截取完整画面，为True时仍只在检查区域内比较变化，返回的完整帧可以继续用于其他区域的识别。
+        :return: 满足条件的帧，超时返回None。
+        """
+        controller = get_game_controller()
+        action_time = controller.get_action_time(action_id)
+        if action_time is None:
+            action_time = controller.last_input_time
+        if reference is None and self.frame is not None and self.frame.timestamp < action_time:
+            reference = self.frame
+        width, height = Screenshot.get_window_real_resolution(None)
+        left, top = int(width * crop[0]), int(height * crop[1])
+        box = (left, top, left + int(width * crop[2]), top + int(height * crop[3]))
+        detector = ChangeDetector(pixel_threshold=cfg.change_detect_pixel_threshold)
+        deadline = time.time() + timeout
+        while True:
+            self.take_screenshot((0, 0, 1, 1) if full_frame else crop)
+            frame = self.frame
+            if frame.timestamp >= action_time:
+                if reference is None or min_change <= 0:
+                    return frame
+                difference = detector.difference(reference, frame, box)
+                if difference is None or difference >= min_change:
+                    return frame
+            if time.time() >= deadline:
+                self.logger.debug(f"等待操作 {action_id or controller.last_action_id} 后的画面变化超时")
+                return None
+            time.sleep(interval)
+
+    @property
+    def last_action_id(self):
+        """最近一次输入操作的编号，用于 frame_after"""
+        return get_game_controller().last_action_id
+
     def calculate_positions(self, template, max_loc, relative):
         """
         计算匹配位置。
@@ -93,19 +229,28 @@ class Automation(metaclass=SingletonMeta):
         :return: 最佳匹配位置和相似度。
         """
         try:
-            if cacheable and target in self.img_cache:
-                mask = self.img_cache[target]['mask']
-                template = self.img_cache[target]['template']
-            else:
-                mask = ImageUtils.read_template_with_mask(target)  # 读取模板图片掩码
-                template = cv2.imread(target)  # 读取模板图片
-                if cacheable:
-                    self.img_cache[target] = {'mask': mask, 'template': template}
-            screenshot = cv2.cvtColor(np.array(self.screenshot), cv2.COLOR_BGR2RGB)  # 将截图转换为RGB
-            if mask is not None:
-                matchVal, matchLoc = ImageUtils.scale_and_match_template(screenshot, template, threshold, scale_range, mask)  # 执行缩放并匹配模板
-            else:
-                matchVal, matchLoc = ImageUtils.scale_and_match_template(screenshot, template, threshold, scale_range)  # 执行缩放并匹配模板
+            entry = self.template_bank.get(target, reload=not cacheable)
+            mask = entry.mask  # 模板图片掩码
+            template = entry.bgr  # 模板图片
+            # 整张截图查找时，优先只在模板区域索引给出的区域内匹配；尚不可信的学习区域内未找到时继续全图查找
+            regions = [None]
+            if self.template_regions is not None and self.frame.is_full_screen:
+                region = self.template_regions.lookup(target, self.frame.width, self.frame.height)
+                if region is not None and region[2] - region[0] >= template.shape[1] and region[3] - region[1] >= template.shape[0]:
+                    regions = [region] if self.template_regions.is_trusted(target) else [region, None]
+            for region in regions:
+                search_frame = self.frame.crop(region) if region is not None else self.frame
+                screenshot = search_frame.bgr  # 截图的BGR数据，与模板格式一致
+                if mask is not None:
+                    matchVal, matchLoc = ImageUtils.scale_and_match_template(screenshot, template, threshold, scale_range, mask)  # 执行缩放并匹配模板
+                    found = not math.isinf(matchVal) and (threshold is None or matchVal <= threshold)
+                else:
+                    matchVal, matchLoc = ImageUtils.scale_and_match_template(screenshot, template, threshold, scale_range, pyramid=cfg.template_match_pyramid, template_cache=entry.resize_cache)  # 执行缩放并匹配模板
+                    found = not math.isinf(matchVal) and (threshold is None or matchVal >= threshold)
+                if region is not None:
+                    matchLoc = (matchLoc[0] + region[0], matchLoc[1] + region[1])
+                if found:
+                    break
 
             # 这里的相似度文本说明有问题，对于无mask匹配相似度越高越好。有mask匹配则是越低越好
             self.logger.debug(f"目标图片：{target.replace('./assets/images/', '')} 相似度：{matchVal:.2f} 匹配阈值：{threshold}")
@@ -124,18 +269,56 @@ class Automation(metaclass=SingletonMeta):
             # cv2.waitKey(0)
             # cv2.destroyAllWindows()
 
-            if mask is not None:
-                if not math.isinf(matchVal) and (threshold is None or matchVal <= threshold):
-                    top_left, bottom_right = self.calculate_positions(template, matchLoc, relative)
-                    return top_left, bottom_right, matchVal
-            else:
-                if not math.isinf(matchVal) and (threshold is None or matchVal >= threshold):
-                    top_left, bottom_right = self.calculate_positions(template, matchLoc, relative)
-                    return top_left, bottom_right, matchVal
+            if self.template_regions is not None and found:
+                screen_width, screen_height = self.frame.root.screen_size or self.frame.root.size
+                abs_top_left, abs_bottom_right = self.calculate_positions(template, matchLoc, False)
+                self.template_regions.record_hit(target, abs_top_left, abs_bottom_right, screen_width, screen_height)
+            if found:
+                top_left, bottom_right = self.calculate_positions(template, matchLoc, relative)
+                return top_left, bottom_right, matchVal
         except Exception as e:
             self.logger.error(f"寻找图片出错：{e}")
         return None, None, None
 
+    def find_pixels_element(self, target, threshold, scale_range, relative=False):
+        """
+        通过像素特征查找图像元素。
+        模板在固定位置出现过时，先检查该位置上少量取样点的颜色，全部通过即视为找到；
+        位置未知或取样点未通过时，用 find_image_element 按同一阈值进行模板匹配确认，并记录匹配到的位置。
+        取样点只用于快速确认存在，不会单独判定元素不存在。
+        :param target: 目标图像路径。
+        :param threshold: 相似度阈值，模板匹配时使用。
+        :param scale_range: 缩放范围，模板匹配时使用。
+        :param relative: 是否返回相对位置。
+        :return: 元素的顶点坐标，未找到时返回 (None, None)。
+        """
+        width = height = None
+        try:
+            entry = self.template_bank.get(target)
+            height, width = entry.shape[:2]
+            anchor = self.pixel_anchors.lookup(target)
+            if anchor is not None and self.screenshot_scale_factor == 1:
+                x, y = anchor
+                origin = (x - self.screenshot_pos[0], y - self.screenshot_pos[1])
+                if entry.pixel_signature.matches(self.frame.bgr, origin):
+                    self.pixel_anchors.record_hit(target, (x, y))
+                    self.logger.debug(f"目标图片：{target.replace('./assets/images/', '')} 像素特征匹配")
+                    top_left = origin if relative else (x, y)
+                    return top_left, (top_left[0] + width, top_left[1] + height)
+                self.logger.debug(f"目标图片：{target.replace('./assets/images/', '')} 像素特征未匹配，使用模板匹配确认")
+        except Exception as e:
+            self.logger.error(f"像素特征检查出错：{e}")
+
+        top_left, bottom_right, _ = self.find_image_element(target, threshold, scale_range, relative=False)
+        if top_left is None:
+            return None, None
+        if (bottom_right[0] - top_left[0], bottom_right[1] - top_left[1]) == (width, height):
+            self.pixel_anchors.record_hit(target, top_left)
+        if relative:
+            offset_x, offset_y = self.screenshot_pos[:2]
+            return (top_left[0] - offset_x, top_left[1] - offset_y), (bottom_right[0] - offset_x, bottom_right[1] - offset_y)
+        return top_left, bottom_right
+
     def generate_black_white_map(self, pixel_bgr):
         """生成黑白图，标记与目标像素相似的区域。
 
@@ -145,10 +328,28 @@ class Automation(metaclass=SingletonMeta):
         返回:
         - 黑白图数组。
         """
-        screenshot = cv2.cvtColor(np.array(self.screenshot), cv2.COLOR_BGR2RGB)
-        bw_map = np.zeros(screenshot.shape[:2], dtype=np.uint8)
-        bw_map[np.sum((screenshot - pixel_bgr) ** 2, axis=-1) <= 800] = 255
-        return bw_map
+        return ColorMask.frame_mask(self.frame, pixel_bgr)
+
+    def find_color_element(self, target, threshold=None, relative=False):
+        """
+        查找与目标颜色相近的像素区域。
+        :param target: 目标颜色的BGR值。
+        :param threshold: 允许的最大颜色距离，None 时使用 ColorMask.DEFAULT_TOLERANCE。
+        :param relative: 是否返回相对位置。
+        :return: 所有相近像素外接矩形的顶点坐标，未找到时返回 (None, None)。
+        """
+        tolerance = ColorMask.DEFAULT_TOLERANCE if threshold is None else threshold
+        box = ColorMask.bounding_box(ColorMask.frame_mask(self.frame, target, tolerance))
+        if box is None:
+            self.logger.debug(f"目标颜色：{list(target)} 未找到")
+            return None, None
+        left, top, right, bottom = box
+        self.logger.debug(f"目标颜色：{list(target)} 区域：{box}")
+        scale_factor = self.screenshot_scale_factor if not relative else 1
+        offset_x, offset_y = (0, 0) if relative else self.screenshot_pos[:2]
+        top_left = (int(left / scale_factor) + offset_x, int(top / scale_factor) + offset_y)
+        bottom_right = (int(right / scale_factor) + offset_x, int(bottom / scale_factor) + offset_y)
+        return top_left, bottom_right
 
     def find_image_and_count(self, target, threshold, pixel_bgr):
         """在屏幕截图中查找与目标图片相似的图片，并计算匹配数量。
@@ -162,9 +363,7 @@ class Automation(metaclass=SingletonMeta):
         - 匹配的数量，或在出错时返回 None。
         """
         try:
-            template = cv2.imread(target, cv2.IMREAD_GRAYSCALE)
-            if template is None:
-                raise ValueError("读取图片失败")
+            template = self.template_bank.get(target).gray
             bw_map = self.generate_black_white_map(pixel_bgr)
             return ImageUtils.count_template_matches(bw_map, template, threshold)
         except Exception as e:
@@ -173,11 +372,10 @@ class Automation(metaclass=SingletonMeta):
 
     def find_image_with_multiple_targets(self, target, threshold, scale_range, relative=False):
         try:
-            template = cv2.imread(target, cv2.IMREAD_GRAYSCALE)
-            if template is None:
-                raise ValueError("读取图片失败")
-            screenshot = cv2.cvtColor(np.array(self.screenshot), cv2.COLOR_BGR2GRAY)
-            matches = ImageUtils.scale_and_match_template_with_multiple_targets(screenshot, template, threshold, scale_range)
+            entry = self.template_bank.get(target)
+            template = entry.gray
+            screenshot = self.frame.gray
+            matches = ImageUtils.scale_and_match_template_with_multiple_targets(screenshot, template, threshold, scale_range, entry.resize_cache)
             if len(matches) == 0:
                 return []
             new_matches = []
@@ -227,6 +425,17 @@ class Automation(metaclass=SingletonMeta):
         else:
             return (text in targets, text if text in targets else None)
 
+    def query_text(self, targets, include):
+        """
+        在当前OCR结果中查询目标文本，索引按OCR结果缓存，同一组结果上的多次查询共用。
+        未启用模糊匹配时只做（归一化后的）精确查询。
+        :return: 按匹配程度排列的 TextHit 列表，见 module.ocr.text_index。
+        """
+        results = getattr(self, "ocr_result", None) or []
+        if self._text_index is None or self._text_index.results is not results:
+            self._text_index = OcrTextIndex(results)
+        return self._text_index.query(targets, include, None if cfg.ocr_fuzzy_match_enable else 0)
+
     def search_text_in_ocr_results(self, targets, include, relative):
         """
         在OCR结果中搜索目标文本。
@@ -235,19 +444,22 @@ class Automation(metaclass=SingletonMeta):
         :param relative: 是否返回相对位置。
         :return: 如果找到，返回文本的位置坐标。
         """
-        for box, (text, confidence) in self.ocr_result:
-            match, matched_text = self.is_text_match(text, targets, include)
-            if match:
-                self.matched_text = matched_text  # 更新匹配的文本变量
-                self.logger.debug(f"目标文字：{matched_text} 相似度：{confidence:.2f}")
-                return self.calculate_text_position(box, relative)
+        hits = self.query_text(targets, include)
+        if hits:
+            hit = hits[0]
+            self.matched_text = hit.target  # 更新匹配的文本变量
+            if hit.distance:
+                self.logger.debug(f"目标文字：{hit.target} 模糊匹配：{hit.text} 编辑距离：{hit.distance} 相似度：{hit.confidence:.2f}")
+            else:
+                self.logger.debug(f"目标文字：{hit.target} 相似度：{hit.confidence:.2f}")
+            return self.calculate_text_position(hit.box, relative)
         self.logger.debug(f"目标文字：{', '.join(targets)} 未找到匹配文字")
         return None, None
 
     def perform_ocr(self):
         """执行OCR识别，并更新OCR结果列表。如果未识别到文字，保留ocr_result为一个空列表。"""
         try:
-            self.ocr_result = ocr.recognize_multi_lines(np.array(self.screenshot))
+            self.ocr_result = ocr.recognize_multi_lines(self.frame)
             if not self.ocr_result:
                 self.logger.debug(f"未识别出任何文字")
                 self.ocr_result = []
@@ -297,18 +509,16 @@ class Automation(metaclass=SingletonMeta):
         target_texts = [target] if isinstance(target, str) else list(target)  # 确保目标文本是列表格式
         min_distance = float('inf')
         target_pos = None
-        for box in self.ocr_result:
-            text, _ = box[1]
-            match, matched_text = self.is_text_match(text, target_texts, include)
-            if match:
-                pos = box[0]
-                if self.is_position_matched(pos, source_pos, position):
-                    distance = math.sqrt((pos[0][0] - source_pos[0]) ** 2 + (pos[0][1] - source_pos[1]) ** 2)
-                    self.logger.debug(f"目标文字：{matched_text} 距离：{distance}")
-                    if distance < min_distance:
-                        self.matched_text = matched_text  # 更新匹配的文本变量
-                        min_distance = distance
-                        target_pos = pos
+        hits = [hit for hit in self.query_text(target_texts, include) if self.is_position_matched(hit.box, source_pos, position)]
+        # 有精确匹配时只在精确匹配中选择，否则在编辑距离最小的模糊匹配中选择
+        for hit in (hit for hit in hits if hit.distance == hits[0].distance):
+            pos = hit.box
+            distance = math.sqrt((pos[0][0] - source_pos[0]) ** 2 + (pos[0][1] - source_pos[1]) ** 2)
+            self.logger.debug(f"目标文字：{hit.target} 距离：{distance}")
+            if distance < min_distance:
+                self.matched_text = hit.target  # 更新匹配的文本变量
+                min_distance = distance
+                target_pos = pos
         if target_pos is None:
             self.logger.debug(f"目标文字：{', '.join(target_texts)} 未找到匹配文字")
             return None, None
@@ -317,12 +527,10 @@ class Automation(metaclass=SingletonMeta):
     def find_source_position(self, source, source_type, include):
         """根据源类型查找源位置。"""
         if source_type == 'text':
-            for box in self.ocr_result:
-                text, confidence = box[1]
-                match, matched_text = self.is_text_match(text, [source], include)
-                if match:
-                    self.logger.debug(f"目标文字：{source} 相似度：{confidence:.2f}")
-                    return box[0][0]  # 返回文本的起始位置
+            hits = self.query_text([source], include)
+            if hits:
+                self.logger.debug(f"目标文字：{source} 相似度：{hits[0].confidence:.2f}")
+                return hits[0].box[0]  # 返回文本的起始位置
         elif source_type == 'image':
             top_left, _, _ = self.find_image_element(source, 0.7, None, True)
             return top_left
@@ -370,8 +578,8 @@ class Automation(metaclass=SingletonMeta):
         """
         查找元素，并根据指定的查找类型执行不同的查找策略。
         :param target: 查找目标，可以是图像路径或文字。
-        :param find_type: 查找类型，例如'image', 'text'等。
-        :param threshold: 查找阈值，用于图像查找时的相似度匹配。
+        :param find_type: 查找类型，例如'image', 'text', 'color', 'pixels'等。
+        :param threshold: 查找阈值，用于图像查找时的相似度匹配，颜色查找时为允许的最大颜色距离。
         :param max_retries: 最大重试次数。
         :param crop: 截图的裁剪区域，格式为（x坐标百分比，y坐标百分比，长百分比，宽百分比）。
         :param take_screenshot: 是否需要先截图。
@@ -388,36 +596,98 @@ class Automation(metaclass=SingletonMeta):
         """
         take_screenshot = take_screenshot and need_ocr
         max_retries = 1 if not take_screenshot else max_retries
+        cache_key = self._find_cache_key(target, find_type, threshold, relative, scale_range, include, need_ocr, source, source_type, pixel_bgr, position)
         for i in range(max_retries):
             if take_screenshot:
                 screenshot_result = self.take_screenshot(crop)
                 if not screenshot_result:
                     continue  # 如果截图失败，则跳过本次循环
-            if find_type in ['image', 'image_threshold', 'text', "min_distance_text", 'crop']:
-                if find_type in ['image', 'image_threshold']:
-                    top_left, bottom_right, image_threshold = self.find_image_element(target, threshold, scale_range, relative)
-                elif find_type == 'text':
-                    top_left, bottom_right = self.find_text_element(target, include, need_ocr, relative)
-                elif find_type == 'min_distance_text':
-                    top_left, bottom_right = self.find_min_distance_text_element(target, source, source_type, include, need_ocr, position)
-                elif find_type == 'crop':
-                    top_left = (int(target[0] * self.screenshot.width) + self.screenshot_pos[0], int(target[1] * self.screenshot.height) + self.screenshot_pos[1])
-                    bottom_right = (int((target[0] + target[2]) * self.screenshot.width) + self.screenshot_pos[0], int((target[1] + target[3]) * self.screenshot.height) + self.screenshot_pos[1])
-                if top_left and bottom_right:
-                    if find_type == 'image_threshold':
-                        return image_threshold
-                    return top_left, bottom_right
-            elif find_type in ['image_count']:
-                return self.find_image_and_count(target, threshold, pixel_bgr)
-            elif find_type in ['image_with_multiple_targets']:
-                return self.find_image_with_multiple_targets(target, threshold, scale_range, relative)
-            else:
-                raise ValueError("错误的类型")
+            result = self._cached_find(cache_key, find_type, lambda: self._find_in_frame(target, find_type, threshold, relative, scale_range, include, need_ocr, source, source_type, pixel_bgr, position))
+            if find_type in ['image_count', 'image_with_multiple_targets'] or result is not None:
+                return result
 
             if i < max_retries - 1:
                 time.sleep(retry_delay)  # 在重试前等待一定时间
         return None
 
+    @staticmethod
+    def _hashable(value):
+        if isinstance(value, (list, tuple)):
+            return tuple(Automation._hashable(v) for v in value)
+        return value
+
+    def _find_cache_key(self, target, find_type, threshold, relative, scale_range, include, need_ocr, source, source_type, pixel_bgr, position):
+        """
+        查找结果缓存的键，参数同 find_element，不可缓存的查找返回None。
+        依赖上一次 OCR 结果（need_ocr=False）的文字查找不缓存。
+        """
+        if find_type in ['text', 'min_distance_text'] and not need_ocr:
+            return None
+        if find_type not in ['image', 'image_threshold', 'pixels', 'color', 'text', 'min_distance_text', 'crop', 'image_count', 'image_with_multiple_targets']:
+            return None
+        args = (threshold, relative, scale_range, include, source, source_type, pixel_bgr, position)
+        try:
+            key = (self._hashable(target), find_type, *(self._hashable(arg) for arg in args))
+            hash(key)
+            return key
+        except TypeError:
+            return None
+
+    def _cached_find(self, key, find_type, finder):
+        """
+        在当前截图帧上执行查找，同一帧、同一区域上的相同查找只执行一次，截取新的一帧后缓存失效。
+        文字查找会同时保存并恢复 ocr_result 和 matched_text，调用方读取到的内容与实际执行时一致。
+        :param key: 缓存键，为None时不缓存。
+        :param finder: 执行查找的无参函数。
+        """
+        if key is None or self.frame is None:
+            return finder()
+        if self._find_cache_frame_id != self.frame.id:
+            self._find_cache_frame_id = self.frame.id
+            self._find_cache.clear()
+        key = (tuple(self.screenshot_pos), self.screenshot_scale_factor, key)
+        text = find_type in ['text', 'min_distance_text']
+        if key in self._find_cache:
+            result, state = self._find_cache[key]
+            if text:
+                self.ocr_result, self.matched_text = state
+        else:
+            result = finder()
+            state = (self.ocr_result, getattr(self, "matched_text", None)) if text else None
+            self._find_cache[key] = (result, state)
+        return list(result) if isinstance(result, list) else result
+
+    def _find_in_frame(self, target, find_type, threshold, relative, scale_range, include, need_ocr, source, source_type, pixel_bgr, position):
+        """
+        在当前截图上执行一次查找，参数同 find_element。
+        :return: 找到时返回元素位置（或相似度、计数），未找到时返回None；计数和多目标查找直接返回查找结果。
+        """
+        if find_type in ['image', 'image_threshold', 'text', "min_distance_text", 'crop', 'color', 'pixels']:
+            if find_type in ['image', 'image_threshold']:
+                top_left, bottom_right, image_threshold = self.find_image_element(target, threshold, scale_range, relative)
+            elif find_type == 'text':
+                top_left, bottom_right = self.find_text_element(target, include, need_ocr, relative)
+            elif find_type == 'pixels':
+                top_left, bottom_right = self.find_pixels_element(target, threshold, scale_range, relative)
+            elif find_type == 'color':
+                top_left, bottom_right = self.find_color_element(target, threshold, relative)
+            elif find_type == 'min_distance_text':
+                top_left, bottom_right = self.find_min_distance_text_element(target, source, source_type, include, need_ocr, position)
+            elif find_type == 'crop':
+                top_left = (int(target[0] * self.frame.width) + self.screenshot_pos[0], int(target[1] * self.frame.height) + self.screenshot_pos[1])
+                bottom_right = (int((target[0] + target[2]) * self.frame.width) + self.screenshot_pos[0], int((target[1] + target[3]) * self.frame.height) + self.screenshot_pos[1])
+            if top_left and bottom_right:
+                if find_type == 'image_threshold':
+                    return image_threshold
+                return top_left, bottom_right
+        elif find_type in ['image_count']:
+            return self.find_image_and_count(target, threshold, pixel_bgr)
+        elif find_type in ['image_with_multiple_targets']:
+            return self.find_image_with_multiple_targets(target, threshold, scale_range, relative)
+        else:
+            raise ValueError("错误的类型")
+        return None
+
     def click_element_with_pos(self, coordinates, offset=(0, 0), action="click", cnt=1):
         """
         在指定坐标上执行点击操作。
@@ -479,7 +749,7 @@ class Automation(metaclass=SingletonMeta):
         """
         for i in range(max_retries):
             self.take_screenshot(crop)
-            ocr_result = ocr.recognize_single_line(np.array(self.screenshot), blacklist)
+            ocr_result = ocr.recognize_single_line(self.frame, blacklist)
             if ocr_result:
                 self.logger.debug(f"OCR识别结果：{ocr_result[0]}")
                 return ocr_result[0]
@@ -487,3 +757,40 @@ class Automation(metaclass=SingletonMeta):
                 time.sleep(retry_delay)
         self.logger.debug("OCR未识别到任何文字")
         return None
+
+    def get_digit_text(self, field, crop=(0, 0, 1, 1), blacklist=None, max_retries=3, retry_delay=0.0):
+        """
+        识别数字区域，优先使用本地字形模板，无法可靠识别时使用OCR，参数和返回值同 get_single_line_text。
+        :param field: 数字区域配置，见 module.ocr.digit_reader.DigitField。
+        """
+        if digit_reader is None:
+            return self.get_single_line_text(crop, blacklist, max_retries, retry_delay)
+        for i in range(max_retries):
+            self.take_screenshot(crop)
+            result = digit_reader.recognize(field, self.frame, blacklist)
+            if result:
+                self.logger.debug(f"数字识别结果：{result[0]}")
+                return result[0]
+            if retry_delay > 0 and i < max_retries - 1:
+                time.sleep(retry_delay)
+        self.logger.debug("未识别到数字")
+        return None
+
+    def read_fields(self, fields, frame=None, blacklist=None):
+        """
+        从同一张截图中读取多个区域的单行文本，所有区域拼接后只请求一次OCR。
+        :param fields: 字典，键为字段名，值为裁剪区域，格式为(x, y, width, height)的比例值。
+        :param frame: 截图帧，默认截取一张完整截图。
+        :param blacklist: 需要过滤掉的文本列表。
+        :return: 字典，键为字段名，值为识别到的第一行文本，未识别到时为None。
+        """
+        if frame is None:
+            self.take_screenshot()
+            frame = self.frame
+        crops = [(Screenshot.crop_frame(frame.root, crop)[0], name) for name, crop in fields.items()]
+        results = ocr.recognize_batch(crops)
+        texts = {}
+        for name in fields:
+            texts[name] = next((text for _, (text, _) in results[name] if not blacklist or text not in blacklist), None)
+        self.logger.debug(f"OCR识别结果：{texts}")
+        return texts
@@ -1,5 +1,4 @@
 from module.automation.input_base import InputBase
-import time
 
 class CdpInput(InputBase):
     SPECIAL_KEY_MAP = {
@@ -114,34 +113,21 @@ class CdpInput(InputBase):
         """
         count 次数，一次大概 10 像素
         direction -1 为向下滚，1 为向上滚
+        所有滚动事件作为一批连续发送
         """
-        deltaY = -10 * direction / abs(direction)
-        try:
-            for i in range(count):
-                self.cloud_game.execute_cdp_cmd("Input.dispatchMouseEvent", {
-                    "type": "mouseWheel",
-                    "x": self.last_x, "y": self.last_y,
-                    "deltaX": 0,
-                    "deltaY": deltaY,
-                    "pointerType": "mouse"
-                })
+        if self.sequence().scroll(count, direction).dispatch():
             self.logger.debug(f"滚轮滚动 count={count} direction={direction}")
-        except Exception as e:
-            self.logger.error(f"鼠标滚轮出错：{e}")
+        else:
+            self.logger.error(f"鼠标滚轮出错")
 
     # ---------------- Keyboard ----------------
-    def press_key(self, key, wait_time=0.2):
-        self.focus()
+    def _key_payload(self, key):
+        """按键事件的公共参数，未知按键返回None"""
         k = key.lower()
-        if k in self.SPECIAL_KEY_MAP:
-            info = self.SPECIAL_KEY_MAP[k]
-        elif k in self.CHAR_KEY_MAP:
-            info = self.CHAR_KEY_MAP[k]
-        else:
-            self.logger.error(f"未知按键：{key}")
-            return
-
-        payload = {
+        info = self.SPECIAL_KEY_MAP.get(k) or self.CHAR_KEY_MAP.get(k)
+        if info is None:
+            return None
+        return {
             "key": info["key"],
             "code": info["code"],
             "windowsVirtualKeyCode": info["vk"],
@@ -150,84 +136,140 @@ class CdpInput(InputBase):
             "text": ""
         }
 
-        try:
-            self.cloud_game.execute_cdp_cmd("Input.dispatchKeyEvent", {"type": "keyDown", **payload})
-            time.sleep(wait_time)
-            self.cloud_game.execute_cdp_cmd("Input.dispatchKeyEvent", {"type": "keyUp", **payload})
+    def press_key(self, key, wait_time=0.2):
+        if self._key_payload(key) is None:
+            self.logger.error(f"未知按键：{key}")
+            return
+        if self.sequence().focus().press_key(key, wait_time).dispatch():
             self.logger.debug(f"按键按下：{key}, 持续 {wait_time}s")
-        except Exception as e:
-            self.logger.error(f"按键 {key} 出错：{e}")
+        else:
+            self.logger.error(f"按键 {key} 出错")
 
     def secretly_press_key(self, key, wait_time=0.2):
-        self.focus()
-        k = key.lower()
-        if k in self.SPECIAL_KEY_MAP:
-            info = self.SPECIAL_KEY_MAP[k]
-        elif k in self.CHAR_KEY_MAP:
-            info = self.CHAR_KEY_MAP[k]
-        else:
+        if self._key_payload(key) is None:
             self.logger.error(f"未知按键")
             return
-
-        payload = {
-            "key": info["key"],
-            "code": info["code"],
-            "windowsVirtualKeyCode": info["vk"],
-            "nativeVirtualKeyCode": info["vk"],
-            "modifiers": 0,
-            "text": ""
-        }
-
-        try:
-            self.cloud_game.execute_cdp_cmd("Input.dispatchKeyEvent", {"type": "keyDown", **payload})
-            time.sleep(wait_time)
-            self.cloud_game.execute_cdp_cmd("Input.dispatchKeyEvent", {"type": "keyUp", **payload})
+        if self.sequence().focus().press_key(key, wait_time).dispatch():
             self.logger.debug(f"按键按下, 持续 {wait_time}s")
-        except Exception as e:
-            self.logger.error(f"按键出错：{e}")
+        else:
+            self.logger.error(f"按键出错")
 
     def press_mouse(self, wait_time=0.2):
-        try:
-            self.cloud_game.execute_cdp_cmd("Input.dispatchMouseEvent", {
-                "type": "mousePressed",
-                "button": "left",
-                "buttons": 1,
-                "x": self.last_x, "y": self.last_y,
-                "clickCount": 1,
-                "pointerType": "mouse"
-            })
-            time.sleep(wait_time)
-            self.cloud_game.execute_cdp_cmd("Input.dispatchMouseEvent", {
-                "type": "mouseReleased",
-                "button": "left",
-                "buttons": 1,
-                "x": self.last_x, "y": self.last_y,
-                "clickCount": 1,
-                "pointerType": "mouse"
-            })
+        if self.sequence().mouse_down(self.last_x, self.last_y).wait(wait_time).mouse_up().dispatch():
             self.logger.debug(f"按下鼠标左键 ({self.last_x}, {self.last_y})")
-        except Exception as e:
-            self.logger.error(f"按下鼠标左键出错：{e}")
+        else:
+            self.logger.error(f"按下鼠标左键出错")
 
     def secretly_write(self, text, interval=0.1):
-        try:
-            self.focus()
-            for ch in text:
-                if ch.lower() in self.CHAR_KEY_MAP:
-                    info = self.CHAR_KEY_MAP[ch.lower()]
-                    payload = {
-                        "key": info["key"],
-                        "code": info["code"],
-                        "windowsVirtualKeyCode": info["vk"],
-                        "nativeVirtualKeyCode": info["vk"],
-                        "modifiers": 0,
-                        "text": ""
-                    }
-                    self.cloud_game.execute_cdp_cmd("Input.dispatchKeyEvent", {"type": "keyDown", **payload})
-                    self.cloud_game.execute_cdp_cmd("Input.dispatchKeyEvent", {"type": "keyUp", **payload})
-                else:
-                    self.logger.warning(f"secretly_write 出错")
-                time.sleep(interval)
+        """逐个字符发送按键事件，整段文字作为一批发送"""
+        sequence = self.sequence().focus()
+        for ch in text:
+            if self._key_payload(ch) is not None:
+                sequence.press_key(ch, 0)
+            else:
+                self.logger.warning(f"secretly_write 出错")
+            sequence.wait(interval)
+        if sequence.dispatch():
             self.logger.debug("键盘输入 ***")
-        except Exception as e:
+        else:
             self.logger.error(f"键盘输入 *** 出错")
+
+    # ---------------- Sequence ----------------
+    def sequence(self):
+        """创建输入序列，见 InputSequence"""
+        return InputSequence(self)
+
+    def dispatch_sequence(self, sequence):
+        """
+        发送输入序列。
+        :return: 成功时返回True。
+        """
+        try:
+            self.cloud_game.execute_cdp_sequence(sequence.events)
+        except Exception as e:
+            self.logger.error(f"输入序列出错：{e}")
+            return False
+        self.last_x, self.last_y = sequence.x, sequence.y
+        return True
+
+
+class InputSequence:
+    """
+    输入序列，按相对时间排列多个鼠标和键盘事件，调用 dispatch 后作为一批发送。
+    CDP 直连可用时相邻事件之间不再等待每条命令的返回，只按设定的时间间隔发送。
+
+    用法：
+        auto.input_sequence().press_key("f", 0.05).wait(0.05).press_key("f", 0.05).dispatch()
+    """
+
+    def __init__(self, cdp_input):
+        """
+        :param cdp_input: CdpInput 实例。
+        """
+        self.cdp_input = cdp_input
+        self.events = []  # 元素为 (相对开始时间的秒数, 命令名, 参数)
+        self.time = 0.0
+        self.x, self.y = cdp_input.last_x, cdp_input.last_y  # 序列执行后的鼠标位置
+
+    def _add(self, method, params):
+        self.events.append((self.time, method, params))
+        return self
+
+    def _mouse(self, event_type, **params):
+        return self._add("Input.dispatchMouseEvent", {"type": event_type, "x": self.x, "y": self.y, "pointerType": "mouse", **params})
+
+    def wait(self, seconds):
+        """之后的事件延后指定时间（秒）发送"""
+        self.time += max(0.0, seconds)
+        return self
+
+    def focus(self):
+        """在当前位置发送一次鼠标移动，让浏览器判定鼠标仍在云游戏内，见 CdpInput.focus"""
+        return self._mouse("mouseMoved")
+
+    def mouse_move(self, x, y):
+        self.x, self.y = x, y
+        return self._mouse("mouseMoved")
+
+    def mouse_down(self, x, y):
+        self.x, self.y = x, y
+        return self._mouse("mousePressed", button="left", buttons=1, clickCount=1)
+
+    def mouse_up(self):
+        return self._mouse("mouseReleased", button="left", buttons=1, clickCount=1)
+
+    def click(self, x, y, hold=0.0):
+        return self.mouse_down(x, y).wait(hold).mouse_up()
+
+    def scroll(self, count, direction=-1):
+        """
+        count 次数，一次大概 10 像素
+        direction -1 为向下滚，1 为向上滚
+        """
+        delta_y = -10 * direction / abs(direction)
+        for _ in range(count):
+            self._mouse("mouseWheel", deltaX=0, deltaY=delta_y)
+        return self
+
+    def key_down(self, key):
+        payload = self.cdp_input._key_payload(key)
+        if payload is None:
+            raise ValueError(f"未知按键：{key}")
+        return self._add("Input.dispatchKeyEvent", {"type": "keyDown", **payload})
+
+    def key_up(self, key):
+        payload = self.cdp_input._key_payload(key)
+        if payload is None:
+            raise ValueError(f"未知按键：{key}")
+        return self._add("Input.dispatchKeyEvent", {"type": "keyUp", **payload})
+
+    def press_key(self, key, hold=0.05):
+        """按下按键并在 hold 秒后松开"""
+        return self.key_down(key).wait(hold).key_up(key)
+
+    def dispatch(self):
+        """
+        发送序列中的所有事件。
+        :return: 成功时返回True。
+        """
+        return self.cdp_input.dispatch_sequence(self)
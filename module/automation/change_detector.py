@@ -0,0 +1,75 @@
+import time
+import cv2
+import numpy as np
+
+
+class ChangeDetector:
+    """
+    画面变化检测器。
+    在缩小的灰度图上比较区域内容与上次检查时是否不同，区域没有变化时检查结果不会改变，可以跳过重复的模板匹配和 OCR。
+    """
+
+    def __init__(self, scale=0.25, pixel_threshold=10, changed_ratio=0.001, max_skip_time=10):
+        """
+        :param scale: 比较时的缩小比例。
+        :param pixel_threshold: 缩小后单个像素的灰度差超过该值才视为变化，用于过滤视频压缩噪声。
+        :param changed_ratio: 变化像素占区域的比例超过该值时视为区域变化，至少需要一个像素变化。
+        :param max_skip_time: 区域未变化时最多连续跳过检查的时间（秒），超过后强制重新检查。
+        """
+        self.scale = scale
+        self.pixel_threshold = pixel_threshold
+        self.changed_ratio = changed_ratio
+        self.max_skip_time = max_skip_time
+        self._references = {}  # 键为区域标识，值为 (检查时间, 缩小后的区域灰度图)
+        self.checked = 0
+        self.skipped = 0
+
+    def _thumbnail(self, frame, crop):
+        gray = frame.root.gray_scaled(self.scale)
+        height, width = gray.shape[:2]
+        left, top = int(width * crop[0]), int(height * crop[1])
+        right = max(left + 1, int(width * (crop[0] + crop[2])))
+        bottom = max(top + 1, int(height * (crop[1] + crop[3])))
+        return gray[top:bottom, left:right]
+
+    def changed(self, key, frame, crop=(0, 0, 1, 1)) -> bool:
+        """
+        判断区域相对上次检查时是否变化，变化时以当前内容作为新的比较基准。
+        :param key: 区域标识，通常为等待条件对象。
+        :param frame: 当前截图帧。
+        :param crop: 区域，格式为(x, y, width, height)的比例值。
+        :return: 区域变化或首次检查时返回True。
+        """
+        thumbnail = self._thumbnail(frame, crop)
+        now = time.time()
+        reference = self._references.get(key)
+        changed = (
+            reference is None
+            or reference[1].shape != thumbnail.shape
+            or now - reference[0] > self.max_skip_time
+            or np.count_nonzero(cv2.absdiff(reference[1], thumbnail) > self.pixel_threshold) > thumbnail.size * self.changed_ratio
+        )
+        if changed:
+            # 只在重新检查时更新基准，缓慢的渐变也会在累计超过阈值后被发现
+            self._references[key] = (now, thumbnail.copy())
+            self.checked += 1
+        else:
+            self.skipped += 1
+        return changed
+
+    def difference(self, reference, frame, box):
+        """
+        计算两帧中同一区域的变化比例。
+        :param reference: 参照帧。
+        :param frame: 当前帧。
+        :param box: 区域在完整画面中的坐标，格式为(left, top, right, bottom)。
+        :return: 灰度差超过 pixel_threshold 的像素比例，任意一帧不包含该区域时返回None。
+        """
+        before, after = reference.screen_region(box), frame.screen_region(box)
+        if before is None or after is None or before.size != after.size:
+            return None
+        changed = np.count_nonzero(cv2.absdiff(before.gray, after.gray) > self.pixel_threshold)
+        return changed / max(1, before.width * before.height)
+
+    def reset(self):
+        self._references.clear()
@@ -0,0 +1,59 @@
+import math
+import cv2
+import numpy as np
+
+
+class ColorMask:
+    """
+    颜色掩码引擎，标记与目标颜色相近的像素。
+    先用 cv2.inRange 按每个通道的最大差值筛出候选像素，只对少量候选像素计算精确的颜色距离，
+    不在整张图上创建差值、平方等临时数组，也不会出现 uint8 相减溢出的问题。
+    结果缓存在截图帧中，同一帧上相同颜色和容差的检测只计算一次。
+    """
+
+    DEFAULT_TOLERANCE = math.sqrt(800)  # 默认颜色距离，与原黑白图的平方距离阈值 800 一致
+
+    @staticmethod
+    def mask(bgr, color, tolerance=DEFAULT_TOLERANCE):
+        """
+        生成颜色掩码。
+        :param bgr: BGR 格式的像素数据。
+        :param color: 目标颜色的BGR值。
+        :param tolerance: 允许的最大颜色距离（三个通道差值的欧氏距离）。
+        :return: 掩码，颜色距离不超过 tolerance 的像素为 255，其余为 0。
+        """
+        color = [int(c) for c in color]
+        radius = int(math.floor(tolerance))
+        lower = np.array([max(0, c - radius) for c in color], dtype=np.uint8)
+        upper = np.array([min(255, c + radius) for c in color], dtype=np.uint8)
+        mask = cv2.inRange(bgr, lower, upper)
+        if 3 * radius * radius <= tolerance * tolerance:
+            return mask  # 立方体完全在距离范围内，无需精确计算
+        ys, xs = np.nonzero(mask)
+        if ys.size:
+            diff = bgr[ys, xs].astype(np.int32) - color
+            outside = np.einsum("ij,ij->i", diff, diff) > tolerance * tolerance
+            mask[ys[outside], xs[outside]] = 0
+        return mask
+
+    @staticmethod
+    def frame_mask(frame, color, tolerance=DEFAULT_TOLERANCE):
+        """
+        生成截图帧的颜色掩码，结果按 (颜色, 容差) 缓存在帧中。
+        :param frame: 截图帧。
+        :return: 只读的掩码。
+        """
+        key = ("color_mask", tuple(int(c) for c in color), float(tolerance))
+        return frame.memo(key, lambda: ColorMask.mask(frame.bgr, color, tolerance))
+
+    @staticmethod
+    def bounding_box(mask):
+        """
+        掩码中所有标记像素的外接矩形。
+        :return: (left, top, right, bottom)，没有标记像素时返回None。
+        """
+        points = cv2.findNonZero(mask)
+        if points is None:
+            return None
+        x, y, w, h = cv2.boundingRect(points)
+        return x, y, x + w, y + h
@@ -0,0 +1,218 @@
+import time
+import itertools
+import threading
+import cv2
+import numpy as np
+from PIL import Image
+
+
+class Frame:
+    """
+    截图帧，像素数据只解码一次，颜色空间转换和裁剪结果按需计算并缓存，
+    同一张截图上的模板匹配、颜色检测和 OCR 共享这些结果。
+    """
+
+    _id_counter = itertools.count(1)
+
+    def __init__(self, image=None, rgb=None, timestamp=None, parent=None, box=None, origin=None, screen_size=None):
+        """
+        :param image: PIL 图片对象。
+        :param rgb: RGB 格式的 np.ndarray，与 image 二选一。
+        :param timestamp: 截图时间，默认为当前时间。
+        :param parent: 裁剪来源帧，仅在由 crop 创建时传入。
+        :param box: 在来源帧中的裁剪区域，格式为(left, top, right, bottom)。
+        :param origin: 区域截图时该帧左上角在完整画面中的坐标，完整截图时为None。
+        :param screen_size: 区域截图时完整画面的尺寸(width, height)，完整截图时为None。
+        """
+        if image is None and rgb is None and parent is None:
+            raise ValueError("Frame 需要图片或像素数据")
+        self.parent = parent
+        self.box = box
+        self.origin = origin
+        self.screen_size = screen_size
+        self.id = parent.id if parent is not None else next(Frame._id_counter)
+        self.timestamp = parent.timestamp if parent is not None else (timestamp or time.time())
+        self._image = image
+        self._rgb = rgb
+        self._cache = {}
+        self._crops = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_bytes(cls, data, timestamp=None, origin=None, screen_size=None):
+        """从 PNG/JPEG 等编码后的字节流创建帧"""
+        from io import BytesIO
+        image = Image.open(BytesIO(data))
+        image.load()
+        return cls(image=image, timestamp=timestamp, origin=origin, screen_size=screen_size)
+
+    @property
+    def width(self):
+        if self._rgb is not None:
+            return self._rgb.shape[1]
+        if self._image is not None:
+            return self._image.width
+        return self.box[2] - self.box[0]
+
+    @property
+    def height(self):
+        if self._rgb is not None:
+            return self._rgb.shape[0]
+        if self._image is not None:
+            return self._image.height
+        return self.box[3] - self.box[1]
+
+    @property
+    def size(self):
+        return self.width, self.height
+
+    @property
+    def root(self):
+        """最初截取的完整帧"""
+        frame = self
+        while frame.parent is not None:
+            frame = frame.parent
+        return frame
+
+    @property
+    def is_full_screen(self):
+        """是否为完整画面，裁剪得到的帧和区域截图都不是"""
+        return self.parent is None and self.origin is None
+
+    @property
+    def offset(self):
+        """当前帧左上角在完整画面中的坐标"""
+        x, y = 0, 0
+        frame = self
+        while frame.parent is not None:
+            x += frame.box[0]
+            y += frame.box[1]
+            frame = frame.parent
+        if frame.origin is not None:
+            x += frame.origin[0]
+            y += frame.origin[1]
+        return x, y
+
+    def screen_region(self, box):
+        """
+        按完整画面中的坐标取截图中的区域，区域截图也可以使用。
+        :param box: 区域在完整画面中的坐标，格式为(left, top, right, bottom)。
+        :return: 区域对应的帧，截图不包含整个区域时返回None。
+        """
+        root = self.root
+        origin_x, origin_y = root.origin or (0, 0)
+        left, top, right, bottom = box[0] - origin_x, box[1] - origin_y, box[2] - origin_x, box[3] - origin_y
+        if left < 0 or top < 0 or right > root.width or bottom > root.height:
+            return None
+        return root.crop((left, top, right, bottom))
+
+    @property
+    def image(self) -> Image.Image:
+        """PIL 图片对象"""
+        if self._image is None:
+            with self._lock:
+                if self._image is None:
+                    if self._rgb is None and self.parent is not None and self.parent._image is not None:
+                        self._image = self.parent._image.crop(self.box)
+                    else:
+                        self._image = Image.fromarray(np.ascontiguousarray(self.rgb))
+        return self._image
+
+    @property
+    def rgb(self) -> np.ndarray:
+        """RGB 格式的像素数据（只读）"""
+        if self._rgb is None:
+            with self._lock:
+                if self._rgb is None:
+                    if self.parent is not None:
+                        left, top, right, bottom = self.box
+                        rgb = self.parent.rgb[top:bottom, left:right]
+                    else:
+                        image = self._image if self._image.mode == "RGB" else self._image.convert("RGB")
+                        rgb = np.asarray(image)
+                    rgb.flags.writeable = False
+                    self._rgb = rgb
+        return self._rgb
+
+    @property
+    def bgr(self) -> np.ndarray:
+        """BGR 格式的像素数据，与 cv2.imread 读取的模板格式一致"""
+        return self._converted("bgr", cv2.COLOR_RGB2BGR)
+
+    @property
+    def gray(self) -> np.ndarray:
+        """灰度像素数据"""
+        return self._converted("gray", cv2.COLOR_RGB2GRAY)
+
+    def gray_scaled(self, scale) -> np.ndarray:
+        """
+        按比例缩小后的灰度像素数据，用于粗匹配。
+        :param scale: 缩放比例，取值 (0, 1]。
+        """
+        if scale >= 1:
+            return self.gray
+        key = ("gray", scale)
+        result = self._cache.get(key)
+        if result is None:
+            with self._lock:
+                result = self._cache.get(key)
+                if result is None:
+                    result = cv2.resize(self.gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+                    result.flags.writeable = False
+                    self._cache[key] = result
+        return result
+
+    def memo(self, key, factory):
+        """
+        按键缓存基于当前帧计算的结果，同一帧上只计算一次。
+        :param key: 缓存键，需可哈希。
+        :param factory: 无参函数，未缓存时调用以计算结果。
+        """
+        result = self._cache.get(key)
+        if result is None:
+            with self._lock:
+                result = self._cache.get(key)
+                if result is None:
+                    result = factory()
+                    if isinstance(result, np.ndarray):
+                        result.flags.writeable = False
+                    self._cache[key] = result
+        return result
+
+    def _converted(self, key, code):
+        result = self._cache.get(key)
+        if result is None:
+            with self._lock:
+                result = self._cache.get(key)
+                if result is None:
+                    parent_result = self.parent._cache.get(key) if self.parent is not None else None
+                    if parent_result is not None:
+                        # 来源帧已经转换过，直接取其中的区域
+                        left, top, right, bottom = self.box
+                        result = parent_result[top:bottom, left:right]
+                    else:
+                        result = cv2.cvtColor(self.rgb, code)
+                    result.flags.writeable = False
+                    self._cache[key] = result
+        return result
+
+    def crop(self, box):
+        """
+        裁剪帧，相同区域只创建一次。
+        :param box: 裁剪区域，格式为(left, top, right, bottom)，单位为像素。
+        :return: 裁剪后的帧，与当前帧共享像素数据。
+        """
+        box = tuple(int(v) for v in box)
+        if box == (0, 0, self.width, self.height):
+            return self
+        frame = self._crops.get(box)
+        if frame is None:
+            with self._lock:
+                frame = self._crops.get(box)
+                if frame is None:
+                    frame = Frame(parent=self, box=box)
+                    self._crops[box] = frame
+        return frame
+
+    def save(self, fp, format=None, **params):
+        self.image.save(fp, format, **params)
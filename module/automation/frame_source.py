@@ -0,0 +1,234 @@
+import time
+import base64
+import threading
+from collections import deque
+from typing import Optional
+from utils.logger.logger import Logger
+from .frame import Frame
+
+
+class ScreencastFrameSource:
+    """
+    基于 CDP Page.startScreencast 的推送式帧源。
+    浏览器在画面变化时主动推送帧，帧事件通过云游戏控制器的 CDP 直连接收并存入环形缓冲区，截图时直接取最新帧，
+    避免每次截图都通过 Selenium Hub 完整拉取一张 PNG。CDP 直连未开启或不可用时不推送，由调用方回退到拉取截图。
+    """
+
+    RESTART_INTERVAL = 5  # 推送启动失败或连接断开后，两次重启之间的最小间隔（秒）
+
+    def __init__(self, cloud_game, logger: Optional[Logger] = None, max_fps=10, max_frame_age=0.5, buffer_size=3, image_format="jpeg", quality=90):
+        """
+        :param cloud_game: CloudGameController 实例。
+        :param logger: 用于记录日志的Logger对象，可选参数。
+        :param max_fps: 最大接收帧率，超出时延迟确认帧，让浏览器降低推送频率。
+        :param max_frame_age: 帧的最大有效时间（秒），超过后视为过期，由调用方回退到拉取截图。
+        :param buffer_size: 环形缓冲区保存的帧数。
+        :param image_format: 推送帧的编码格式，"jpeg" 或 "png"。
+        :param quality: jpeg 压缩质量，取值 0-100。
+        """
+        self.cloud_game = cloud_game
+        self.logger = logger
+        self.max_fps = max_fps
+        self.max_frame_age = max_frame_age
+        self.image_format = image_format
+        self.quality = quality
+        self._frames = deque(maxlen=max(1, buffer_size))  # 元素为 [接收时间, base64 数据, 解码后的帧]
+        self._lock = threading.Lock()
+        self._client = None  # 正在接收推送的 CDP 直连客户端
+        self._last_ack_time = 0
+        self._last_start_time = 0
+
+    def is_running(self) -> bool:
+        return self._client is not None and self._client.connected
+
+    def start(self) -> bool:
+        """订阅推送帧并开始推送，CDP 直连不可用时返回False"""
+        get_cdp_client = getattr(self.cloud_game, "get_cdp_client", None)
+        client = get_cdp_client() if get_cdp_client is not None else None
+        if client is None:
+            return False
+        if self.is_running():
+            if self._client is client:
+                return True
+            # 浏览器已重启或连接已重建，旧的推送作废
+            self.stop()
+
+        self._last_start_time = time.time()
+        with self._lock:
+            self._frames.clear()
+        # 先记录客户端再开始推送，第一帧到达时回调需要用它确认
+        self._client = client
+        client.on("Page.screencastFrame", self._on_frame)
+        try:
+            client.send("Page.startScreencast", {"format": self.image_format, "quality": self.quality, "everyNthFrame": 1})
+        except Exception as e:
+            self._client = None
+            client.off("Page.screencastFrame", self._on_frame)
+            self._log_debug(f"画面推送启动失败：{e}")
+            return False
+        self._log_debug("画面推送已启动")
+        return True
+
+    def stop(self) -> None:
+        """停止推送并清空缓冲区"""
+        client, self._client = self._client, None
+        if client is not None:
+            client.off("Page.screencastFrame", self._on_frame)
+            if client.connected:
+                try:
+                    client.send_async("Page.stopScreencast")
+                except ConnectionError:
+                    pass
+        with self._lock:
+            self._frames.clear()
+
+    def _ensure_running(self) -> None:
+        if self.is_running():
+            return
+        if time.time() - self._last_start_time < self.RESTART_INTERVAL:
+            return
+        self.start()
+
+    def _on_frame(self, params) -> None:
+        """推送帧的事件回调，在 CDP 接收线程中执行，不能等待命令返回"""
+        client = self._client
+        if client is None:
+            return
+        self._push_frame(params["data"])
+        # 延迟确认以限制帧率，浏览器在收到确认前不会推送下一帧
+        min_interval = 1 / self.max_fps if self.max_fps else 0
+        wait = min_interval - (time.time() - self._last_ack_time)
+        if wait > 0:
+            timer = threading.Timer(wait, self._ack, args=(client, params["sessionId"]))
+            timer.daemon = True
+            timer.start()
+        else:
+            self._ack(client, params["sessionId"])
+
+    def _ack(self, client, session_id) -> None:
+        self._last_ack_time = time.time()
+        try:
+            client.send_async("Page.screencastFrameAck", {"sessionId": session_id})
+        except ConnectionError:
+            pass
+
+    def _push_frame(self, data: str) -> None:
+        with self._lock:
+            self._frames.append([time.time(), data, None])
+
+    def get_latest(self, max_age=None) -> Optional[Frame]:
+        """
+        获取最新的一帧。
+        :param max_age: 帧的最大有效时间（秒），默认使用初始化时的设置。
+        :return: 最新帧，没有可用帧或帧已过期时返回None。
+        """
+        self._ensure_running()
+        max_age = self.max_frame_age if max_age is None else max_age
+        with self._lock:
+            if not self._frames:
+                return None
+            entry = self._frames[-1]
+        received_time, data, frame = entry
+        if time.time() - received_time > max_age:
+            return None
+        if received_time < getattr(self.cloud_game, "last_input_time", 0):
+            return None  # 输入操作之前的画面，可能还没有反映操作结果
+        if frame is None:
+            # 只在真正需要时解码，被跳过的帧不会产生解码开销
+            frame = Frame.from_bytes(base64.b64decode(data), timestamp=received_time)
+            entry[2] = frame
+        return frame
+
+    def _log_debug(self, message: str) -> None:
+        if self.logger is not None:
+            self.logger.debug(message)
+
+
+class PrefetchFrameSource:
+    """
+    预取式帧源。
+    后台线程连续拉取并解码截图，主线程做模板匹配或 OCR 的同时下一帧已经在传输和解码，
+    截图时直接取最新帧，拉取和解码的耗时与计算重叠。
+    只返回在最近一次输入操作之后开始截取的帧，不会拿到操作前的旧画面。
+    """
+
+    IDLE_TIMEOUT = 3  # 超过该时间（秒）没有取帧时暂停预取，避免空闲时持续占用浏览器
+
+    def __init__(self, cloud_game, capture, logger: Optional[Logger] = None, depth=2, max_frame_age=0.5, min_interval=0.05):
+        """
+        :param cloud_game: CloudGameController 实例，用于读取最近一次输入操作的时间。
+        :param capture: 截取一张完整截图并返回 Frame 的函数。
+        :param logger: 用于记录日志的Logger对象，可选参数。
+        :param depth: 缓冲区保存的帧数。
+        :param max_frame_age: 帧的最大有效时间（秒），从开始截取时算起。
+        :param min_interval: 两次开始截取之间的最小间隔（秒）。
+        """
+        self.cloud_game = cloud_game
+        self.capture = capture
+        self.logger = logger
+        self.max_frame_age = max_frame_age
+        self.min_interval = min_interval
+        self._frames = deque(maxlen=max(1, depth))
+        self._condition = threading.Condition()
+        self._capture_start = None  # 正在截取的帧的开始时间
+        self._last_request_time = 0
+        self._thread = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _ensure_running(self) -> None:
+        self._last_request_time = time.time()
+        if not self.is_running():
+            self._thread = threading.Thread(target=self._run, daemon=True, name="m7a_prefetch")
+            self._thread.start()
+
+    def _run(self) -> None:
+        while time.time() - self._last_request_time < self.IDLE_TIMEOUT:
+            start_time = time.time()
+            with self._condition:
+                self._capture_start = start_time
+            try:
+                frame = self.capture()
+                frame.timestamp = start_time  # 以开始截取的时间作为帧时间，保证晚于之前的输入操作
+                frame.rgb  # 在后台线程中完成解码
+            except Exception as e:
+                self._log_debug(f"预取截图失败：{e}")
+                frame = None
+            with self._condition:
+                self._capture_start = None
+                if frame is not None:
+                    self._frames.append(frame)
+                self._condition.notify_all()
+            if frame is None:
+                time.sleep(1)
+            else:
+                time.sleep(max(0.0, self.min_interval - (time.time() - start_time)))
+
+    def _min_timestamp(self, max_age):
+        return max(time.time() - max_age, getattr(self.cloud_game, "last_input_time", 0))
+
+    def get_latest(self, max_age=None) -> Optional[Frame]:
+        """
+        获取最新的一帧。
+        缓冲区中没有足够新的帧、但正在截取的帧满足要求时，等待其完成；否则返回None，由调用方直接拉取截图。
+        :param max_age: 帧的最大有效时间（秒），默认使用初始化时的设置。
+        :return: 最新帧，没有可用帧时返回None。
+        """
+        self._ensure_running()
+        max_age = self.max_frame_age if max_age is None else max_age
+        min_timestamp = self._min_timestamp(max_age)
+        def ready():
+            fresh = self._frames and self._frames[-1].timestamp >= min_timestamp
+            pending = self._capture_start is not None and self._capture_start >= min_timestamp
+            return fresh or not pending
+
+        with self._condition:
+            self._condition.wait_for(ready, timeout=5)
+            if self._frames and self._frames[-1].timestamp >= min_timestamp:
+                return self._frames[-1]
+            return None
+
+    def _log_debug(self, message: str) -> None:
+        if self.logger is not None:
+            self.logger.debug(message)
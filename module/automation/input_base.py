@@ -45,4 +45,9 @@ class InputBase(ABC):
     @abstractmethod
     def secretly_write(self, text, interval = 0.1):
         '''模拟键盘输入字符串，可以指定字符输入间隔'''
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def sequence(self):
+        '''创建输入序列，多个鼠标和键盘事件按相对时间排列后作为一批发送'''
+        pass
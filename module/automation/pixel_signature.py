@@ -0,0 +1,118 @@
+import math
+import threading
+import cv2
+import numpy as np
+
+
+class PixelSignature:
+    """
+    像素特征，由模板图片上少量取样点及其颜色组成。
+    界面元素出现在固定位置时，只比较这些取样点的颜色即可判断元素是否存在，不需要完整的模板匹配。
+    """
+
+    def __init__(self, probes):
+        """
+        :param probes: 取样点列表，元素为 (x, y, (b, g, r), tolerance)，坐标相对于模板左上角，tolerance 为每个通道允许的最大差值。
+        """
+        self.probes = list(probes)
+        self._xs = np.array([p[0] for p in self.probes], dtype=np.intp)
+        self._ys = np.array([p[1] for p in self.probes], dtype=np.intp)
+        self._colors = np.array([p[2] for p in self.probes], dtype=np.int16).reshape(-1, 3)
+        self._tolerances = np.array([p[3] for p in self.probes], dtype=np.int16)
+
+    @classmethod
+    def from_template(cls, bgr, mask=None, count=12, tolerance=30):
+        """
+        从模板图片生成像素特征。
+        一半取样点按网格均匀分布，另一半选择颜色与模板主体颜色差别最大的像素，
+        都只从颜色平稳（周围 3x3 范围内变化小）的像素中选择，截图有 1 像素偏差时取样结果也不变。
+        :param bgr: 模板的BGR数据。
+        :param mask: 模板的透明通道，只在完全不透明的像素上取样，可选。
+        :param count: 取样点数量。
+        :param tolerance: 每个通道允许的最大差值。
+        """
+        height, width = bgr.shape[:2]
+        gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY).astype(np.float32)
+        kernel = np.ones((3, 3), np.uint8)
+        gradient = cv2.dilate(np.abs(cv2.Laplacian(gray, cv2.CV_32F)), kernel)
+        valid = np.zeros((height, width), dtype=bool)
+        valid[1:-1, 1:-1] = True
+        if mask is not None:
+            valid &= cv2.erode((mask == 255).astype(np.uint8), kernel) > 0
+        if not valid.any():
+            return cls([])
+        stable = valid & (gradient <= np.median(gradient[valid]))
+
+        chosen = []
+        grid = max(1, int(math.ceil(math.sqrt(count / 2))))
+        for row in range(grid):
+            for col in range(grid):
+                y0, y1 = row * height // grid, (row + 1) * height // grid
+                x0, x1 = col * width // grid, (col + 1) * width // grid
+                cell = np.where(stable[y0:y1, x0:x1], gradient[y0:y1, x0:x1], np.inf)
+                if cell.size and np.isfinite(cell.min()):
+                    y, x = np.unravel_index(np.argmin(cell), cell.shape)
+                    chosen.append((x0 + int(x), y0 + int(y)))
+
+        ys, xs = np.nonzero(stable)
+        base = np.median(bgr[ys, xs], axis=0)
+        distance = np.abs(bgr[ys, xs].astype(np.int16) - base).sum(axis=1)
+        for i in np.argsort(-distance, kind="stable"):
+            if len(chosen) >= count:
+                break
+            x, y = int(xs[i]), int(ys[i])
+            if all(abs(x - cx) > 2 or abs(y - cy) > 2 for cx, cy in chosen):
+                chosen.append((x, y))
+
+        return cls((x, y, tuple(int(c) for c in bgr[y, x]), tolerance) for x, y in chosen)
+
+    def matches(self, bgr, origin) -> bool:
+        """
+        检查截图中指定位置是否符合像素特征。
+        :param bgr: 截图的BGR数据。
+        :param origin: 模板左上角在截图中的坐标(x, y)。
+        :return: 所有取样点的颜色都在容差内时返回True，取样点超出截图范围时返回False。
+        """
+        if not self.probes:
+            return False
+        xs, ys = self._xs + int(origin[0]), self._ys + int(origin[1])
+        height, width = bgr.shape[:2]
+        if xs.min() < 0 or ys.min() < 0 or xs.max() >= width or ys.max() >= height:
+            return False
+        diff = np.abs(bgr[ys, xs].astype(np.int16) - self._colors).max(axis=1)
+        return bool(np.all(diff <= self._tolerances))
+
+
+class PixelAnchorIndex:
+    """
+    记录每张模板最近一次匹配到的位置。
+    同一位置连续匹配成功 min_hits 次后视为固定位置，此后可以先用像素特征快速确认元素存在；
+    像素特征未通过时仍需模板匹配确认，光照、动画变化不会导致误判为不存在。
+    """
+
+    def __init__(self, min_hits=3):
+        """
+        :param min_hits: 视为固定位置前需要的连续匹配次数。
+        """
+        self.min_hits = min_hits
+        self._anchors = {}  # 值为 [x, y, 连续命中次数]
+        self._lock = threading.Lock()
+
+    def lookup(self, target):
+        """
+        :return: 固定位置 (x, y)，没有记录或尚未视为固定位置时返回None。
+        """
+        anchor = self._anchors.get(target)
+        if anchor is None or anchor[2] < self.min_hits:
+            return None
+        return anchor[0], anchor[1]
+
+    def record_hit(self, target, top_left):
+        """记录模板出现在 top_left 位置"""
+        x, y = int(top_left[0]), int(top_left[1])
+        with self._lock:
+            anchor = self._anchors.get(target)
+            if anchor is not None and anchor[0] == x and anchor[1] == y:
+                anchor[2] += 1
+            else:
+                self._anchors[target] = [x, y, 1]
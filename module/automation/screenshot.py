@@ -1,6 +1,7 @@
-from io import BytesIO
-from PIL import Image
+import cv2
+import numpy as np
 from module.config import cfg
+from .frame import Frame
 
 class Screenshot:
     @staticmethod
@@ -29,22 +30,115 @@ class Screenshot:
         return None, None
     
     @staticmethod
-    def take_screenshot(title, crop=(0, 0, 1, 1)):
+    def take_screenshot(title, crop=(0, 0, 1, 1), frame_source=None):
         # 仅保留云游戏截屏逻辑
+        frame = None
+        # 优先使用推送帧源中的最新帧，没有可用帧时回退到拉取截图
+        if frame_source is not None:
+            frame = frame_source.get_latest()
+        if frame is None and cfg.cloud_game_capture_method == "video":
+            # 直接从视频元素取帧，视频未就绪时回退到截图
+            result = Screenshot.take_video_screenshot(crop)
+            if result is not None:
+                return result
+        if frame is None and tuple(crop) != (0, 0, 1, 1) and cfg.cloud_game_region_capture_enable:
+            # 只需要部分区域时，让浏览器只截取该区域，减少编码、传输和解码的像素
+            return Screenshot.take_region_screenshot(crop)
+        if frame is None:
+            frame = Screenshot.take_full_frame()
+        return Screenshot.crop_frame(frame, crop)
+
+    @staticmethod
+    def take_full_frame():
+        """
+        拉取一张完整截图，按配置优先从视频元素取帧。
+        :return: 完整截图帧。
+        """
+        if cfg.cloud_game_capture_method == "video":
+            result = Screenshot.take_video_screenshot()
+            if result is not None and result[0].is_full_screen:
+                return result[0]
         from module.game import cloud_game
-        screenshot = Image.open(BytesIO(cloud_game.take_screenshot()))
-        width, height = screenshot.size
+        return Frame.from_bytes(cloud_game.take_screenshot())
+
+    @staticmethod
+    def take_video_screenshot(crop=(0, 0, 1, 1)):
+        """
+        从云游戏的视频元素中取指定区域的帧。
+        :param crop: 截图区域，格式为(x, y, width, height)的比例值。
+        :return: 截图帧、区域的位置和缩放因子，与 crop_frame 的返回值一致；取帧失败时返回None。
+        """
+        from module.game import cloud_game
+        width, height = Screenshot.get_window_real_resolution(None)
+
+        left = int(width * crop[0])
+        top = int(height * crop[1])
+        crop_width = int(width * crop[2])
+        crop_height = int(height * crop[3])
+
+        scale = cfg.cloud_game_video_capture_scale
+        encoding = cfg.cloud_game_video_capture_encoding
+        result = cloud_game.grab_video_frame((left, top, crop_width, crop_height), scale, encoding, cfg.cloud_game_video_capture_quality)
+        if result is None:
+            return None
+        frame_width, frame_height, data = result
+
+        # 完整且未缩放的画面与普通截图等价，其余情况记录区域位置
+        partial = tuple(crop) != (0, 0, 1, 1) or scale != 1
+        origin, screen_size = ((left, top), (width, height)) if partial else (None, None)
+        if encoding == "raw":
+            rgba = np.frombuffer(data, np.uint8).reshape(frame_height, frame_width, 4)
+            frame = Frame(rgb=cv2.cvtColor(rgba, cv2.COLOR_RGBA2RGB), origin=origin, screen_size=screen_size)
+        else:
+            frame = Frame.from_bytes(data, origin=origin, screen_size=screen_size)
+
+        return frame, (left, top, crop_width, crop_height), scale
+
+    @staticmethod
+    def take_region_screenshot(crop):
+        """
+        只截取完整画面中的指定区域。
+        :param crop: 截图区域，格式为(x, y, width, height)的比例值。
+        :return: 区域截图帧、区域的位置和缩放因子，与 crop_frame 的返回值一致。
+        """
+        from module.game import cloud_game
+        width, height = Screenshot.get_window_real_resolution(None)
+
+        # 与 crop_frame 使用相同的取整方式，保证两种方式得到的区域一致
+        left = int(width * crop[0])
+        top = int(height * crop[1])
+        crop_width = int(width * crop[2])
+        crop_height = int(height * crop[3])
+
+        data = cloud_game.take_screenshot_region(
+            (left, top, crop_width, crop_height),
+            image_format=cfg.cloud_game_region_capture_format,
+            quality=cfg.cloud_game_region_capture_quality,
+        )
+        frame = Frame.from_bytes(data, origin=(left, top), screen_size=(width, height))
+
+        return frame, (left, top, crop_width, crop_height), 1
+
+    @staticmethod
+    def crop_frame(frame, crop=(0, 0, 1, 1)):
+        """
+        按比例裁剪截图帧。
+        :param frame: 完整截图帧。
+        :param crop: 裁剪区域，格式为(x, y, width, height)的比例值。
+        :return: 裁剪后的帧、裁剪区域的位置和缩放因子。
+        """
+        width, height = frame.size
 
         left = int(width * crop[0])
         top = int(height * crop[1])
         crop_width = int(width * crop[2])
         crop_height = int(height * crop[3])
 
-        screenshot = screenshot.crop((left, top, left + crop_width, top + crop_height))
+        frame = frame.crop((left, top, left + crop_width, top + crop_height))
 
         # Selenium 截图分辨率一般就是浏览器窗口实际像素，所以 scale_factor 默认为 1
         screenshot_scale_factor = 1
 
         screenshot_pos = (left, top, crop_width, crop_height)
 
-        return screenshot, screenshot_pos, screenshot_scale_factor
+        return frame, screenshot_pos, screenshot_scale_factor
@@ -0,0 +1,134 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import cv2
+import numpy as np
+from utils.image_utils import ImageUtils
+from .pixel_signature import PixelSignature
+from utils.logger.logger import Logger
+
+
+class Template:
+    """
+    模板图片，一次读取文件后同时保存彩色、灰度和掩码数据，缩放结果也缓存在这里。
+    """
+
+    def __init__(self, path, data):
+        """
+        :param path: 模板图片路径。
+        :param data: 图片文件的字节数据。
+        """
+        buffer = np.frombuffer(data, np.uint8)
+        self.path = path
+        self.bgr = cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+        if self.bgr is None:
+            raise ValueError(f"读取图片失败：{path}")
+        self.gray = cv2.imdecode(buffer, cv2.IMREAD_GRAYSCALE)  # 与 cv2.imread 灰度读取的结果一致
+        self.mask = None
+        unchanged = cv2.imdecode(buffer, cv2.IMREAD_UNCHANGED)
+        if unchanged.ndim == 3 and unchanged.shape[-1] == 4:  # 检查通道数是否为4（含有透明通道）
+            alpha_channel = unchanged[:, :, 3]
+            if np.any(alpha_channel < 255):  # 检查是否存在非完全透明的像素
+                self.mask = alpha_channel
+        self.resize_cache = {}  # 缩放结果缓存，供 ImageUtils 复用
+        self._pixel_signature = None
+
+    @property
+    def shape(self):
+        return self.bgr.shape
+
+    @property
+    def pixel_signature(self) -> PixelSignature:
+        """由模板生成的像素特征，首次使用时生成"""
+        if self._pixel_signature is None:
+            self._pixel_signature = PixelSignature.from_template(self.bgr, self.mask)
+        return self._pixel_signature
+
+    def prepare_pyramid(self):
+        """预先计算金字塔匹配使用的缩小模板"""
+        if self.mask is not None:
+            return
+        for factor in (2, 4):
+            if min(self.bgr.shape[:2]) / factor >= ImageUtils.PYRAMID_MIN_TEMPLATE_SIZE:
+                ImageUtils.pyramid_downscale(self.bgr, factor, self.resize_cache)
+
+
+class TemplateBank:
+    """
+    模板图片库，启动时在线程池中预先读取 assets/images 下的所有模板，
+    各种匹配方式共用同一份解码结果，任务首次运行时不再等待读取和解码图片。
+    """
+
+    def __init__(self, root="./assets/images", logger: Optional[Logger] = None, workers=None):
+        """
+        :param root: 模板图片目录。
+        :param logger: 用于记录日志的Logger对象，可选参数。
+        :param workers: 预读取使用的线程数，默认为 CPU 核心数。
+        """
+        self.root = root
+        self.logger = logger
+        self.workers = workers or os.cpu_count() or 4
+        self._templates = {}
+        self._lock = threading.Lock()
+        self._preload_thread = None
+
+    @staticmethod
+    def _key(path):
+        return os.path.normpath(path)
+
+    def _load(self, path):
+        with open(path, 'rb') as file:
+            data = file.read()
+        return Template(path, data)
+
+    def get(self, path, reload=False) -> Template:
+        """
+        获取模板图片，未预读取的图片会在此时读取并缓存。
+        :param path: 模板图片路径。
+        :param reload: 是否忽略缓存重新读取文件。
+        :return: 模板图片对象，读取失败时抛出 ValueError。
+        """
+        key = self._key(path)
+        template = None if reload else self._templates.get(key)
+        if template is None:
+            try:
+                template = self._load(path)
+            except OSError:
+                raise ValueError(f"读取图片失败：{path}")
+            with self._lock:
+                self._templates[key] = template
+        return template
+
+    def preload(self):
+        """读取目录下的所有模板图片并预先计算缩小模板"""
+        paths = []
+        for dirpath, _, filenames in os.walk(self.root):
+            paths.extend(os.path.join(dirpath, name) for name in filenames if name.lower().endswith(".png"))
+
+        def load(path):
+            key = self._key(path)
+            if key in self._templates:
+                return
+            try:
+                template = self._load(path)
+                template.prepare_pyramid()
+            except Exception as e:
+                self._log_debug(f"预读取模板失败：{path} {e}")
+                return
+            with self._lock:
+                self._templates.setdefault(key, template)
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="m7a_template") as executor:
+            list(executor.map(load, paths))
+        self._log_debug(f"已预读取 {len(self._templates)} 张模板图片")
+
+    def preload_async(self):
+        """在后台线程中预读取模板图片，不阻塞启动"""
+        if self._preload_thread is None:
+            self._preload_thread = threading.Thread(target=self.preload, daemon=True, name="m7a_template_preload")
+            self._preload_thread.start()
+
+    def _log_debug(self, message):
+        if self.logger is not None:
+            self.logger.debug(message)
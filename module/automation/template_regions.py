@@ -0,0 +1,142 @@
+import os
+import json
+import time
+import atexit
+import threading
+from typing import Optional
+from utils.logger.logger import Logger
+
+
+class TemplateRegionIndex:
+    """
+    模板区域索引，记录每张模板图片在画面中可能出现的区域。
+
+    区域有两种来源：
+    - 声明的区域：写在配置文件中，始终只在该区域内查找。
+    - 学习的区域：由成功匹配的位置合并而成，命中次数足够后才启用；区域内未找到时由调用方在同一次查找中
+      继续全图查找（同一模板可能出现在不同弹窗的不同位置），并把新位置合并到区域中。
+      连续 trusted_hits 次命中都没有扩大区域后视为可信，与声明的区域一样只在区域内查找，
+      等待循环中反复查找不存在的元素时不再每次都全图匹配。
+
+    区域统一以(x, y, width, height)的比例值保存，与 find_element 的 crop 参数格式一致。
+    """
+
+    SAVE_INTERVAL = 30  # 学习结果两次写入文件之间的最小间隔（秒）
+
+    def __init__(self, declared_path, learned_path, margin=48, min_hits=3, trusted_hits=20, logger: Optional[Logger] = None):
+        """
+        :param declared_path: 声明区域的配置文件路径。
+        :param learned_path: 学习区域的保存路径。
+        :param margin: 查找时在区域四周扩展的边距（像素）。
+        :param min_hits: 学习区域启用前需要的成功匹配次数。
+        :param trusted_hits: 学习区域连续命中且没有扩大的次数达到该值后，区域内未找到即视为不存在；为0时始终继续全图查找。
+        :param logger: 用于记录日志的Logger对象，可选参数。
+        """
+        self.declared_path = declared_path
+        self.learned_path = learned_path
+        self.margin = margin
+        self.min_hits = min_hits
+        self.trusted_hits = trusted_hits
+        self.logger = logger
+        self.declared = self._load(declared_path)
+        self.learned = self._load(learned_path)  # 值为 {"region": [x, y, width, height], "hits": 命中次数, "stable": 区域最近一次扩大后的命中次数}
+        self._dirty = False
+        self._last_save_time = time.time()
+        self._lock = threading.Lock()
+        atexit.register(self.save)
+
+    def _load(self, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self._log_debug(f"模板区域文件加载失败：{path} {e}")
+            return {}
+
+    @staticmethod
+    def _key(target):
+        """模板图片相对于 assets/images 的路径，作为索引的键"""
+        path = os.path.normpath(target).replace("\\", "/")
+        prefix = "assets/images/"
+        return path[path.find(prefix) + len(prefix):] if prefix in path else path
+
+    def lookup(self, target, frame_width, frame_height):
+        """
+        获取模板的查找区域。
+        :param target: 模板图片路径。
+        :param frame_width: 完整截图的宽度。
+        :param frame_height: 完整截图的高度。
+        :return: 查找区域，格式为(left, top, right, bottom)，单位为像素；没有可用区域时返回None。
+        """
+        key = self._key(target)
+        region = self.declared.get(key)
+        if region is None:
+            entry = self.learned.get(key)
+            if entry is None or entry["hits"] < self.min_hits:
+                return None
+            region = entry["region"]
+        x, y, w, h = region
+        left = max(0, int(x * frame_width) - self.margin)
+        top = max(0, int(y * frame_height) - self.margin)
+        right = min(frame_width, int((x + w) * frame_width) + self.margin)
+        bottom = min(frame_height, int((y + h) * frame_height) + self.margin)
+        return left, top, right, bottom
+
+    def is_trusted(self, target) -> bool:
+        """模板的区域是否可信（声明的区域，或足够稳定的学习区域），可信的区域内未找到即视为不存在，不再全图查找"""
+        key = self._key(target)
+        if key in self.declared:
+            return True
+        entry = self.learned.get(key)
+        return bool(self.trusted_hits) and entry is not None and entry.get("stable", 0) >= self.trusted_hits
+
+    def record_hit(self, target, top_left, bottom_right, frame_width, frame_height):
+        """
+        记录一次成功匹配，把匹配位置合并到学习区域中。
+        :param top_left: 匹配位置左上角在完整截图中的坐标。
+        :param bottom_right: 匹配位置右下角在完整截图中的坐标。
+        """
+        key = self._key(target)
+        x1, y1 = top_left[0] / frame_width, top_left[1] / frame_height
+        x2, y2 = bottom_right[0] / frame_width, bottom_right[1] / frame_height
+        with self._lock:
+            entry = self.learned.get(key)
+            if entry is None:
+                self.learned[key] = {"region": [round(x1, 4), round(y1, 4), round(x2 - x1, 4), round(y2 - y1, 4)], "hits": 1, "stable": 0}
+                self._dirty = True
+            else:
+                x, y, w, h = entry["region"]
+                nx1, ny1 = min(x, x1), min(y, y1)
+                nx2, ny2 = max(x + w, x2), max(y + h, y2)
+                region = [round(nx1, 4), round(ny1, 4), round(nx2 - nx1, 4), round(ny2 - ny1, 4)]
+                stable = 0 if region != entry["region"] else entry.get("stable", 0) + 1
+                if region != entry["region"] or entry["hits"] < self.min_hits or stable <= self.trusted_hits:
+                    self._dirty = True
+                entry["region"] = region
+                entry["hits"] += 1
+                entry["stable"] = stable
+        self._save_if_needed()
+
+    def _save_if_needed(self):
+        if self._dirty and time.time() - self._last_save_time > self.SAVE_INTERVAL:
+            self.save()
+
+    def save(self):
+        """保存学习到的区域"""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.learned_path) or ".", exist_ok=True)
+                with open(self.learned_path, 'w', encoding='utf-8') as file:
+                    json.dump(self.learned, file, ensure_ascii=False, indent=4, sort_keys=True)
+                self._dirty = False
+            except Exception as e:
+                self._log_debug(f"模板区域文件保存失败：{e}")
+            self._last_save_time = time.time()
+
+    def _log_debug(self, message):
+        if self.logger is not None:
+            self.logger.debug(message)
@@ -0,0 +1,153 @@
+import time
+from abc import ABC, abstractmethod
+from module.ocr import ocr
+
+
+class Condition(ABC):
+    """
+    等待条件基类。
+    每个条件在截图的指定区域内检查，cost 越小越先检查，满足后检查结果保存在 result 中。
+    """
+
+    cost = 1  # 检查开销，模板匹配为 1，OCR 为 10
+
+    def __init__(self, crop=(0, 0, 1, 1), name=None):
+        """
+        :param crop: 检查区域，格式为(x, y, width, height)的比例值，默认为全屏。
+        :param name: 条件名称，便于调用方区分满足的是哪个条件。
+        """
+        self.crop = crop
+        self.name = name
+        self.result = None
+
+    @abstractmethod
+    def check(self, automation):
+        """
+        在当前截图上检查条件，此时 automation.frame 已经是裁剪后的检查区域。
+        :return: 条件满足时返回非空结果。
+        """
+        pass
+
+
+class ImageCondition(Condition):
+    """画面中出现指定图片"""
+
+    cost = 1
+
+    def __init__(self, target, threshold=0.9, crop=(0, 0, 1, 1), scale_range=None, name=None, find_type="image"):
+        """
+        :param find_type: 查找类型，"image" 为模板匹配，"pixels" 为像素特征。
+        """
+        super().__init__(crop, name)
+        self.target = target
+        self.threshold = threshold
+        self.scale_range = scale_range
+        self.find_type = find_type
+
+    def check(self, automation):
+        return automation.find_element(self.target, self.find_type, self.threshold, take_screenshot=False, scale_range=self.scale_range)
+
+
+class TextCondition(Condition):
+    """画面中出现指定文字"""
+
+    cost = 10
+
+    def __init__(self, target, include=True, crop=(0, 0, 1, 1), name=None):
+        super().__init__(crop, name)
+        self.target = target
+        self.include = include
+
+    def check(self, automation):
+        return automation.find_element(self.target, "text", take_screenshot=False, include=self.include)
+
+
+class SingleLineTextCondition(Condition):
+    """区域内的单行文字等于指定文字"""
+
+    cost = 10
+
+    def __init__(self, text, crop, blacklist=None, name=None):
+        super().__init__(crop, name)
+        self.text = text
+        self.blacklist = blacklist
+
+    def check(self, automation):
+        result = ocr.recognize_single_line(automation.frame, self.blacklist)
+        return result is not None and result[0] == self.text
+
+
+class PixelCondition(Condition):
+    """指定像素的颜色与目标颜色相近"""
+
+    cost = 0
+
+    def __init__(self, pos, pixel_bgr, tolerance=30, name=None):
+        """
+        :param pos: 像素在完整截图中的坐标(x, y)。
+        :param pixel_bgr: 目标颜色的BGR值。
+        :param tolerance: 每个通道允许的最大差值。
+        """
+        super().__init__(name=name)
+        self.pos = pos
+        self.pixel_bgr = pixel_bgr
+        self.tolerance = tolerance
+
+    def check(self, automation):
+        x, y = self.pos
+        pixel = automation.frame.bgr[y, x]
+        return all(abs(int(pixel[i]) - self.pixel_bgr[i]) <= self.tolerance for i in range(3))
+
+
+class FuncCondition(Condition):
+    """自定义条件，func 在当前截图上检查并返回结果"""
+
+    def __init__(self, func, crop=(0, 0, 1, 1), cost=1, name=None):
+        super().__init__(crop, name)
+        self.func = func
+        self.cost = cost
+
+    def check(self, automation):
+        return self.func()
+
+
+def wait_for_any(automation, conditions, timeout, interval=0.2, change_detector=None):
+    """
+    等待任意一个条件满足。
+    每轮只截一次图，所有条件共用这一帧，按开销从小到大依次检查，任意一个满足立即返回；
+    推送帧源没有新帧时不会重复检查同一帧。
+    :param automation: Automation 实例。
+    :param conditions: 等待条件列表。
+    :param timeout: 超时时间（秒）。
+    :param interval: 两次截图之间的最小间隔（秒）。
+    :param change_detector: 画面变化检测器，可选，传入时检查区域未变化的条件沿用上次未满足的结果，不再重复检查。
+    :return: 第一个满足的条件，超时返回None。
+    """
+    ordered = sorted(conditions, key=lambda condition: condition.cost)
+    deadline = time.time() + timeout
+    last_frame_id = None
+    while True:
+        round_start = time.time()
+        automation.take_screenshot()
+        frame = automation.frame
+        if frame.id != last_frame_id:
+            last_frame_id = frame.id
+            try:
+                for condition in ordered:
+                    if change_detector is not None and condition.cost > 0 and not change_detector.changed(condition, frame, condition.crop):
+                        continue
+                    automation.use_frame(frame, condition.crop)
+                    try:
+                        result = condition.check(automation)
+                    except Exception as e:
+                        automation.logger.debug(f"检查等待条件出错：{e}")
+                        result = None
+                    if result:
+                        condition.result = result
+                        return condition
+            finally:
+                automation.use_frame(frame)
+        now = time.time()
+        if now >= deadline:
+            return None
+        time.sleep(max(0.0, min(interval - (now - round_start), deadline - now)))
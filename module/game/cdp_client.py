@@ -0,0 +1,177 @@
+import json
+import itertools
+import threading
+from concurrent.futures import Future
+from typing import Optional
+from utils.logger.logger import Logger
+
+
+class CdpError(Exception):
+    """浏览器返回的 CDP 错误"""
+
+    def __init__(self, method, error):
+        self.method = method
+        self.code = error.get("code")
+        super().__init__(f"{method} 执行失败：{error.get('message')} {error.get('data', '')}".strip())
+
+
+class CdpClient:
+    """
+    直连浏览器 DevTools 的 CDP 客户端。
+    通过 Selenium 的 se:cdp 地址建立一条长期保持的 websocket 连接，命令带消息 ID 发送，
+    多条命令可以连续发送而不必等待上一条返回，每条命令的开销从一次经过 Selenium Hub 的 HTTP 请求降为一帧 websocket 消息。
+    """
+
+    DEFAULT_TIMEOUT = 10  # 命令的默认超时时间（秒）
+
+    def __init__(self, ws_url, logger: Optional[Logger] = None, timeout=DEFAULT_TIMEOUT):
+        """
+        :param ws_url: DevTools websocket 地址，通常为 driver.capabilities["se:cdp"]。
+        :param logger: 用于记录日志的Logger对象，可选参数。
+        :param timeout: 命令的默认超时时间（秒）。
+        """
+        self.ws_url = ws_url
+        self.logger = logger
+        self.timeout = timeout
+        self.session_id = None  # 附加到页面后的会话ID，命令默认发送到该页面
+        self._ws = None
+        self._ids = itertools.count(1)
+        self._pending = {}  # 键为消息ID，值为 (命令名, Future)
+        self._listeners = {}  # 键为事件名，值为回调函数列表
+        self._lock = threading.Lock()
+        self._reader = None
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None and self._reader is not None and self._reader.is_alive()
+
+    def connect(self):
+        """建立 websocket 连接并启动接收线程"""
+        import websocket
+        self._ws = websocket.create_connection(self.ws_url, timeout=self.timeout, suppress_origin=True, enable_multithread=True)
+        self._ws.settimeout(None)  # 接收线程阻塞等待消息，超时由各命令自己控制
+        self._reader = threading.Thread(target=self._read_loop, args=(self._ws,), daemon=True, name="m7a_cdp_reader")
+        self._reader.start()
+
+    def attach(self, target_id=None, url_contains=None):
+        """
+        附加到页面，之后的命令默认发送到该页面。
+        :param target_id: 页面的 targetId，Chrome 中与 Selenium 的窗口句柄相同。
+        :param url_contains: 未指定 target_id 或找不到时，选择地址包含该字符串的页面。
+        :return: 会话ID。
+        """
+        targets = [t for t in self.send("Target.getTargets", session=False)["targetInfos"] if t["type"] == "page"]
+        if not targets:
+            raise CdpError("Target.getTargets", {"message": "没有可用的页面"})
+        target = next((t for t in targets if t["targetId"] == target_id), None)
+        if target is None and url_contains:
+            target = next((t for t in targets if url_contains in t.get("url", "")), None)
+        target = target or targets[0]
+        result = self.send("Target.attachToTarget", {"targetId": target["targetId"], "flatten": True}, session=False)
+        self.session_id = result["sessionId"]
+        return self.session_id
+
+    def send_async(self, method, params=None, session=True) -> Future:
+        """
+        发送命令，不等待返回。
+        :param method: 命令名，如 "Input.dispatchMouseEvent"。
+        :param params: 命令参数。
+        :param session: 是否发送到附加的页面，为False时发送到浏览器。
+        :return: 命令结果的 Future，浏览器返回错误时结果为 CdpError。
+        """
+        if self._ws is None:
+            raise ConnectionError("CDP 连接未建立")
+        message_id = next(self._ids)
+        future = Future()
+        message = {"id": message_id, "method": method, "params": params or {}}
+        if session and self.session_id:
+            message["sessionId"] = self.session_id
+        with self._lock:
+            self._pending[message_id] = (method, future)
+        try:
+            self._ws.send(json.dumps(message))
+        except Exception as e:
+            with self._lock:
+                self._pending.pop(message_id, None)
+            raise ConnectionError(f"CDP 命令发送失败：{e}")
+        return future
+
+    def send(self, method, params=None, timeout=None, session=True):
+        """
+        发送命令并等待返回。
+        :return: 命令结果。
+        """
+        return self.send_async(method, params, session).result(timeout or self.timeout)
+
+    def on(self, event, callback):
+        """
+        订阅事件，回调在接收线程中执行，参数为事件的 params，应尽快返回。
+        :param event: 事件名，如 "Page.screencastFrame"。
+        """
+        with self._lock:
+            self._listeners.setdefault(event, []).append(callback)
+
+    def off(self, event, callback):
+        """取消订阅事件"""
+        with self._lock:
+            callbacks = self._listeners.get(event, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def _read_loop(self, ws):
+        try:
+            while True:
+                raw = ws.recv()
+                if not raw:
+                    break
+                self._dispatch(json.loads(raw))
+        except Exception as e:
+            if self._ws is ws:
+                self._log_debug(f"CDP 连接已断开：{e}")
+        finally:
+            self._fail_pending(ConnectionError("CDP 连接已断开"))
+
+    def _dispatch(self, message):
+        if "id" in message:
+            with self._lock:
+                method, future = self._pending.pop(message["id"], (None, None))
+            if future is None:
+                return
+            if "error" in message:
+                future.set_exception(CdpError(method, message["error"]))
+            else:
+                future.set_result(message.get("result", {}))
+            return
+        event = message.get("method")
+        session_id = message.get("sessionId")
+        if session_id is not None and session_id != self.session_id:
+            return
+        with self._lock:
+            callbacks = list(self._listeners.get(event, ()))
+        for callback in callbacks:
+            try:
+                callback(message.get("params", {}))
+            except Exception as e:
+                self._log_debug(f"CDP 事件处理出错：{event} {e}")
+
+    def _fail_pending(self, error):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for _, future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    def close(self):
+        """关闭连接，未返回的命令以 ConnectionError 结束"""
+        ws, self._ws = self._ws, None
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+        self._fail_pending(ConnectionError("CDP 连接已关闭"))
+        self.session_id = None
+
+    def _log_debug(self, message):
+        if self.logger is not None:
+            self.logger.debug(message)
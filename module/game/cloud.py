@@ -1,5 +1,6 @@
 import os
 import json
+import base64
 import psutil
 from time import sleep
 from selenium import webdriver
@@ -17,6 +18,7 @@ from threading import Event
 
 from module.config import Config
 from module.game.base import GameControllerBase
+from module.game.cdp_client import CdpClient, CdpError
 from module.logger import Logger
 #from utils.encryption import wdp_encrypt, wdp_decrypt
 
@@ -29,6 +31,47 @@ class CloudGameController(GameControllerBase):
     GAME_URL = "https://sr.mihoyo.com/cloud"            # 游戏地址
     # BROWSER_TAG 已移除：不再标记浏览器进程用于复用/清理
     MAX_RETRIES = 3  # 网页加载重试次数，0=不重试
+    CDP_RECONNECT_INTERVAL = 5  # CDP 直连失败后，两次重连之间的最小间隔（秒）
+    MAX_ACTION_RECORDS = 100  # 保留的输入操作记录数量
+    # 从云游戏的 <video> 元素取帧：按视频在页面中的显示位置绘制到离屏 canvas 上，
+    # 只绘制需要的区域并在浏览器内缩放，返回 RGBA 原始数据或编码后的图片（均为 base64）
+    VIDEO_CAPTURE_SCRIPT = """
+        const [region, scale, encoding, quality] = arguments;
+        const video = document.querySelector('.game-player video') || document.querySelector('video');
+        if (!video || video.readyState < 2 || !video.videoWidth) return null;
+        const rect = video.getBoundingClientRect();
+        const fit = getComputedStyle(video).objectFit;
+        let contentWidth = rect.width, contentHeight = rect.height;
+        if (fit !== 'fill') {
+            const ratio = (fit === 'cover' ? Math.max : Math.min)(rect.width / video.videoWidth, rect.height / video.videoHeight);
+            contentWidth = video.videoWidth * ratio;
+            contentHeight = video.videoHeight * ratio;
+        }
+        const contentX = rect.left + (rect.width - contentWidth) / 2;
+        const contentY = rect.top + (rect.height - contentHeight) / 2;
+        const [left, top, width, height] = region || [0, 0, window.innerWidth, window.innerHeight];
+        const outWidth = Math.max(1, Math.round(width * scale));
+        const outHeight = Math.max(1, Math.round(height * scale));
+        const canvas = window.__m7aCaptureCanvas || (window.__m7aCaptureCanvas = document.createElement('canvas'));
+        if (canvas.width !== outWidth) canvas.width = outWidth;
+        if (canvas.height !== outHeight) canvas.height = outHeight;
+        const ctx = canvas.getContext('2d', {alpha: false, willReadFrequently: true});
+        ctx.setTransform(1, 0, 0, 1, 0, 0);
+        ctx.fillStyle = '#000';
+        ctx.fillRect(0, 0, outWidth, outHeight);
+        ctx.setTransform(scale, 0, 0, scale, -left * scale, -top * scale);
+        ctx.drawImage(video, contentX, contentY, contentWidth, contentHeight);
+        if (encoding === 'raw') {
+            const bytes = ctx.getImageData(0, 0, outWidth, outHeight).data;
+            const chunks = [];
+            for (let i = 0; i < bytes.length; i += 0x8000) {
+                chunks.push(String.fromCharCode.apply(null, bytes.subarray(i, i + 0x8000)));
+            }
+            return {width: outWidth, height: outHeight, data: btoa(chunks.join(''))};
+        }
+        const url = canvas.toDataURL('image/' + encoding, quality);
+        return {width: outWidth, height: outHeight, data: url.slice(url.indexOf(',') + 1)};
+    """
     PERFERENCES = {
         "profile": {
             "content_settings": {
@@ -49,6 +92,14 @@ class CloudGameController(GameControllerBase):
         self.driver = None
         self.cfg = cfg
         self.logger = logger
+        self._cdp_client = None
+        self._cdp_client_driver = None  # 创建 CDP 直连时对应的 driver，浏览器重启后需要重新连接
+        self._cdp_client_lock = threading.Lock()
+        self._cdp_last_connect_time = 0
+        self.last_input_time = 0  # 最近一次发送输入事件的时间，帧源据此丢弃输入前的画面
+        self.last_action_id = 0  # 最近一次输入操作的编号
+        self._action_times = {}  # 最近的输入操作编号及其完成时间
+        self._action_lock = threading.Lock()
         # 已移除：退出时自动清理浏览器（不再复用/批量关闭由小助手启动的浏览器）
         # atexit.register(self._clean_at_exit)
 
@@ -445,6 +496,7 @@ class CloudGameController(GameControllerBase):
             except Exception:
                 pass
             self.driver = None
+            self._close_cdp_client()
             
         # 已移除：不再在 stop_game 中额外尝试关闭由小助手启动的其它浏览器进程
         return True
@@ -469,7 +521,7 @@ class CloudGameController(GameControllerBase):
     
     def is_in_game(self) -> bool:
         if self.driver:
-            return True if self.driver.find_elements(By.CSS_SELECTOR, ".game-player") else False
+            return bool(self.run_script("return !!document.querySelector('.game-player');"))
         
     # 启动线程监视 is_in_game（True -> False 时会调用 _save_local_storage）
     def start_in_game_watcher(self, poll_interval: float = 1.0) -> None:
@@ -599,11 +651,229 @@ class CloudGameController(GameControllerBase):
         """浏览器内截图"""
         if not self.driver:
             return None
+        if self.get_cdp_client() is not None:
+            result = self.execute_cdp_cmd("Page.captureScreenshot", {"format": "png"})
+            return base64.b64decode(result["data"])
         png = self.driver.get_screenshot_as_png()
         return png
+
+    def take_screenshot_region(self, region, image_format="png", quality=None) -> bytes:
+        """
+        浏览器内区域截图，只编码和传输指定区域的像素。
+        :param region: 截图区域，格式为(left, top, width, height)，单位为像素。网页分辨率固定为 1920x1080 且缩放为 1，像素与 CSS 坐标一致。
+        :param image_format: 编码格式，可选值 "png", "jpeg", "webp"。
+        :param quality: jpeg/webp 的压缩质量，取值 0-100，png 时忽略。
+        :return: 编码后的图片字节数据。
+        """
+        if not self.driver:
+            return None
+        left, top, width, height = region
+        params = {
+            "format": image_format,
+            "clip": {"x": left, "y": top, "width": width, "height": height, "scale": 1},
+            "captureBeyondViewport": False,
+            "optimizeForSpeed": True,  # 使用更快的编码参数，png 压缩率更低
+        }
+        if image_format != "png" and quality is not None:
+            params["quality"] = int(quality)
+        result = self.execute_cdp_cmd("Page.captureScreenshot", params)
+        return base64.b64decode(result["data"])
+
+    def grab_video_frame(self, region=None, scale=1.0, encoding="raw", quality=90):
+        """
+        直接从云游戏的视频元素取帧，不经过浏览器合成整个页面和 PNG 编码。
+        画面中只包含游戏视频，不包含网页上覆盖的按钮、浮球等元素。
+        :param region: 取帧区域，格式为(left, top, width, height)，单位为页面像素，None 表示整个页面。
+        :param scale: 在浏览器内缩放的比例。
+        :param encoding: 返回格式，"raw" 为 RGBA 原始数据，也可以是 "jpeg", "png", "webp"。
+        :param quality: jpeg/webp 的压缩质量，取值 0-100。
+        :return: (宽度, 高度, 字节数据)，视频未就绪或取帧失败时返回None。
+        """
+        if not self.driver:
+            return None
+        try:
+            result = self.run_script(
+                self.VIDEO_CAPTURE_SCRIPT,
+                list(region) if region else None, scale, encoding, quality / 100,
+            )
+        except (WebDriverException, CdpError) as e:
+            # 视频跨域等原因导致 canvas 无法读取时，由调用方回退到普通截图
+            self.log_debug(f"视频取帧失败：{e}")
+            return None
+        if not result:
+            return None
+        return result["width"], result["height"], base64.b64decode(result["data"])
+
+    def benchmark_capture(self, rounds=20) -> dict:
+        """
+        比较不同截图方式的耗时和 CPU 占用，结果会输出到日志。
+        本地 CPU 为本进程的 CPU 时间（包含解码），浏览器 CPU 取自 Performance.getMetrics 的 TaskDuration。
+        :param rounds: 每种方式的截图次数。
+        :return: 字典，键为截图方式，值为 (平均耗时, 平均本地 CPU 时间, 平均浏览器 CPU 时间)，单位为毫秒。
+        """
+        from io import BytesIO
+        from PIL import Image
+
+        def decode(data):
+            image = Image.open(BytesIO(data))
+            image.load()
+
+        def task_duration():
+            metrics = self.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+            return next((m["value"] for m in metrics if m["name"] == "TaskDuration"), 0.0)
+
+        def video(encoding):
+            def capture():
+                result = self.grab_video_frame(encoding=encoding, quality=self.cfg.cloud_game_video_capture_quality)
+                if result is None:
+                    raise RuntimeError("视频未就绪")
+                if encoding != "raw":
+                    decode(result[2])
+            return capture
+
+        methods = {
+            "screenshot_png": lambda: decode(self.take_screenshot()),
+            "capture_screenshot_jpeg": lambda: decode(self.take_screenshot_region((0, 0, 1920, 1080), "jpeg", 90)),
+            "video_raw": video("raw"),
+            "video_jpeg": video("jpeg"),
+        }
+        self.execute_cdp_cmd("Performance.enable", {})
+        results = {}
+        for name, capture in methods.items():
+            try:
+                capture()  # 预热
+                start_time, start_cpu, start_task = time.perf_counter(), time.process_time(), task_duration()
+                for _ in range(rounds):
+                    capture()
+                elapsed = (time.perf_counter() - start_time) * 1000 / rounds
+                cpu = (time.process_time() - start_cpu) * 1000 / rounds
+                browser_cpu = (task_duration() - start_task) * 1000 / rounds
+            except Exception as e:
+                self.log_warning(f"截图方式 {name} 测试失败：{e}")
+                continue
+            results[name] = (elapsed, cpu, browser_cpu)
+            self.log_info(f"{name}：平均耗时 {elapsed:.1f}ms，本地 CPU {cpu:.1f}ms，浏览器 CPU {browser_cpu:.1f}ms")
+        return results
     
     def execute_cdp_cmd(self, cmd: str, cmd_args: dict):
-        return self.driver.execute_cdp_cmd(cmd, cmd_args)
+        try:
+            client = self.get_cdp_client()
+            if client is not None:
+                try:
+                    return client.send(cmd, cmd_args)
+                except ConnectionError as e:
+                    self.log_debug(f"CDP 直连不可用，改用 Selenium 执行：{e}")
+                    self._close_cdp_client()
+            return self.driver.execute_cdp_cmd(cmd, cmd_args)
+        finally:
+            if cmd.startswith("Input."):
+                self._record_action()
+
+    def execute_cdp_sequence(self, commands) -> None:
+        """
+        按时间顺序执行一组 CDP 命令。
+        CDP 直连可用时每条命令到时间后立即发送，不等待上一条返回，全部发送后再统一检查结果；否则逐条通过 Selenium 执行。
+        :param commands: 命令列表，元素为 (相对开始时间的秒数, 命令名, 参数)，需按时间排序。
+        """
+        client = self.get_cdp_client()
+        futures = []
+        start_time = time.perf_counter()
+        for offset, cmd, cmd_args in commands:
+            delay = offset - (time.perf_counter() - start_time)
+            if delay > 0:
+                sleep(delay)
+            if client is not None:
+                try:
+                    futures.append(client.send_async(cmd, cmd_args))
+                    continue
+                except ConnectionError as e:
+                    self.log_debug(f"CDP 直连不可用，改用 Selenium 执行：{e}")
+                    self._close_cdp_client()
+                    client = None
+            self.driver.execute_cdp_cmd(cmd, cmd_args)
+        try:
+            for future in futures:
+                future.result(CdpClient.DEFAULT_TIMEOUT)
+        finally:
+            if any(cmd.startswith("Input.") for _, cmd, _ in commands):
+                self._record_action()
+
+    def _record_action(self) -> int:
+        """为刚完成的输入操作编号并记录完成时间"""
+        with self._action_lock:
+            now = time.time()
+            self.last_action_id += 1
+            self._action_times[self.last_action_id] = now
+            self._action_times.pop(self.last_action_id - self.MAX_ACTION_RECORDS, None)
+            self.last_input_time = now
+            return self.last_action_id
+
+    def get_action_time(self, action_id=None) -> float:
+        """
+        获取输入操作的完成时间。
+        :param action_id: 输入操作编号，默认为最近一次操作。
+        :return: 完成时间，没有记录时返回None。
+        """
+        return self._action_times.get(self.last_action_id if action_id is None else action_id)
+
+    def run_script(self, script: str, *args):
+        """
+        在页面中执行脚本并返回结果，与 driver.execute_script 的用法一致（脚本中使用 return 和 arguments）。
+        CDP 直连可用时通过 Runtime.evaluate 执行。
+        """
+        client = self.get_cdp_client()
+        if client is not None:
+            expression = f"(function() {{ {script} }}).apply(null, {json.dumps(list(args))})"
+            try:
+                result = client.send("Runtime.evaluate", {"expression": expression, "returnByValue": True, "awaitPromise": True})
+            except ConnectionError as e:
+                self.log_debug(f"CDP 直连不可用，改用 Selenium 执行：{e}")
+                self._close_cdp_client()
+            else:
+                if "exceptionDetails" in result:
+                    details = result["exceptionDetails"]
+                    raise CdpError("Runtime.evaluate", {"message": details.get("exception", {}).get("description") or details.get("text")})
+                return result.get("result", {}).get("value")
+        return self.driver.execute_script(script, *args)
+
+    def get_cdp_client(self) -> CdpClient:
+        """
+        获取 CDP 直连客户端，未开启、浏览器未启动或连接失败时返回None，由调用方改用 Selenium。
+        """
+        if not self.cfg.cloud_game_cdp_direct_enable:
+            return None
+        driver = self.driver
+        if driver is None:
+            return None
+        client = self._cdp_client
+        if client is not None and self._cdp_client_driver is driver and client.connected:
+            return client
+        with self._cdp_client_lock:
+            if self._cdp_client is not None and self._cdp_client_driver is driver and self._cdp_client.connected:
+                return self._cdp_client
+            if time.time() - self._cdp_last_connect_time < self.CDP_RECONNECT_INTERVAL:
+                return None
+            self._cdp_last_connect_time = time.time()
+            self._close_cdp_client()
+            ws_url = driver.capabilities.get("se:cdp")
+            if not ws_url:
+                return None
+            client = CdpClient(ws_url, self.logger)
+            try:
+                client.connect()
+                client.attach(driver.current_window_handle, url_contains="sr.mihoyo.com")
+            except Exception as e:
+                self.log_debug(f"CDP 直连失败，改用 Selenium 执行：{e}")
+                client.close()
+                return None
+            self._cdp_client, self._cdp_client_driver = client, driver
+            self.log_debug("已建立 CDP 直连")
+            return client
+
+    def _close_cdp_client(self) -> None:
+        client, self._cdp_client, self._cdp_client_driver = self._cdp_client, None, None
+        if client is not None:
+            client.close()
     
     def get_window_handle(self) -> int:
         return self.driver.current_window_handle
@@ -656,6 +926,7 @@ class CloudGameController(GameControllerBase):
             except Exception:
                 pass
             self.driver = None
+            self._close_cdp_client()
             
         # 已移除：不再在 stop_game 中额外尝试关闭由小助手启动的其它浏览器进程
         return True
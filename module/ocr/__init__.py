@@ -1,6 +1,9 @@
 
+from module.config import cfg
 from module.logger import log
 from module.ocr.ocr import OCR
+from module.ocr.ocr_cache import OcrResultCache
+from module.ocr.digit_reader import DigitReader, DigitField
 import json
 
 
@@ -8,5 +11,11 @@ import json
 # 读取 OCR 替换配置
 with open("./assets/config/ocr_replacements.json", 'r', encoding='utf-8') as file:
     replacements = json.load(file)
+# 初始化 OCR 结果缓存，文字替换配置参与缓存键的计算
+ocr_cache = None
+if cfg.ocr_cache_enable:
+    ocr_cache = OcrResultCache(cfg.ocr_cache_size, cfg.ocr_cache_ttl, cfg.ocr_cache_quantize_bits, json.dumps(replacements, sort_keys=True))
 # 初始化 OCR 对象
-ocr = OCR("remote://ocr:3746", log, replacements)
+ocr = OCR("remote://ocr:3746", log, replacements, ocr_cache)
+# 初始化数字识别，未启用时数字区域直接使用 OCR 识别
+digit_reader = DigitReader(ocr, log, cfg.digit_reader_glyph_path) if cfg.digit_reader_enable else None
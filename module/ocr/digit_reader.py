@@ -0,0 +1,203 @@
+import os
+import re
+import threading
+import cv2
+import numpy as np
+
+
+class DigitField:
+    """
+    数字区域的识别配置，每个区域单独学习字形，不同区域的字号、颜色互不影响。
+    """
+
+    def __init__(self, name, charset="0123456789", pattern=None, min_score=0.85, min_margin=0.04, min_ocr_score=0.9):
+        """
+        :param name: 区域名称，用作字形模板的键，只能包含字母、数字和下划线。
+        :param charset: 区域可能出现的、需要返回的字符，全部学习到模板后才在本地识别；其他字符（如货币图标）也会学习，但识别结果中会去掉。
+        :param pattern: 结果需要完全匹配的正则表达式，可选；不匹配的本地识别结果交给OCR识别，不匹配的OCR结果不用于学习。
+        :param min_score: 每个字形与模板的最低相似度，低于该值时交给OCR识别。
+        :param min_margin: 最佳字符与其他字符相似度的最小差距，差距过小视为无法区分，交给OCR识别。
+        :param min_ocr_score: OCR结果的置信度不低于该值时才用于学习字形。
+        """
+        self.name = name
+        self.charset = charset
+        self.pattern = re.compile(pattern) if pattern else None
+        self.min_score = min_score
+        self.min_margin = min_margin
+        self.min_ocr_score = min_ocr_score
+
+
+class DigitReader:
+    """
+    基于字形模板的数字识别。
+    游戏界面上的数字使用固定字体，区域二值化后按连通域切分出每个字形，与该区域已学习的模板比较即可得到结果，
+    不需要请求OCR服务。模板来自OCR识别结果：OCR文字长度与切分出的字形数量一致时，逐个字形记录为对应字符的模板，
+    并保存到文件中。区域字符集中还有字符没有模板时，未知字形会被当成最相近的已知字符，因此在字符集学习完整之前、
+    以及相似度不足时都使用OCR的结果。
+    """
+
+    GLYPH_SIZE = (12, 20)  # 字形归一化后的宽、高
+    MAX_TEMPLATES = 4  # 每个字符最多保存的模板数量
+
+    def __init__(self, ocr, logger=None, path=None):
+        """
+        :param ocr: OCR对象，用于识别失败时的后备识别和学习字形。
+        :param logger: 用于记录日志的Logger对象，可选参数。
+        :param path: 字形模板文件路径，为None时不保存。
+        """
+        self.ocr = ocr
+        self.logger = logger
+        self.path = path
+        self._templates = {}  # 键为 (区域名称, 字符)，值为 (字形矩阵 N×像素数, 宽高比 N)
+        self._stacked = {}  # 键为区域名称，值为该区域所有模板合并后的 (字符列表, 字形矩阵, 宽高比, 已学习的字符集合)，学习后重建
+        self._lock = threading.Lock()
+        self._load()
+
+    def recognize(self, field: DigitField, image, blacklist=None):
+        """
+        识别数字区域，本地识别失败时使用OCR识别，并用OCR结果学习字形。
+        :param field: 区域配置。
+        :param image: 区域图片，支持的格式同 OCR.run。
+        :param blacklist: 需要过滤掉的文本列表，仅用于OCR识别。
+        :return: (文字, 置信度)，未识别到时返回None。
+        """
+        bgr = self.ocr.to_bgr(image)
+        glyphs = self.segment(bgr)
+        result = self.read(field, glyphs)
+        if result is not None:
+            return result
+        result = self.ocr.recognize_single_line(image, blacklist)
+        if result is not None and result[1] >= field.min_ocr_score:
+            self.learn(field, glyphs, result[0])
+        return result
+
+    @classmethod
+    def segment(cls, bgr):
+        """
+        把区域切分为字形。
+        用 Otsu 阈值二值化，像素较少的一侧视为文字；连通域按横向重叠合并，去掉面积过小或明显低于最高字形的杂点。
+        :return: 字形列表，元素为 (归一化的字形向量, 宽高比)，按从左到右排列。
+        """
+        if bgr.ndim == 2:
+            gray = bgr
+        else:
+            gray = cv2.cvtColor(bgr, cv2.COLOR_BGRA2GRAY if bgr.shape[2] == 4 else cv2.COLOR_BGR2GRAY)
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        if cv2.countNonZero(binary) * 2 > binary.size:
+            binary = cv2.bitwise_not(binary)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+        boxes = [list(stats[i, :4]) for i in range(1, count) if stats[i, cv2.CC_STAT_AREA] >= 4]
+        if not boxes:
+            return []
+        boxes.sort(key=lambda b: b[0])
+        merged = [boxes[0]]
+        for x, y, w, h in boxes[1:]:
+            last = merged[-1]
+            if x < last[0] + last[2]:  # 横向重叠，属于同一字形（如被断开的笔画）
+                right, bottom = max(last[0] + last[2], x + w), max(last[1] + last[3], y + h)
+                last[0], last[1] = min(last[0], x), min(last[1], y)
+                last[2], last[3] = right - last[0], bottom - last[1]
+            else:
+                merged.append([x, y, w, h])
+        max_height = max(h for _, _, _, h in merged)
+        glyphs = []
+        for x, y, w, h in merged:
+            if h < max_height * 0.4:
+                continue
+            glyph = cv2.resize(binary[y:y + h, x:x + w], cls.GLYPH_SIZE, interpolation=cv2.INTER_AREA)
+            glyphs.append((glyph.astype(np.float32).ravel() / 255, w / h))
+        return glyphs
+
+    def read(self, field: DigitField, glyphs):
+        """
+        用已学习的模板识别字形。
+        :return: (文字, 置信度)，置信度为所有字形中最低的相似度；字符集尚未学习完整或有字形无法可靠识别时返回None。
+        """
+        stacked = self._get_stacked(field.name)
+        if not glyphs or stacked is None:
+            return None
+        chars, matrix, aspects, known = stacked
+        if not set(field.charset) <= known:
+            return None
+        vectors = np.stack([vector for vector, _ in glyphs])
+        glyph_aspects = np.array([aspect for _, aspect in glyphs], dtype=np.float32)[:, None]
+        similarity = 1 - np.abs(vectors[:, None, :] - matrix[None, :, :]).mean(axis=2)
+        # 宽高比差距较大时降低相似度，避免拉伸后的 1 与其他字形混淆
+        similarity -= np.maximum(0, np.abs(aspects - glyph_aspects) / np.maximum(aspects, glyph_aspects) - 0.2)
+        text, lowest = "", 1.0
+        for row in similarity:
+            best_index = int(row.argmax())
+            best, char = float(row[best_index]), chars[best_index]
+            others = row[chars != char]
+            second = float(others.max()) if others.size else 0.0
+            if best < field.min_score or best - second < field.min_margin:
+                return None
+            lowest = min(lowest, best)
+            if char in field.charset:
+                text += char
+        if not text or (field.pattern and not field.pattern.fullmatch(text)):
+            return None
+        return text, lowest
+
+    def _get_stacked(self, name):
+        with self._lock:
+            if name not in self._stacked:
+                items = [(char, t) for (n, char), t in self._templates.items() if n == name]
+                if not items:
+                    return None
+                chars = np.array([char for char, (matrix, _) in items for _ in range(len(matrix))])
+                matrix = np.vstack([matrix for _, (matrix, _) in items]).astype(np.float32)
+                aspects = np.concatenate([aspects for _, (_, aspects) in items]).astype(np.float32)
+                self._stacked[name] = (chars, matrix, aspects, set(chars.tolist()))
+            return self._stacked[name]
+
+    def learn(self, field: DigitField, glyphs, text):
+        """
+        用OCR结果学习字形，文字（去掉空格后）长度与字形数量不一致或不符合区域格式时不学习。
+        """
+        text = text.replace(" ", "")
+        if not glyphs or len(text) != len(glyphs) or not any(c in field.charset for c in text):
+            return
+        if field.pattern and not field.pattern.fullmatch("".join(c for c in text if c in field.charset)):
+            return
+        with self._lock:
+            for char, (vector, aspect) in zip(text, glyphs):
+                matrix, aspects = self._templates.get((field.name, char), (np.empty((0, vector.size), np.float32), np.empty(0, np.float32)))
+                if len(matrix) and (1 - np.abs(matrix - vector).mean(axis=1)).max() > 0.97:
+                    continue  # 已有几乎相同的模板
+                matrix = np.vstack([matrix, vector])[-self.MAX_TEMPLATES:]
+                aspects = np.append(aspects, np.float32(aspect))[-self.MAX_TEMPLATES:]
+                self._templates[(field.name, char)] = (matrix, aspects)
+            self._stacked.pop(field.name, None)
+            self._save()
+        self._log_debug(f"学习数字字形：{field.name} {text}")
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path) as data:
+                for key in data.files:
+                    if key.endswith("_aspect"):
+                        continue
+                    name, code = key.rsplit("_", 1)
+                    self._templates[(name, chr(int(code)))] = (data[key], data[key + "_aspect"])
+        except Exception as e:
+            self._log_debug(f"读取数字字形失败：{e}")
+
+    def _save(self):
+        if not self.path:
+            return
+        arrays = {}
+        for (name, char), (matrix, aspects) in self._templates.items():
+            arrays[f"{name}_{ord(char)}"] = matrix
+            arrays[f"{name}_{ord(char)}_aspect"] = aspects
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            np.savez_compressed(self.path, **arrays)
+        except Exception as e:
+            self._log_debug(f"保存数字字形失败：{e}")
+
+    def _log_debug(self, message):
+        if self.logger is not None:
+            self.logger.debug(message)
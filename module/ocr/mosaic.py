@@ -0,0 +1,74 @@
+import numpy as np
+
+
+class OcrMosaic:
+    """
+    OCR 拼图，把多个小区域从上到下、逐列排列到一张画布上，只需一次识别请求。
+    识别的文字行是横向的，区域上下相邻、左右留出两倍间隔，避免相邻区域的文字被检测为同一行。
+    识别结果按文字框中心点所在的区域拆分回各自的来源，并换算为区域内的坐标。
+    """
+
+    def __init__(self, max_width=960, max_height=960, padding=16):
+        """
+        :param max_width: 画布最大宽度，识别服务会把超过 960 的图片缩小，默认不超过该值。
+        :param max_height: 画布最大高度，放不下的区域放到下一张画布。
+        :param padding: 区域之间及区域与画布边缘的间隔（像素）。
+        """
+        self.max_width = max_width
+        self.max_height = max_height
+        self.padding = padding
+
+    def pack(self, images):
+        """
+        把图片依次排列到画布上，一列放满后换到下一列，画布放满后换到下一张画布。
+        :param images: BGR 格式的图片列表。
+        :return: 画布列表，元素为 (画布, 摆放位置列表)，摆放位置为 (图片序号, x, y, 宽度, 高度)。
+        """
+        pad = self.padding
+        canvases = []
+        placements, x, y, column_width = [], pad, pad, 0
+        for index, image in enumerate(images):
+            h, w = image.shape[:2]
+            if placements and y + h + pad > self.max_height:  # 换列
+                x, y, column_width = x + column_width + 2 * pad, pad, 0
+            if placements and x + w + pad > self.max_width:  # 换画布
+                canvases.append(placements)
+                placements, x, y, column_width = [], pad, pad, 0
+            placements.append((index, x, y, w, h))
+            y += h + pad
+            column_width = max(column_width, w)
+        if placements:
+            canvases.append(placements)
+        return [(self._draw(images, placements), placements) for placements in canvases]
+
+    def _draw(self, images, placements):
+        pad = self.padding
+        width = max(x + w for _, x, _, w, _ in placements) + pad
+        height = max(y + h for _, _, y, _, h in placements) + pad
+        channels = images[placements[0][0]].shape[2] if images[placements[0][0]].ndim == 3 else None
+        canvas = np.zeros((height, width, channels) if channels else (height, width), dtype=np.uint8)
+        for index, x, y, w, h in placements:
+            image = images[index]
+            # 用图片边缘颜色的中位数填充周围的间隔，避免在区域边缘产生额外的对比度
+            border = np.concatenate([image[0], image[-1], image[:, 0], image[:, -1]])
+            canvas[max(0, y - pad // 2):y + h + pad // 2, max(0, x - pad // 2):x + w + pad // 2] = np.median(border, axis=0)
+            canvas[y:y + h, x:x + w] = image
+        return canvas
+
+    @staticmethod
+    def split(items, placements):
+        """
+        把画布上的识别结果拆分回各个区域。
+        :param items: 画布的识别结果，元素为 [文字框四个顶点, (文字, 置信度)]。
+        :param placements: pack 返回的摆放位置列表。
+        :return: 字典，键为图片序号，值为该区域的识别结果，文字框坐标已换算为区域内的坐标。
+        """
+        results = {index: [] for index, *_ in placements}
+        for box, text in items:
+            cx = sum(point[0] for point in box) / len(box)
+            cy = sum(point[1] for point in box) / len(box)
+            for index, x, y, w, h in placements:
+                if x <= cx < x + w and y <= cy < y + h:
+                    results[index].append([[[point[0] - x, point[1] - y] for point in box], text])
+                    break
+        return results
@@ -1,6 +1,11 @@
 import os
-import io
+import cv2
+import numpy as np
 from .PPOCR_api import GetOcrApi
+from .ocr_client import PooledOcrClient
+from .ocr_cache import OcrResultCache
+from .mosaic import OcrMosaic
+from .replacer import OcrReplacer
 from utils.logger.logger import Logger
 from typing import Optional
 from PIL import Image
@@ -8,12 +13,16 @@ import atexit
 
 
 class OCR:
-    def __init__(self, exePath, logger: Optional[Logger] = None, replacements=None):
+    PNG_COMPRESSION = 1  # 发送给识别服务的 PNG 压缩等级，越低编码越快，结果都是无损的
+
+    def __init__(self, exePath, logger: Optional[Logger] = None, replacements=None, cache: Optional[OcrResultCache] = None):
         """初始化OCR类"""
         self.exePath = exePath
         self.ocr = None
         self.logger = logger
         self.replacements = replacements
+        self.replacer = OcrReplacer(replacements) if replacements is not None else None  # 加载时编译替换配置
+        self.cache = cache
 
     def instance_ocr(self):
         """实例化OCR，若ocr实例未创建，则创建之"""
@@ -21,7 +30,13 @@ class OCR:
             try:
                 self.logger.debug(f"开始初始化OCR...{self.exePath}")
 
-                self.ocr = GetOcrApi(r"remote://ocr:3746", ipcMode="socket")
+                if self.exePath.startswith("remote://"):
+                    # 远程识别服务使用连接池客户端
+                    self.ocr = PooledOcrClient.from_address(self.exePath)
+                    if self.ocr.runDict({})["code"] in [902, 903, 904]:
+                        raise Exception("Socket connection fail.")
+                else:
+                    self.ocr = GetOcrApi(self.exePath, ipcMode="socket")
                 self.logger.debug("初始化OCR完成")
                 atexit.register(self.exit_ocr)
             except Exception as e:
@@ -41,44 +56,79 @@ class OCR:
             return False
         return [[item['box'], (item['text'], item['score'])] for item in result['data']]
 
+    def to_bgr(self, image):
+        """将图片转换为 BGR 格式的 np.ndarray，支持Image对象、文件路径、np.ndarray（RGB）和截图帧对象"""
+        if hasattr(image, "bgr"):  # 截图帧，复用已转换的BGR数据
+            return image.bgr
+        if isinstance(image, str):
+            image = cv2.imread(os.path.abspath(image), cv2.IMREAD_UNCHANGED)
+            if image is None:
+                raise ValueError("读取图片失败")
+            return image
+        if isinstance(image, Image.Image):
+            image = np.asarray(image if image.mode in ("RGB", "RGBA", "L") else image.convert("RGB"))
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_RGBA2BGR if image.shape[2] == 4 else cv2.COLOR_RGB2BGR)
+        return image
+
+    def _to_bgr3(self, image):
+        """转换为三通道 BGR 图片，拼图要求所有区域的通道数一致"""
+        image = self.to_bgr(image)
+        if image.ndim == 2:
+            return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        if image.shape[2] == 4:
+            return cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+        return image
+
+    def encode_image(self, image):
+        """将图片编码为 PNG 字节流"""
+        success, encoded = cv2.imencode(".png", self.to_bgr(image), [cv2.IMWRITE_PNG_COMPRESSION, self.PNG_COMPRESSION])
+        if not success:
+            raise ValueError("图片编码失败")
+        return encoded.tobytes()
+
     def run(self, image):
-        """执行OCR识别，支持Image对象、文件路径和np.ndarray对象"""
+        """执行OCR识别，支持Image对象、文件路径、np.ndarray和截图帧对象"""
         self.instance_ocr()
         try:
-            if not isinstance(image, Image.Image):
-                if isinstance(image, str):
-                    image = Image.open(os.path.abspath(image))
-                else:  # 默认为 np.ndarray，避免需要import numpy
-                    image = Image.fromarray(image)
-            image_stream = io.BytesIO()
-            image.save(image_stream, format="PNG")
-            image_bytes = image_stream.getvalue()
-            original_dict = self.ocr.runBytes(image_bytes)
-
-            return self.replace_strings(original_dict)
+            image = self.to_bgr(image)
+            key = None
+            if self.cache is not None:
+                # 相同内容的图片直接使用缓存结果，不再请求识别服务
+                key = self.cache.make_key(image)
+                cached = self.cache.get(key)
+                if cached is not None:
+                    self.logger.debug("OCR命中缓存")
+                    self.log_results(cached)
+                    return cached
+
+            original_dict = self.ocr.runBytes(self.encode_image(image))
+
+            results = self.replace_strings(original_dict)
+            if key is not None and isinstance(results, dict) and results.get("code") in (100, 101):
+                self.cache.put(key, results)
+            return results
         except Exception as e:
             self.logger.error(e)
             return "{}"
 
     def replace_strings(self, results):
         """替换OCR结果中的错误字符串"""
-        if "data" not in results or "text" not in results["data"][0] or self.replacements is None:
+        if not isinstance(results, dict) or not isinstance(results.get("data"), list) or self.replacer is None:
             return results
 
         for item in results["data"]:
-            for old_str, new_str in self.replacements["direct"].items():
-                item["text"] = item["text"].replace(old_str, new_str)
-            for old_str, new_str in self.replacements["conditional"].items():
-                if new_str not in item["text"]:
-                    item["text"] = item["text"].replace(old_str, new_str)
+            if isinstance(item, dict) and "text" in item:
+                item["text"] = self.replacer.apply(item["text"])
 
         self.log_results(results)
         return results
 
     def log_results(self, modified_dict):
         """记录OCR识别结果"""
-        if "data" in modified_dict and "text" in modified_dict["data"][0]:
-            print_list = [item["text"] for item in modified_dict["data"]]
+        data = modified_dict.get("data") if isinstance(modified_dict, dict) else None
+        if isinstance(data, list) and data and all(isinstance(item, dict) and "text" in item for item in data):
+            print_list = [item["text"] for item in data]
             self.logger.debug(f"OCR识别结果: {print_list}")
         else:
             self.logger.debug(f"OCR识别结果: {modified_dict}")
@@ -95,3 +145,18 @@ class OCR:
     def recognize_multi_lines(self, image):
         """识别图片中的多行文本"""
         return self.convert_format(self.run(image))
+
+    def recognize_batch(self, items):
+        """
+        一次识别多个区域，所有区域拼接到一张画布上，只请求一次识别服务。
+        :param items: 列表，元素为 (图片, 标签)，图片支持的格式同 run。
+        :return: 字典，键为标签，值为该区域的识别结果，格式同 recognize_multi_lines，坐标为区域内的坐标；未识别到文字时为空列表。
+        """
+        images = [self._to_bgr3(image) for image, _ in items]
+        results = {tag: [] for _, tag in items}
+        for canvas, placements in OcrMosaic().pack(images):
+            original_dict = self.run(canvas)
+            converted = self.convert_format(original_dict) if isinstance(original_dict, dict) else False
+            for index, lines in OcrMosaic.split(converted or [], placements).items():
+                results[items[index][1]].extend(lines)
+        return results
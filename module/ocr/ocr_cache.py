@@ -0,0 +1,78 @@
+import copy
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+
+
+class OcrResultCache:
+    """
+    以图片内容为键的 OCR 结果缓存。
+    相同像素的 OCR 结果是确定的，等待界面变化时反复识别同一区域可以直接命中缓存，跳过识别服务请求。
+    """
+
+    def __init__(self, max_size=128, ttl=300, quantize_bits=0, salt=""):
+        """
+        :param max_size: 最多缓存的结果数量，超出时淘汰最久未使用的结果。
+        :param ttl: 结果的有效时间（秒），0 表示不过期。
+        :param quantize_bits: 计算哈希前舍弃每个像素值的低位数，大于 0 时近似相同的图片也能命中缓存。
+        :param salt: 参与计算键的额外内容，例如文字替换配置，配置变化后旧结果自动失效。
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.quantize_bits = quantize_bits
+        self.salt = salt.encode("utf-8")
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # 键为图片哈希，值为 (写入时间, 结果)
+        self._lock = threading.Lock()
+
+    def make_key(self, image: np.ndarray) -> bytes:
+        """
+        计算图片的缓存键。
+        :param image: np.ndarray 格式的图片。
+        :return: 图片内容的哈希值。
+        """
+        if self.quantize_bits > 0:
+            image = image >> self.quantize_bits
+        hasher = hashlib.blake2b(self.salt, digest_size=16)
+        hasher.update(str(image.shape).encode())
+        hasher.update(np.ascontiguousarray(image).data)
+        return hasher.digest()
+
+    def get(self, key):
+        """获取缓存结果，未命中或已过期时返回None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl and time.time() - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+    def put(self, key, result):
+        """写入缓存结果"""
+        with self._lock:
+            self._entries[key] = (time.time(), copy.deepcopy(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """返回缓存命中统计"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,137 @@
+import re
+import time
+import socket
+import threading
+from base64 import b64encode
+from collections import deque
+from json import loads as jsonLoads, dumps as jsonDumps
+
+
+class PooledOcrClient:
+    """
+    PaddleOCR-json 套接字服务的连接池客户端。
+
+    服务端每处理完一个请求就会关闭连接，因此连接池会在服务端识别期间预先建立下一条连接，
+    让建立连接的开销不落在下一次识别请求上。请求体按字节直接拼接，避免对整张图片做 JSON 序列化。
+    """
+
+    RECV_BUFFER_SIZE = 1 << 20  # 接收缓冲区大小
+
+    def __init__(self, ip, port, pool_size=1, idle_timeout=30, timeout=30):
+        """
+        :param ip: 识别服务地址。
+        :param port: 识别服务端口。
+        :param pool_size: 预先建立的空闲连接数量，0 表示不预建立连接。
+        :param idle_timeout: 空闲连接的最长保留时间（秒），超过后丢弃重新建立。
+        :param timeout: 单次请求的超时时间（秒）。
+        """
+        self.ip = ip
+        self.port = port
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._idle = deque()  # 元素为 (建立时间, socket)，按建立顺序使用
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_address(cls, address, **kwargs):
+        """
+        从 remote://ip:port 格式的地址创建客户端。
+        """
+        match = re.search(r"remote://(.*):(\d+)", address)
+        if not match:
+            raise ValueError(f"OCR服务地址格式错误：{address}")
+        ip = match.group(1)
+        if ip == "any":
+            ip = "0.0.0.0"
+        elif ip == "loopback":
+            ip = "127.0.0.1"
+        return cls(ip, int(match.group(2)), **kwargs)
+
+    def _connect(self):
+        client_socket = socket.create_connection((self.ip, self.port), timeout=self.timeout)
+        client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return client_socket
+
+    def _acquire(self):
+        """取出最早建立且未过期的空闲连接，没有时新建连接"""
+        with self._lock:
+            while self._idle:
+                created_time, client_socket = self._idle.popleft()
+                if time.time() - created_time < self.idle_timeout:
+                    return client_socket, True
+                client_socket.close()
+        return self._connect(), False
+
+    def _refill(self):
+        """补充空闲连接"""
+        with self._lock:
+            while len(self._idle) < self.pool_size:
+                try:
+                    self._idle.append((time.time(), self._connect()))
+                except OSError:
+                    break
+
+    def _send_and_receive(self, client_socket, payload):
+        try:
+            client_socket.sendall(payload)
+            # 服务端读到结束标志后才会开始识别
+            client_socket.shutdown(socket.SHUT_WR)
+            # 服务端识别期间预先建立下一条连接
+            self._refill()
+            chunks = []
+            while True:
+                chunk = client_socket.recv(self.RECV_BUFFER_SIZE)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            return b"".join(chunks)
+        finally:
+            client_socket.close()
+
+    def _request(self, payload):
+        """发送请求并返回反序列化后的结果"""
+        try:
+            client_socket, pooled = self._acquire()
+            try:
+                res_data = self._send_and_receive(client_socket, payload)
+            except OSError:
+                if not pooled:
+                    raise
+                res_data = b""
+            if not res_data and pooled:
+                # 空闲连接可能已被服务端断开，换一条新连接重试
+                res_data = self._send_and_receive(self._connect(), payload)
+            get_str = res_data.decode()
+        except ConnectionRefusedError:
+            return {"code": 902, "data": "连接被拒绝"}
+        except (TimeoutError, socket.timeout):
+            return {"code": 903, "data": "连接超时"}
+        except Exception as e:
+            return {"code": 904, "data": f"网络错误：{e}"}
+        try:
+            return jsonLoads(get_str)
+        except Exception as e:
+            return {
+                "code": 905,
+                "data": f"识别器输出值反序列化JSON失败。异常信息：[{e}]。原始内容：[{get_str}]",
+            }
+
+    def runDict(self, writeDict: dict):
+        """传入指令字典，发送给识别服务"""
+        return self._request((jsonDumps(writeDict, ensure_ascii=True, indent=None) + "\n").encode())
+
+    def runBytes(self, imageBytes):
+        """对一张图片的字节流信息进行文字识别"""
+        return self._request(b'{"image_base64": "' + b64encode(imageBytes) + b'"}\n')
+
+    def runBase64(self, imageBase64: str):
+        """对一张编码为base64字符串的图片进行文字识别"""
+        return self._request(b'{"image_base64": "' + imageBase64.encode() + b'"}\n')
+
+    def exit(self):
+        """关闭所有空闲连接"""
+        with self._lock:
+            while self._idle:
+                _, client_socket = self._idle.popleft()
+                client_socket.close()
@@ -0,0 +1,179 @@
+import re
+import heapq
+import json
+import random
+import time
+
+
+class OcrReplacer:
+    """
+    OCR 文字替换引擎，替换配置在加载时编译一次。
+    结果与按顺序对每一条配置执行 str.replace 完全一致：先依次执行 "direct" 中的替换，
+    再依次执行 "conditional" 中的替换，后者只在文本中尚不包含替换后的内容时执行。
+
+    所有待替换的字符串合并为一个正则表达式，每段文本只扫描一遍即可找出其中出现的全部配置，
+    大多数文本不包含任何待替换字符串，直接跳过；其余文本只按顺序执行出现的配置，
+    以及前面的替换可能新产生的配置（加载时预先计算）。
+    """
+
+    def __init__(self, replacements):
+        """
+        :param replacements: 替换配置，格式同 ocr_replacements.json，包含 "direct" 和 "conditional" 两个字典。
+        """
+        self.entries = []  # 元素为 (待替换字符串, 替换后字符串, 是否为条件替换)，按执行顺序排列
+        for old_str, new_str in replacements.get("direct", {}).items():
+            self.entries.append((old_str, new_str, False))
+        for old_str, new_str in replacements.get("conditional", {}).items():
+            self.entries.append((old_str, new_str, True))
+
+        indices = {}  # 键为待替换字符串，值为使用该字符串的配置序号
+        for i, (old_str, _, _) in enumerate(self.entries):
+            indices.setdefault(old_str, []).append(i)
+        self._always = {i for i, (old_str, _, _) in enumerate(self.entries) if not old_str}
+        # 同一位置匹配到的最长字符串出现时，以它为前缀的较短字符串也一定出现
+        self._implied = {
+            key: [i for other in indices if other and key.startswith(other) for i in indices[other]]
+            for key in indices if key
+        }
+        self._pattern = re.compile("(?=(" + self._trie_pattern(self._implied) + "))") if self._implied else None
+        self._triggers = [
+            {j for j in range(i + 1, len(self.entries)) if self._may_create(self.entries[j][0], new_str)}
+            for i, (_, new_str, _) in enumerate(self.entries)
+        ]
+
+    @staticmethod
+    def _trie_pattern(keys):
+        """
+        把字符串按公共前缀合并为正则表达式，每个位置只需比较一个分支，并总是匹配最长的字符串。
+        """
+        trie = {}
+        for key in keys:
+            node = trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node[""] = {}
+
+        def build(node):
+            branches = [re.escape(char) + build(child) for char, child in node.items() if char]
+            if not branches:
+                return ""
+            pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+            if "" in node:  # 此处已是完整字符串，更长的匹配失败时回退到此处
+                pattern = "(?:" + pattern + ")?"
+            return pattern
+
+        return build(trie)
+
+    @staticmethod
+    def _may_create(key, value) -> bool:
+        """把某处文本替换为 value 后，是否可能新出现 key"""
+        if not key or not value or key in value or value in key:
+            return True
+        # key 跨越 value 的左边界或右边界
+        return any(key[i:] == value[:len(key) - i] for i in range(1, len(key)) if len(key) - i <= len(value)) or \
+            any(key[:i] == value[-i:] for i in range(1, len(key)) if i <= len(value))
+
+    def find(self, text):
+        """
+        找出文本中出现的所有配置。
+        :return: 配置序号的集合。
+        """
+        found = set(self._always)
+        if self._pattern is not None:
+            for match in self._pattern.finditer(text):
+                found.update(self._implied[match.group(1)])
+        return found
+
+    def apply(self, text):
+        """
+        对文本执行替换。
+        :return: 替换后的文本。
+        """
+        if not self._always and (self._pattern is None or self._pattern.search(text) is None):
+            return text  # 不包含任何待替换字符串
+        pending = self.find(text)
+        queue = sorted(pending)
+        while queue:
+            i = heapq.heappop(queue)
+            old_str, new_str, conditional = self.entries[i]
+            if conditional and new_str in text:
+                continue
+            replaced = text.replace(old_str, new_str)
+            if replaced != text:
+                text = replaced
+                # 新产生的配置序号都大于 i，加入队列后仍按原顺序执行
+                for j in self._triggers[i] - pending:
+                    pending.add(j)
+                    heapq.heappush(queue, j)
+        return text
+
+    @staticmethod
+    def replace_sequential(replacements, text):
+        """
+        逐条配置执行 str.replace 的原始实现，作为 apply 结果的对照。
+        """
+        for old_str, new_str in replacements.get("direct", {}).items():
+            text = text.replace(old_str, new_str)
+        for old_str, new_str in replacements.get("conditional", {}).items():
+            if new_str not in text:
+                text = text.replace(old_str, new_str)
+        return text
+
+    @staticmethod
+    def benchmark(config_dir="./assets/config", batches=500, fuzz_count=20000, seed=1, logger=None):
+        """
+        比较替换引擎与逐条 str.replace 的结果和耗时。
+        对照文本包括：由替换配置中字符串的片段随机拼接成的文本（覆盖连锁替换、条件替换等情况），
+        以及角色名、副本名、常见界面文字和待替换字符串组成的识别结果（每组 1-30 条，共 batches 组，用于计时）。
+        :param config_dir: ocr_replacements.json、character_names.json、instance_names.json 所在目录。
+        :param batches: 计时用的识别结果组数。
+        :param fuzz_count: 随机拼接的文本数量。
+        :param seed: 随机种子，相同的种子得到相同的测试文本。
+        :param logger: 用于输出结果的Logger对象，可选参数。
+        :return: 字典，包含对照的文本数 texts、结果不一致的文本 mismatches（原文, 替换引擎结果, 逐条替换结果）、
+                 逐条替换总耗时 sequential_time 和替换引擎总耗时 compiled_time（秒，仅计时部分）。
+        """
+        def load(name):
+            with open(f"{config_dir}/{name}", "r", encoding="utf-8") as file:
+                return json.load(file)
+
+        replacements = load("ocr_replacements.json")
+        replacer = OcrReplacer(replacements)
+        rng = random.Random(seed)
+
+        strings = [s for table in replacements.values() for item in table.items() for s in item]
+        pieces = sorted({s[i:j] for s in strings for i in range(len(s)) for j in range(i + 1, len(s) + 1)})
+        fuzz_texts = ["".join(rng.choice(pieces) for _ in range(rng.randint(0, 5))) for _ in range(fuzz_count)]
+
+        names = list(load("character_names.json").values())
+        names += [name for instances in load("instance_names.json").values() for name in instances]
+        names += ["开始挑战", "传送", "领取", "确认", "取消", "每日实训", "123/300", "Lv.70"]
+        names += [rng.choice(list(table)) for table in replacements.values() for _ in range(10) if table]
+        groups = [[rng.choice(names) for _ in range(rng.randint(1, 30))] for _ in range(batches)]
+
+        results = {"texts": 0, "mismatches": [], "sequential_time": 0.0, "compiled_time": 0.0}
+        for text in fuzz_texts + names:
+            compiled, sequential = replacer.apply(text), OcrReplacer.replace_sequential(replacements, text)
+            results["texts"] += 1
+            if compiled != sequential:
+                results["mismatches"].append((text, compiled, sequential))
+
+        start_time = time.perf_counter()
+        for group in groups:
+            for text in group:
+                OcrReplacer.replace_sequential(replacements, text)
+        results["sequential_time"] = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        for group in groups:
+            for text in group:
+                replacer.apply(text)
+        results["compiled_time"] = time.perf_counter() - start_time
+
+        if logger is not None:
+            speedup = results["sequential_time"] / results["compiled_time"] if results["compiled_time"] else 0.0
+            logger.info(f"OCR文字替换：对照 {results['texts']} 条文本，结果不一致 {len(results['mismatches'])} 条；"
+                        f"{batches} 组识别结果逐条替换 {results['sequential_time'] * 1000:.1f}ms，"
+                        f"替换引擎 {results['compiled_time'] * 1000:.1f}ms，加速 {speedup:.1f} 倍")
+            for text, compiled, sequential in results["mismatches"]:
+                logger.warning(f"OCR文字替换结果不一致：{text!r} 替换引擎 {compiled!r} 逐条替换 {sequential!r}")
+        return results
@@ -0,0 +1,121 @@
+import re
+import unicodedata
+
+
+class TextHit:
+    """文本查询的一条结果"""
+
+    def __init__(self, index, box, text, confidence, target, distance):
+        self.index = index  # 在OCR结果中的序号
+        self.box = box  # 文字框四个顶点
+        self.text = text  # 识别出的文字
+        self.confidence = confidence  # OCR置信度
+        self.target = target  # 匹配到的目标文本
+        self.distance = distance  # 编辑距离，0 表示精确匹配（归一化后）
+
+
+class OcrTextIndex:
+    """
+    OCR结果的文本查询索引。
+    文字先做全角/半角等归一化，并按二元字组建立倒排索引，同一组OCR结果上的多次查询共用。
+    查询时先找归一化后精确匹配（或包含）的结果；允许误差的目标再用二元字组筛选候选，
+    对候选计算有上限的编辑距离，识别错一两个字时仍能命中，不必重新截图识别。
+    模糊匹配只在没有精确匹配、且只有一行文字距离最小时才采用，多行距离相同（如 "拟造花萼（赤）" 误识别后
+    与 "拟造花萼（金）" 距离相同）时视为无法区分，不返回结果。
+    """
+
+    def __init__(self, results):
+        """
+        :param results: OCR结果，格式同 OCR.recognize_multi_lines，元素为 [文字框, (文字, 置信度)]。
+        """
+        self.results = results
+        self.texts = [self.normalize(text) for _, (text, _) in results]
+        self._grams = {}  # 键为二元字组，值为包含该字组的结果序号集合
+        for i, text in enumerate(self.texts):
+            for gram in self._bigrams(text):
+                self._grams.setdefault(gram, set()).add(i)
+
+    @staticmethod
+    def normalize(text):
+        """统一全角/半角字符和大小写，去掉空白"""
+        return re.sub(r"\s+", "", unicodedata.normalize("NFKC", text)).lower()
+
+    @staticmethod
+    def default_max_distance(target):
+        """
+        目标文本允许的编辑距离：含数字或不超过 4 个字的目标必须精确匹配（如关卡序号 "01" 与 "07"、"开始挑战" 与 "开始战斗"），
+        5-9 个字允许 1 处误差，更长的允许 2 处。
+        """
+        if len(target) <= 4 or any(c.isdigit() for c in target):
+            return 0
+        return 1 if len(target) < 10 else 2
+
+    def query(self, targets, include=False, max_distance=None):
+        """
+        查询目标文本。
+        :param targets: 目标文本或目标文本列表。
+        :param include: 为True时查找包含目标文本的结果，否则查找与目标文本一致的结果。
+        :param max_distance: 允许的最大编辑距离，默认按目标长度由 default_max_distance 决定，为0时只做精确查询。
+        :return: TextHit 列表，每条OCR结果只保留最好的一个目标。有精确匹配时返回所有精确匹配，按OCR结果顺序、目标顺序排列；
+                 否则返回唯一距离最小的模糊匹配，距离最小的有多行时返回空列表。
+        """
+        targets = [targets] if isinstance(targets, str) else list(targets)
+        best = {}  # 键为结果序号，值为 (编辑距离, 目标顺序, 目标)
+        for order, target in enumerate(targets):
+            normalized = self.normalize(target)
+            limit = self.default_max_distance(normalized) if max_distance is None else max_distance
+            for i in self._candidates(normalized, limit):
+                distance = self._distance(normalized, self.texts[i], include, limit)
+                if distance is not None and (i not in best or (distance, order) < best[i][:2]):
+                    best[i] = (distance, order, target)
+        ranked = sorted(best.items(), key=lambda item: (item[1][0], item[0], item[1][1]))
+        if ranked and ranked[0][1][0] > 0:
+            # 没有精确匹配，模糊匹配必须严格优于其他所有行
+            if len(ranked) > 1 and ranked[1][1][0] == ranked[0][1][0]:
+                return []
+            ranked = ranked[:1]
+        hits = []
+        for i, (distance, order, target) in ranked:
+            if distance > 0 and hits:
+                break
+            box, (text, confidence) = self.results[i]
+            hits.append(TextHit(i, box, text, confidence, target, distance))
+        return hits
+
+    def _candidates(self, target, limit):
+        """用二元字组筛选候选：k 处编辑最多破坏 2k 个二元字组，共有字组少于剩余数量的结果不可能匹配"""
+        grams = self._bigrams(target)
+        required = len(grams) - 2 * limit
+        if required <= 0:
+            return range(len(self.texts))
+        counts = {}
+        for gram in grams:
+            for i in self._grams.get(gram, ()):
+                counts[i] = counts.get(i, 0) + 1
+        return sorted(i for i, count in counts.items() if count >= required)
+
+    @staticmethod
+    def _bigrams(text):
+        return {text[i:i + 2] for i in range(len(text) - 1)}
+
+    @staticmethod
+    def _distance(target, text, include, limit):
+        """
+        计算编辑距离，超过 limit 时返回None。
+        include 为True时计算目标与文本中任意一段的最小编辑距离。
+        """
+        if (target in text) if include else (target == text):
+            return 0
+        if limit <= 0 or (not include and abs(len(target) - len(text)) > limit):
+            return None
+        # 逐行计算编辑距离矩阵，include 时文本的起始位置不计代价（首行全为 0）
+        previous = [0] * (len(text) + 1) if include else list(range(len(text) + 1))
+        for i, char in enumerate(target, 1):
+            current = [i] + [0] * len(text)
+            for j, other in enumerate(text, 1):
+                current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char != other))
+            if min(current) > limit:
+                return None
+            previous = current
+        distance = min(previous) if include else previous[-1]
+        return distance if distance <= limit else None
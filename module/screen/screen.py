@@ -3,11 +3,13 @@ import time
 import json
 import threading
 from collections import deque
+from .screen_classifier import ScreenClassifier
 from utils.color import green
 from utils.singleton import SingletonMeta
 from utils.logger.logger import Logger
 from typing import Optional
 from module.automation import auto
+from module.automation.wait import FuncCondition
 from module.config import cfg
 
 
@@ -27,18 +29,21 @@ class Screen(metaclass=SingletonMeta):
         self.current_screen_threshold = 0  # 当前界面的阈值
         self.screen_map = {}  # 存储界面信息的字典
         self.wait_screen_change_time = 0.5
+        self.wait_screen_change_timeout = 15  # 等待界面切换的超时时间（秒）
         self.lock = threading.Lock()  # 创建一个锁，用于线程同步
         self._setup_screens_from_config(config_path)
+        self.classifier = ScreenClassifier(self.screen_map, 0.9, logger=logger, template_bank=auto.template_bank)
 
-    def _add_screen(self, id, name, image_path, actions):
+    def _add_screen(self, id, name, image_path, actions, region=None):
         """
         添加一个新界面到界面管理器。
         :param id: 新界面的唯一标识。
         :param name: 新界面的名称。
         :param image_path: 用于识别界面的图片路径。
         :param actions: 可切换的目标界面及操作序列。
+        :param region: 识别图片可能出现的区域，格式为(x, y, width, height)的比例值，可选。
         """
-        self.screen_map[id] = {'name': name, 'image_path': image_path, 'actions': actions}
+        self.screen_map[id] = {'name': name, 'image_path': image_path, 'actions': actions, 'region': region}
 
     def _setup_screens_from_config(self, config_path):
         """
@@ -49,7 +54,7 @@ class Screen(metaclass=SingletonMeta):
             with open(config_path, 'r', encoding='utf-8') as file:
                 configs = json.load(file)
                 for config in configs:
-                    self._add_screen(config["id"], config["name"], config["image_path"], config["actions"])
+                    self._add_screen(config["id"], config["name"], config["image_path"], config["actions"], config.get("region"))
         except FileNotFoundError:
             self.logger.error(f"配置文件不存在：{config_path}")
             raise
@@ -90,31 +95,25 @@ class Screen(metaclass=SingletonMeta):
         :param max_retries: 最大重试次数。
         :return: 如果成功识别到界面则返回True，否则返回False。
         """
-
-        # 定义内部函数用于在线程中识别界面
-        def find_screen(screen_name, screen):
-            try:
-                result = auto.find_element(screen['image_path'], "image_threshold", 0.9, take_screenshot=False)
-                if result:
-                    with self.lock:
-                        if not self.current_screen or self.current_screen_threshold < result:
-                            self.current_screen = screen_name
-                            self.current_screen_threshold = result
-            except Exception as e:
-                self.logger.debug(f"识别界面出错：{e}")
-
-        if self.current_screen is not None and auto.find_element(self.screen_map[self.current_screen]['image_path'], "image_threshold", 0.9):
-            return True
+        if self.current_screen is not None:
+            auto.take_screenshot()
+            if self.classifier.verify(auto.frame, self.current_screen):
+                return True
 
         for i in range(max_retries):
-            auto.take_screenshot()
+            if i > 0 or self.current_screen is None:
+                auto.take_screenshot()
             self._reset_screen_state()
 
-            threads = [threading.Thread(target=find_screen, args=(name, screen)) for name, screen in self.screen_map.items()]
-            for thread in threads:
-                thread.start()
-            for thread in threads:
-                thread.join()
+            with self.lock:
+                try:
+                    screen_id, threshold = self.classifier.classify(auto.frame)
+                except Exception as e:
+                    self.logger.debug(f"识别界面出错：{e}")
+                    screen_id, threshold = None, 0
+                if screen_id:
+                    self.current_screen = screen_id
+                    self.current_screen_threshold = threshold
 
             if self.current_screen:
                 return True
@@ -173,7 +172,8 @@ class Screen(metaclass=SingletonMeta):
         :param target_screen: 目标界面的标识符。
         :return: 如果当前界面是目标界面，则返回True；否则返回False。
         """
-        if auto.find_element(self.screen_map[target_screen]['image_path'], "image", 0.9):
+        auto.take_screenshot()
+        if self.classifier.verify(auto.frame, target_screen):
             # 如果找到了目标界面的图像，则更新当前界面状态为目标界面
             self.current_screen = target_screen
             return True
@@ -231,13 +231,12 @@ class Screen(metaclass=SingletonMeta):
         """
         等待界面切换，如果未成功则根据重试次数决定是否重试
         """
-        for _ in range(20):
-            self.logger.debug(f"等待：{self.get_name(next_screen)}")
-            if self.check_screen(next_screen):
-                self.logger.info(f"切换到：{green(self.get_name(next_screen))}")
-                time.sleep(self.wait_screen_change_time)
-                break
-            time.sleep(0.5)
+        self.logger.debug(f"等待：{self.get_name(next_screen)}")
+        condition = FuncCondition(lambda: self.classifier.verify(auto.frame, next_screen))
+        if auto.wait_for_any([condition], self.wait_screen_change_timeout):
+            self.current_screen = next_screen
+            self.logger.info(f"切换到：{green(self.get_name(next_screen))}")
+            time.sleep(self.wait_screen_change_time)
         else:
             self.wait_screen_change_time = 1
             if max_recursion > 0:
@@ -0,0 +1,209 @@
+import math
+import cv2
+from typing import Optional
+from utils.image_utils import ImageUtils
+from utils.logger.logger import Logger
+
+
+class ScreenTemplate:
+    """
+    单个界面的识别模板，预先计算缩小后的灰度特征和识别区域。
+    """
+
+    def __init__(self, screen_id, image_path, region=None, template_bank=None):
+        """
+        :param screen_id: 界面ID。
+        :param image_path: 用于识别界面的图片路径。
+        :param region: 模板可能出现的区域，格式为(x, y, width, height)的比例值，None 表示全屏。
+        :param template_bank: 模板图片库，传入时从中读取模板，可选。
+        """
+        self.id = screen_id
+        self.image_path = image_path
+        self.region = tuple(region) if region else None
+        if template_bank is not None:
+            entry = template_bank.get(image_path)
+            self.mask, self.bgr = entry.mask, entry.bgr
+        else:
+            self.mask = ImageUtils.read_template_with_mask(image_path)
+            self.bgr = cv2.imread(image_path)
+        self.height, self.width = self.bgr.shape[:2]
+        self.coarse_scale = None
+        self.coarse = None
+        self.location = None  # 最近一次识别成功时模板左上角的坐标
+
+    def prepare_coarse(self, scales, min_size):
+        """选择能保留足够细节的最小缩放比例，生成粗匹配用的灰度模板"""
+        gray = cv2.cvtColor(self.bgr, cv2.COLOR_BGR2GRAY)
+        for scale in scales:
+            if min(self.width, self.height) * scale >= min_size or scale == scales[-1]:
+                self.coarse_scale = scale
+                self.coarse = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+                break
+
+
+class ScreenClassifier:
+    """
+    界面识别引擎。
+    先在缩小的灰度截图上对所有界面模板做粗匹配并排序，再只对得分最高的几个界面
+    在原分辨率的局部区域内做精确匹配，精确匹配的相似度与全图匹配一致。
+    """
+
+    COARSE_SCALES = (0.25, 0.5)  # 粗匹配的候选缩放比例，从小到大尝试
+    MIN_COARSE_SIZE = 10  # 缩小后模板的最短边不能小于该值（像素）
+    REGION_MARGIN = 32  # 在已知位置附近搜索时向外扩展的边距（像素）
+
+    def __init__(self, screens, threshold=0.9, top_k=3, logger: Optional[Logger] = None, template_bank=None):
+        """
+        :param screens: 界面配置，字典，键为界面ID，值包含 image_path 和可选的 region。
+        :param threshold: 相似度阈值。
+        :param top_k: 粗匹配后进行精确匹配的界面数量。
+        :param logger: 用于记录日志的Logger对象，可选参数。
+        :param template_bank: 模板图片库，可选参数。
+        """
+        self.threshold = threshold
+        self.top_k = top_k
+        self.logger = logger
+        self.templates = {}
+        for screen_id, screen in screens.items():
+            try:
+                template = ScreenTemplate(screen_id, screen['image_path'], screen.get('region'), template_bank)
+                template.prepare_coarse(self.COARSE_SCALES, self.MIN_COARSE_SIZE)
+                self.templates[screen_id] = template
+            except Exception as e:
+                self._log_debug(f"加载界面模板失败：{screen['image_path']} {e}")
+
+    def _search_box(self, template, frame_width, frame_height):
+        """模板的搜索区域，格式为(left, top, right, bottom)，优先使用最近一次识别到的位置"""
+        if template.location is not None:
+            x, y = template.location
+            margin = self.REGION_MARGIN
+            left, top = x - margin, y - margin
+            right, bottom = x + template.width + margin, y + template.height + margin
+        elif template.region is not None:
+            rx, ry, rw, rh = template.region
+            left, top = int(rx * frame_width), int(ry * frame_height)
+            right, bottom = int((rx + rw) * frame_width), int((ry + rh) * frame_height)
+        else:
+            return 0, 0, frame_width, frame_height
+        left, top = max(0, left), max(0, top)
+        right, bottom = min(frame_width, right), min(frame_height, bottom)
+        if right - left < template.width or bottom - top < template.height:
+            return 0, 0, frame_width, frame_height
+        return left, top, right, bottom
+
+    def _coarse_match(self, frame, template):
+        """
+        在缩小的截图上匹配模板。
+        :return: 粗匹配得分和对应的原分辨率坐标。
+        """
+        left, top, right, bottom = self._search_box(template, frame.width, frame.height)
+        scale = template.coarse_scale
+        gray = frame.gray_scaled(scale)
+        x0, y0 = int(left * scale), int(top * scale)
+        x1, y1 = int(math.ceil(right * scale)), int(math.ceil(bottom * scale))
+        region = gray[y0:y1, x0:x1]
+        th, tw = template.coarse.shape[:2]
+        if region.shape[0] < th or region.shape[1] < tw:
+            return -1.0, None
+        result = cv2.matchTemplate(region, template.coarse, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        if math.isinf(max_val) or math.isnan(max_val):
+            return -1.0, None
+        return max_val, (int((x0 + max_loc[0]) / scale), int((y0 + max_loc[1]) / scale))
+
+    def _match(self, frame, template, box):
+        """
+        在原分辨率的指定区域内做精确匹配，与 find_element 的 "image" 匹配方式一致。
+        :return: 相似度和模板左上角坐标，未通过阈值时返回 (None, None)。
+        """
+        left, top, right, bottom = box
+        screenshot = frame.bgr[top:bottom, left:right]
+        if screenshot.shape[0] < template.height or screenshot.shape[1] < template.width:
+            return None, None
+        if template.mask is not None:
+            match_val, match_loc = ImageUtils.scale_and_match_template(screenshot, template.bgr, self.threshold, None, template.mask)
+            passed = not math.isinf(match_val) and match_val <= self.threshold
+        else:
+            match_val, match_loc = ImageUtils.scale_and_match_template(screenshot, template.bgr, self.threshold)
+            passed = not math.isinf(match_val) and match_val >= self.threshold
+        if not passed:
+            return None, None
+        return match_val, (left + match_loc[0], top + match_loc[1])
+
+    def _refine_box(self, frame, template, location):
+        """粗匹配位置周围的精确匹配区域，边距覆盖缩小带来的坐标误差"""
+        pad = int(math.ceil(1 / template.coarse_scale)) + 2
+        x, y = location
+        return (max(0, x - pad), max(0, y - pad),
+                min(frame.width, x + template.width + pad), min(frame.height, y + template.height + pad))
+
+    def verify(self, frame, screen_id):
+        """
+        检查截图中是否存在指定界面。
+        :param frame: 截图帧。
+        :param screen_id: 界面ID。
+        :return: 通过阈值时返回相似度，否则返回None。
+        """
+        template = self.templates.get(screen_id)
+        if template is None:
+            return None
+        match_val = None
+        if template.location is not None:
+            match_val, location = self._match(frame, template, self._search_box(template, frame.width, frame.height))
+        if match_val is None:
+            match_val, location = self._match(frame, template, (0, 0, frame.width, frame.height))
+        if match_val is not None:
+            template.location = location
+        self._log_debug(f"界面：{screen_id} 相似度：{match_val}")
+        return match_val
+
+    def classify(self, frame):
+        """
+        识别截图对应的界面。
+        :param frame: 完整截图帧。
+        :return: (界面ID, 相似度)，未识别到任何界面时返回 (None, None)。
+        """
+        ranked = []
+        for template in self.templates.values():
+            if template.mask is not None:
+                # 带透明通道的模板相似度越低越好，不参与粗匹配排序，直接放到最后精确匹配
+                ranked.append((-math.inf, template, None))
+                continue
+            score, location = self._coarse_match(frame, template)
+            ranked.append((score, template, location))
+        ranked.sort(key=lambda item: item[0], reverse=True)
+
+        # 依次只在粗匹配位置附近做精确匹配：先验证得分最高的几个，都未通过时再验证其余界面
+        for candidates in (ranked[:self.top_k], ranked[self.top_k:]):
+            best_id, best_val = self._verify_candidates(frame, candidates, refine=True)
+            if best_id is not None:
+                return best_id, best_val
+
+        # 仍未识别到时对所有界面做全图精确匹配，保证结果与逐个匹配一致
+        return self._verify_candidates(frame, ranked, refine=False)
+
+    def _verify_candidates(self, frame, candidates, refine):
+        """
+        对候选界面做精确匹配，返回相似度最高的界面。
+        :param candidates: 粗匹配结果列表，元素为 (得分, 模板, 粗匹配位置)。
+        :param refine: 为True时只在粗匹配位置附近匹配，否则全图匹配。
+        """
+        best_id, best_val = None, None
+        for score, template, location in candidates:
+            if refine:
+                if location is None:
+                    continue
+                box = self._refine_box(frame, template, location)
+            else:
+                box = (0, 0, frame.width, frame.height)
+            match_val, match_loc = self._match(frame, template, box)
+            if match_val is not None and (best_val is None or match_val > best_val):
+                best_id, best_val = template.id, match_val
+                template.location = match_loc
+        if best_id is not None:
+            self._log_debug(f"识别界面：{best_id} 相似度：{best_val:.2f}")
+        return best_id, best_val
+
+    def _log_debug(self, message):
+        if self.logger is not None:
+            self.logger.debug(message)
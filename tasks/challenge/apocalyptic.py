@@ -5,6 +5,7 @@ from .basechallenge import BaseChallenge
 from module.automation.screenshot import Screenshot
 from module.screen import screen
 from module.automation import auto
+from module.automation.wait import ImageCondition
 from module.config import cfg
 from module.logger import log
 
@@ -268,10 +269,20 @@ class Apocalyptic(BaseChallenge):
     def check_fight(self, timeout):
         '''检查战斗是否结束'''
         time.sleep(5)
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+        conditions = [
+            ImageCondition("./assets/images/apocalyptic/next_node.png", 0.9, name="next_node"),
+            ImageCondition("./assets/images/apocalyptic/back.png", 0.8, name="back"),
+        ]
+        if self.auto_battle_detect_enable:
+            conditions.append(ImageCondition("./assets/images/share/base/not_auto.png", 0.8, crop=(0.0 / 1920, 903.0 / 1080, 144.0 / 1920, 120.0 / 1080), name="not_auto", find_type="pixels"))
+
+        end_time = time.time() + timeout
+        while time.time() < end_time:
+            condition = auto.wait_for_any(conditions, end_time - time.time(), interval=0.5)
+            if condition is None:
+                break
             # 一节点完成
-            if auto.find_element("./assets/images/apocalyptic/next_node.png", "image", 0.9):
+            if condition.name == "next_node":
                 # 挑战失败
                 if auto.find_element("./assets/images/purefiction/fail.png", "image", 0.9):
                     auto.click_element("./assets/images/apocalyptic/back.png", "image", 0.8, 10)
@@ -280,7 +291,7 @@ class Apocalyptic(BaseChallenge):
                 else:
                     auto.click_element("./assets/images/apocalyptic/next_node.png", "image", 0.9)
                     return True
-            elif auto.find_element("./assets/images/apocalyptic/back.png", "image", 0.8, 10):
+            elif condition.name == "back":
                 # 挑战失败
                 if auto.find_element("./assets/images/purefiction/fail.png", "image", 0.9):
                     auto.click_element("./assets/images/apocalyptic/back.png", "image", 0.8, 10)
@@ -292,7 +303,7 @@ class Apocalyptic(BaseChallenge):
                         return True
                     else:
                         return False
-            elif self.auto_battle_detect_enable and auto.find_element("./assets/images/share/base/not_auto.png", "image", 0.8, crop=(0.0 / 1920, 903.0 / 1080, 144.0 / 1920, 120.0 / 1080)):
+            elif condition.name == "not_auto":
                 log.info("尝试开启自动战斗")
                 auto.press_key("v")
 
@@ -5,6 +5,7 @@ from .basechallenge import BaseChallenge
 from module.automation.screenshot import Screenshot
 from module.screen import screen
 from module.automation import auto
+from module.automation.wait import ImageCondition, SingleLineTextCondition
 from module.config import cfg
 from module.logger import log
 
@@ -178,12 +179,30 @@ class MemoryOfChaos(BaseChallenge):
         log.info("进入战斗")
         time.sleep(5)
 
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+        conditions = [
+            ImageCondition("./assets/images/purefiction/prepare_fight.png", 50000, crop=(0 / 1920, 0 / 1080, 300.0 / 1920, 300.0 / 1080), name="prepare_fight"),
+            ImageCondition("./assets/images/forgottenhall/back.png", 0.9, name="back"),
+        ]
+        if self.auto_battle_detect_enable:
+            conditions.append(ImageCondition("./assets/images/share/base/not_auto.png", 0.9, crop=(0.0 / 1920, 903.0 / 1080, 144.0 / 1920, 120.0 / 1080), name="not_auto", find_type="pixels"))
+        # 判断是否有角色无法战斗
+        crop_list = [
+            (253.0 / 1920, 935.0 / 1080, 100.0 / 1920, 50.0 / 1080),
+            (475.0 / 1920, 937.0 / 1080, 104.0 / 1920, 44.0 / 1080),
+            (707.0 / 1920, 937.0 / 1080, 94.0 / 1920, 48.0 / 1080),
+            (931.0 / 1920, 939.0 / 1080, 94.0 / 1920, 50.0 / 1080)
+        ]
+        conditions.extend(SingleLineTextCondition('0', crop, name="character_down") for crop in crop_list)
+
+        end_time = time.time() + timeout
+        while time.time() < end_time:
+            condition = auto.wait_for_any(conditions, end_time - time.time(), interval=0.5)
+            if condition is None:
+                break
             # 整间完成
-            if auto.find_element("./assets/images/purefiction/prepare_fight.png", "image", 50000, crop=(0 / 1920, 0 / 1080, 300.0 / 1920, 300.0 / 1080)):
+            if condition.name == "prepare_fight":
                 return True
-            elif auto.find_element("./assets/images/forgottenhall/back.png", "image", 0.9):
+            elif condition.name == "back":
                 time.sleep(2)
                 # 挑战失败
                 if auto.find_element("./assets/images/forgottenhall/again.png", "image", 0.9):
@@ -199,27 +218,13 @@ class MemoryOfChaos(BaseChallenge):
                 else:
                     auto.click_element("./assets/images/forgottenhall/back.png", "image", 0.9)
                     return True
-            elif self.auto_battle_detect_enable and auto.find_element("./assets/images/share/base/not_auto.png", "image", 0.9, crop=(0.0 / 1920, 903.0 / 1080, 144.0 / 1920, 120.0 / 1080)):
+            elif condition.name == "not_auto":
                 log.info("尝试开启自动战斗")
                 auto.press_key("v")
-
-            # 判断是否有角色无法战斗
-            try:
-                crop_list = [
-                    (253.0 / 1920, 935.0 / 1080, 100.0 / 1920, 50.0 / 1080),
-                    (475.0 / 1920, 937.0 / 1080, 104.0 / 1920, 44.0 / 1080),
-                    (707.0 / 1920, 937.0 / 1080, 94.0 / 1920, 48.0 / 1080),
-                    (931.0 / 1920, 939.0 / 1080, 94.0 / 1920, 50.0 / 1080)
-                ]
-                for crop in crop_list:
-                    text = auto.get_single_line_text(crop=crop)
-                    # 角色无法战斗
-                    if text == '0':
-                        log.info("检测到角色无法战斗")
-                        auto.press_key("esc")
-                        break
-            except Exception as e:
-                log.error(f"角色无法战斗检测失败: {e}")
+            # 角色无法战斗
+            elif condition.name == "character_down":
+                log.info("检测到角色无法战斗")
+                auto.press_key("esc")
 
             time.sleep(2)
 
@@ -5,6 +5,7 @@ from .basechallenge import BaseChallenge
 from module.automation.screenshot import Screenshot
 from module.screen import screen
 from module.automation import auto
+from module.automation.wait import ImageCondition
 from module.config import cfg
 from module.logger import log
 
@@ -186,12 +187,22 @@ class PureFiction(BaseChallenge):
         log.info("进入战斗")
         time.sleep(5)
 
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+        conditions = [
+            ImageCondition("./assets/images/purefiction/prepare_fight.png", 50000, crop=(0 / 1920, 0 / 1080, 300.0 / 1920, 300.0 / 1080), name="prepare_fight"),
+            ImageCondition("./assets/images/purefiction/back.png", 0.9, name="back"),
+        ]
+        if self.auto_battle_detect_enable:
+            conditions.append(ImageCondition("./assets/images/share/base/not_auto.png", 0.9, crop=(0.0 / 1920, 903.0 / 1080, 144.0 / 1920, 120.0 / 1080), name="not_auto", find_type="pixels"))
+
+        end_time = time.time() + timeout
+        while time.time() < end_time:
+            condition = auto.wait_for_any(conditions, end_time - time.time(), interval=0.5)
+            if condition is None:
+                break
             # 整间完成
-            if auto.find_element("./assets/images/purefiction/prepare_fight.png", "image", 50000, crop=(0 / 1920, 0 / 1080, 300.0 / 1920, 300.0 / 1080)):
+            if condition.name == "prepare_fight":
                 return True
-            elif auto.find_element("./assets/images/purefiction/back.png", "image", 0.9):
+            elif condition.name == "back":
                 # 挑战失败
                 if auto.find_element("./assets/images/purefiction/fail.png", "image", 0.9):
                     auto.click_element("./assets/images/purefiction/back.png", "image", 0.9)
@@ -200,7 +211,7 @@ class PureFiction(BaseChallenge):
                 else:
                     auto.click_element("./assets/images/purefiction/back.png", "image", 0.9)
                     return True
-            elif self.auto_battle_detect_enable and auto.find_element("./assets/images/share/base/not_auto.png", "image", 0.9, crop=(0.0 / 1920, 903.0 / 1080, 144.0 / 1920, 120.0 / 1080)):
+            elif condition.name == "not_auto":
                 log.info("尝试开启自动战斗")
                 auto.press_key("v")
 
@@ -1,5 +1,3 @@
-import cv2
-import numpy as np
 from module.screen import screen
 from module.automation import auto
 from module.logger import log
@@ -19,6 +17,10 @@ class BuildTarget:
     _target_instances = []
     _valid_instance_names = {}
 
+    _INSTANCE_TYPE_CROP = (93.0 / 1920, 33.0 / 1080, 150.0 / 1920, 68.0 / 1080)
+    _ORNAMENT_NAME_CROP = (584.0 / 1920, 112.0 / 1080, 614.0 / 1920, 52.0 / 1080)
+    _STANDARD_NAME_CROP = (1173.0 / 1920, 113.0 / 1080, 735.0 / 1920, 53.0 / 1080)
+
     @staticmethod
     def get_target_instance() -> tuple[str, str] | None:
         """尝试获取培养目标普通副本信息"""
@@ -173,7 +175,7 @@ class BuildTarget:
             if anchor_template is not None:
                 for _ in range(3):
                     auto.take_screenshot(page_crop)
-                    screenshot = cv2.cvtColor(np.array(auto.screenshot), cv2.COLOR_BGR2RGB)
+                    screenshot = auto.frame.bgr
                     match_val, match_loc = ImageUtils.scale_and_match_template(screenshot, anchor_template, 0.8, None)
                     if match_val > 0.95:
                         paging_boundary_y = match_loc[1] + 64
@@ -225,8 +227,8 @@ class BuildTarget:
             anchor_crop_height = (last_enter_pos[1][1] - last_enter_pos[0][1]) * auto.screenshot_scale_factor / 1080.0
             anchor_crop_top = page_crop[1] + last_enter_pos[0][1] * auto.screenshot_scale_factor / 1080.0
             anchor_crop = (page_crop[0], anchor_crop_top, page_crop[2], anchor_crop_height)
-            anchor_template, _, _ = auto.take_screenshot(anchor_crop)
-            anchor_template = cv2.cvtColor(np.array(anchor_template.copy()), cv2.COLOR_RGB2BGR)
+            auto.take_screenshot(anchor_crop)
+            anchor_template = auto.frame.bgr
 
             auto.mouse_scroll(12)
             time.sleep(1)
@@ -263,16 +265,28 @@ class BuildTarget:
             log.error("尝试进入培养目标副本时失败")
             return None
 
-        instance_type = auto.get_single_line_text(max_retries=5, retry_delay=1.0, crop=(93.0 / 1920, 33.0 / 1080, 150.0 / 1920, 68.0 / 1080))
+        # 副本类型和两种副本名称位置在同一页面上，一次请求同时识别，按类型选用对应的名称
+        fields = {}
+        for i in range(5):
+            fields = auto.read_fields({
+                "type": BuildTarget._INSTANCE_TYPE_CROP,
+                "ornament": BuildTarget._ORNAMENT_NAME_CROP,
+                "standard": BuildTarget._STANDARD_NAME_CROP,
+            })
+            if fields["type"]:
+                break
+            if i < 4:
+                time.sleep(1.0)
+        instance_type = fields.get("type") or ""
 
         if "饰品提取" in instance_type:
             instance_type = "饰品提取"
-            instance_name = BuildTarget._parse_ornament_instance_info()
+            instance_name = fields.get("ornament") or BuildTarget._parse_ornament_instance_info()
         elif "拟造花萼" in instance_type:
             instance_type = "拟造花萼（赤）"
             instance_name = BuildTarget._parse_calyx_instance_info()
         else:
-            instance_name = BuildTarget._parse_standard_instance_info()
+            instance_name = BuildTarget._parse_standard_instance_info(fields.get("standard"))
 
         instance_type = (instance_type or "").strip()
         instance_name = (instance_name or "").strip()
@@ -285,7 +299,7 @@ class BuildTarget:
 
     @staticmethod
     def _parse_ornament_instance_info() -> str | None:
-        return auto.get_single_line_text(max_retries=5, retry_delay=1.0, crop=(584.0 / 1920, 112.0 / 1080, 614.0 / 1920, 52.0 / 1080))
+        return auto.get_single_line_text(max_retries=5, retry_delay=1.0, crop=BuildTarget._ORNAMENT_NAME_CROP)
 
     @staticmethod
     def _parse_calyx_instance_info() -> str | None:
@@ -320,10 +334,11 @@ class BuildTarget:
         return None
 
     @staticmethod
-    def _parse_standard_instance_info() -> str | None:
-        raw_instance_name = auto.get_single_line_text(max_retries=5, retry_delay=1.0, crop=(1173.0 / 1920, 113.0 / 1080, 735.0 / 1920, 53.0 / 1080))
+    def _parse_standard_instance_info(raw_instance_name: str | None = None) -> str | None:
+        if not raw_instance_name:
+            raw_instance_name = auto.get_single_line_text(max_retries=5, retry_delay=1.0, crop=BuildTarget._STANDARD_NAME_CROP)
 
-        if "·" in raw_instance_name:
+        if raw_instance_name and "·" in raw_instance_name:
             return raw_instance_name.split("·")[0]
 
         return None
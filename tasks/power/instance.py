@@ -1,5 +1,6 @@
 from module.screen import screen
 from module.automation import auto
+from module.automation.wait import ImageCondition, TextCondition
 from module.logger import log
 from module.config import cfg
 from module.notification.notification import NotificationLevel
@@ -340,40 +341,48 @@ class Instance:
         log.info("进入战斗")
         time.sleep(5)
 
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            if auto.find_element("./assets/images/zh_CN/fight/fight_again.png", "image", 0.9):
+        conditions = [
+            ImageCondition("./assets/images/zh_CN/fight/fight_again.png", 0.9, name="fight_again"),
+            ImageCondition("./assets/images/zh_CN/fight/fight_fail.png", 0.9, name="fight_fail"),
+            TextCondition("已处于无法战斗状态", include=True, name="unable_to_fight"),
+            # 检测遗器背包已满的提示
+            TextCondition("背包内遗器持有数量已达上限", include=True, name="relic_full"),
+        ]
+        if cfg.auto_battle_detect_enable:
+            conditions.insert(2, ImageCondition("./assets/images/share/base/not_auto.png", 0.9, crop=(0.0 / 1920, 903.0 / 1080, 144.0 / 1920, 120.0 / 1080), name="not_auto"))
+
+        end_time = time.time() + timeout
+        while time.time() < end_time:
+            condition = auto.wait_for_any(conditions, end_time - time.time(), interval=0.5)
+            if condition is None:
+                break
+            if condition.name == "fight_again":
                 log.info("战斗完成")
                 log.info(f"第{num}次副本完成")
                 return True
-            elif auto.find_element("./assets/images/zh_CN/fight/fight_fail.png", "image", 0.9):
+            elif condition.name == "fight_fail":
                 log.info("战斗失败")
                 log.info(f"获取剩余体力并重新计算轮次")
                 return False
-            elif cfg.auto_battle_detect_enable and auto.find_element("./assets/images/share/base/not_auto.png", "image", 0.9, crop=(0.0 / 1920, 903.0 / 1080, 144.0 / 1920, 120.0 / 1080)):
+            elif condition.name == "not_auto":
                 log.info("尝试开启自动战斗")
                 auto.press_key("v")
-            elif auto.find_element("已处于无法战斗状态", "text", max_retries=1, include=True, threshold=0.7):
+            elif condition.name == "unable_to_fight":
                 log.info("队伍中存在无法战斗的角色，尝试继续战斗。")
                 auto.click_element("./assets/images/zh_CN/base/confirm.png", "image", 0.9)
-            # 检测遗器背包已满的提示
-            # 每次战斗检测循环中进行多次快速检测
-            for _ in range(3):
-                if auto.find_element("背包内遗器持有数量已达上限", "text", max_retries=1, include=True, threshold=0.7):
-                    log.info("检测到背包内遗器已满，准备进行分解")
-                    auto.click_element("./assets/images/zh_CN/base/confirm.png", "image", 0.9)
-                    time.sleep(0.5)
-                    # 执行分解四星遗器的操作
-                    Relicset.run()
-
-                    # 简化处理：直接返回失败允许重试
-                    log.info("战斗中检测到遗器已满并完成分解，返回战斗失败状态")
-
-                    # 直接返回失败，让上层逻辑处理重新开始战斗
-                    return False
+            elif condition.name == "relic_full":
+                log.info("检测到背包内遗器已满，准备进行分解")
+                auto.click_element("./assets/images/zh_CN/base/confirm.png", "image", 0.9)
+                time.sleep(0.5)
+                # 执行分解四星遗器的操作
+                Relicset.run()
 
-                time.sleep(0.1)
+                # 简化处理：直接返回失败允许重试
+                log.info("战斗中检测到遗器已满并完成分解，返回战斗失败状态")
 
+                # 直接返回失败，让上层逻辑处理重新开始战斗
+                return False
+            # 等待操作生效后再继续检测
             time.sleep(2)
 
         log.error("战斗超时")
@@ -2,6 +2,7 @@ from module.screen import screen
 from module.automation import auto
 from module.logger import log
 from module.config import cfg
+from module.ocr import DigitField
 from tasks.power.instance import Instance
 #from tasks.weekly.universe import Universe
 from tasks.daily.buildtarget import BuildTarget
@@ -9,6 +10,8 @@ import time
 
 
 class Power:
+    TRAILBLAZE_POWER_FIELD = DigitField("trailblaze_power", charset="0123456789/", pattern=r"\d{1,3}/\d{3}")  # 开拓力，格式为 当前/上限
+
     @staticmethod
     def run():
         Power.preprocess()
@@ -306,8 +309,8 @@ class Power:
         def get_power(crop, type="trailblaze_power"):
             try:
                 if type == "trailblaze_power":
-                    result = auto.get_single_line_text(
-                        crop=crop, blacklist=['+', '米', '*'], max_retries=3)
+                    result = auto.get_digit_text(
+                        Power.TRAILBLAZE_POWER_FIELD, crop=crop, blacklist=['+', '米', '*'], max_retries=3)
                     power = int(result.replace("1300", "/300").replace("?", "").split('/')[0])
                     return power if 0 <= power <= 999 else 0
                 elif type == "reserved_trailblaze_power":
@@ -67,7 +67,7 @@ class RewardManager:
 
     def _find_reward(self, image_path, confidence, crop):
         screen.change_to('menu')
-        return auto.find_element(image_path, "image", confidence, crop=crop)
+        return auto.find_element(image_path, "pixels", confidence, crop=crop)
 
 
 def start():
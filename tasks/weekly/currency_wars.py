@@ -1,5 +1,6 @@
 from module.screen import screen
 from module.automation import auto
+from module.ocr import DigitField
 from module.config import cfg
 from module.logger import log
 from module.notification.notification import NotificationLevel
@@ -20,6 +21,9 @@ class CurrencyWarsCharacter:
 
 
 class CurrencyWars:
+    LEVEL_FIELD = DigitField("currency_wars_level", charset="013456789", pattern=r"\d{1,2}")  # 当前等级，范围 3-10，不会出现 2
+    MONEY_FIELD = DigitField("currency_wars_money", pattern=r"\d{1,4}")  # 货币数量
+
     def __init__(self):
         self.screenshot = None  # 任务截图
         self.peipei_count: int = 0  # 佩佩和叽米
@@ -889,7 +893,7 @@ class CurrencyWars:
         识别当前角色等级
         """
         level_crop = (235.0 / 1920, 876.0 / 1080, 125.0 / 1920, 60.0 / 1080)
-        result = auto.get_single_line_text(crop=level_crop)
+        result = auto.get_digit_text(self.LEVEL_FIELD, crop=level_crop)
         if result:
             digits = ''.join(filter(str.isdigit, result))
             if digits.isdigit():
@@ -915,9 +919,10 @@ class CurrencyWars:
             if money >= 4:
                 times = min(money // 4, 10)
                 log.info(f"连续购买经验 {times} 次")
+                sequence = auto.input_sequence().focus()
                 for _ in range(times):
-                    auto.press_key("f")
-                    time.sleep(0.1)
+                    sequence.press_key("f", 0.05).wait(0.05)
+                sequence.dispatch()
                 time.sleep(2)
 
                 # 检查货币是否有变化
@@ -939,7 +944,7 @@ class CurrencyWars:
         检查当前货币数量
         """
         money_crop = (1559.0 / 1920, 880.0 / 1080, 127.0 / 1920, 82.0 / 1080)
-        money = auto.get_single_line_text(crop=money_crop, blacklist=['V'])
+        money = auto.get_digit_text(self.MONEY_FIELD, crop=money_crop, blacklist=['V'])
         if money:
             try:
                 money_int = int(money)
@@ -1048,8 +1053,14 @@ class CurrencyWars:
         char_money_crop = (1831.0 / 1920, 188.0 / 1080, 35.0 / 1920, 42.0 / 1080)
 
         auto.click_element(pos, "crop")
-        time.sleep(0.5)
-        name = auto.get_single_line_text(crop=char_name_crop)
+        # 点击前截取的画面作为参照，角色信息面板出现变化后立即识别，最多等待 0.5 秒；
+        # 名称和费用在这一张完整截图中一次识别，站位也在该截图上判断
+        frame = auto.frame_after(min_change=0.05, crop=char_name_crop, timeout=0.5, full_frame=True)
+        if frame is None:
+            # 面板没有变化（如重复点击同一个角色），使用超时前的最后一帧
+            frame = auto.frame
+        fields = auto.read_fields({"name": char_name_crop, "money": char_money_crop}, frame=frame)
+        name = fields["name"] or auto.get_single_line_text(crop=char_name_crop, max_retries=2)
         if name:
             # 检查缓存中是否已有该角色信息
             if name in self.character_info_cache:
@@ -1058,13 +1069,14 @@ class CurrencyWars:
                 return self.character_info_cache[name]
 
             # 首次识别该角色,获取完整信息并缓存
-            if auto.find_element("./assets/images/screen/currency_wars/pos_forward.png", "image", 0.9, crop=char_pos_crop):
+            auto.use_frame(frame, char_pos_crop)
+            if auto.find_element("./assets/images/screen/currency_wars/pos_forward.png", "image", 0.9, crop=char_pos_crop, take_screenshot=False):
                 pos = "forward"
-            elif auto.find_element("./assets/images/screen/currency_wars/pos_backward.png", "image", 0.9, crop=char_pos_crop):
+            elif auto.find_element("./assets/images/screen/currency_wars/pos_backward.png", "image", 0.9, crop=char_pos_crop, take_screenshot=False):
                 pos = "backward"
             else:
                 pos = "all"
-            money = auto.get_single_line_text(crop=char_money_crop)
+            money = fields["money"]
             if not money or not money.isdigit():
                 log.error(f"无法识别角色 {name} 的费用信息，默认为 1")
                 money = "1"
@@ -1090,7 +1102,7 @@ class CurrencyWars:
         """
         检查并开启自动战斗
         """
-        if cfg.auto_battle_detect_enable and auto.find_element("./assets/images/share/base/not_auto.png", "image", 0.9, crop=(0.0 / 1920, 903.0 / 1080, 144.0 / 1920, 120.0 / 1080)):
+        if cfg.auto_battle_detect_enable and auto.find_element("./assets/images/share/base/not_auto.png", "pixels", 0.9, crop=(0.0 / 1920, 903.0 / 1080, 144.0 / 1920, 120.0 / 1080)):
             log.info("尝试开启自动战斗")
             auto.press_key("v")
 
@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("selenium")  # module.automation 包在导入时需要 selenium
+
+from module.automation.color_mask import ColorMask
+
+
+def test_mask_agrees_with_per_channel_squared_distance():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        color = [int(c) for c in rng.integers(0, 256, size=3)]
+        bgr = rng.integers(0, 256, size=(40, 60, 3), dtype=np.uint8)
+        # 一半像素取目标颜色附近的值，覆盖距离阈值边界和 0/255 附近的溢出情况
+        near = np.clip(np.array(color) + rng.integers(-40, 41, size=(40, 30, 3)), 0, 255)
+        bgr[:, :30] = near.astype(np.uint8)
+        expected = np.zeros(bgr.shape[:2], dtype=np.uint8)
+        expected[np.sum((bgr - color) ** 2, axis=-1) <= 800] = 255
+        assert np.array_equal(ColorMask.mask(bgr, color), expected)
@@ -0,0 +1,64 @@
+import cv2
+import numpy as np
+from module.ocr.digit_reader import DigitReader, DigitField
+
+
+def render(text):
+    image = np.full((60, 220, 3), (40, 30, 20), np.uint8)
+    cv2.putText(image, text, (8, 45), cv2.FONT_HERSHEY_SIMPLEX, 1.3, (230, 240, 250), 3, cv2.LINE_AA)
+    return image
+
+
+class FakeOCR:
+    """按预设文字返回结果的OCR，记录调用次数"""
+
+    def __init__(self):
+        self.text = None
+        self.calls = 0
+
+    def to_bgr(self, image):
+        return image
+
+    def recognize_single_line(self, image, blacklist=None):
+        self.calls += 1
+        return self.text, 0.99
+
+
+def learn(reader, ocr, field, texts):
+    for text in texts:
+        ocr.text = text
+        assert reader.recognize(field, render(text)) == (text, 0.99)
+
+
+def test_unknown_glyph_falls_back_to_ocr():
+    ocr = FakeOCR()
+    reader = DigitReader(ocr)
+    field = DigitField("money")
+    learn(reader, ocr, field, ["123", "456", "789"])  # 除 "0" 以外的数字都已学习
+
+    assert reader.read(field, reader.segment(render("80"))) is None
+    ocr.text, ocr.calls = "80", 0
+    assert reader.recognize(field, render("80")) == ("80", 0.99)
+    assert ocr.calls == 1
+
+
+def test_reads_locally_once_charset_is_complete():
+    ocr = FakeOCR()
+    reader = DigitReader(ocr)
+    field = DigitField("money")
+    learn(reader, ocr, field, ["123", "456", "789", "10"])
+
+    ocr.calls = 0
+    text, score = reader.recognize(field, render("907"))
+    assert text == "907" and score >= field.min_score
+    assert ocr.calls == 0
+
+
+def test_pattern_rejects_local_result():
+    ocr = FakeOCR()
+    reader = DigitReader(ocr)
+    field = DigitField("power", charset="0123456789/", pattern=r"\d{1,3}/\d{3}")
+    learn(reader, ocr, field, ["12/345", "67/890"])
+
+    assert reader.read(field, reader.segment(render("240/300")))[0] == "240/300"
+    assert reader.read(field, reader.segment(render("1234"))) is None
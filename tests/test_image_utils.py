@@ -0,0 +1,36 @@
+import numpy as np
+
+from utils.image_utils import ImageUtils
+
+
+def test_pyramid_match_agrees_with_exact_match_on_cluttered_frames():
+    results = ImageUtils.benchmark_pyramid_match(count=6, seed=1)
+    assert results["cases"] == 18
+    assert results["mismatches"] == []
+
+
+def test_pyramid_match_agrees_with_exact_match_on_low_contrast_templates():
+    # 低对比度、缩放后细节较少的模板，曾在粗匹配中找不到真正的位置
+    templates = [
+        "./assets/images/apocalyptic/team.png",
+        "./assets/images/share/menu/mail.png",
+        "./assets/images/zh_CN/relicset/enter_break.png",
+        "./assets/images/share/synthesis/nuclear_selected.png",
+    ]
+    results = ImageUtils.benchmark_pyramid_match(frame_size=(1920, 1080), seed=2, templates=templates)
+    assert results["cases"] == 12
+    assert results["mismatches"] == []
+
+
+def test_filter_overlapping_matches_agrees_with_pairwise_loop():
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        height, width = rng.integers(5, 60, size=2)
+        result = rng.random((height, width))
+        locations = np.where(result >= rng.uniform(0.3, 0.99))
+        template_size = tuple(int(v) for v in rng.integers(1, 12, size=2))
+        expected = []
+        for top_left in zip(*locations[::-1]):
+            if ImageUtils.is_match_non_overlapping(top_left, expected, *template_size):
+                expected.append(top_left)
+        assert ImageUtils.filter_overlapping_matches(locations, template_size) == expected
@@ -0,0 +1,15 @@
+from module.ocr.replacer import OcrReplacer
+
+
+def test_replacer_matches_sequential_replace_on_real_tables():
+    results = OcrReplacer.benchmark(batches=1, fuzz_count=20000, seed=1)
+    assert results["texts"] > 20000
+    assert results["mismatches"] == []
+
+
+def test_replacer_matches_sequential_replace_on_chained_tables():
+    # 前面的替换产生后面配置的待替换字符串、条件替换、替换为空字符串
+    replacements = {"direct": {"ab": "b", "b": "ca", "cc": ""}, "conditional": {"a": "ba", "c": "b"}}
+    replacer = OcrReplacer(replacements)
+    for text in ["", "a", "ab", "aab", "abcc", "bba", "ccab", "cab", "bca", "ba"]:
+        assert replacer.apply(text) == OcrReplacer.replace_sequential(replacements, text)
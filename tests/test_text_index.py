@@ -0,0 +1,43 @@
+from module.ocr.text_index import OcrTextIndex
+
+
+def make_results(*texts):
+    return [[[[0, i * 40], [100, i * 40], [100, i * 40 + 30], [0, i * 40 + 30]], (text, 0.95)] for i, text in enumerate(texts)]
+
+
+def test_exact_match_keeps_ocr_order():
+    index = OcrTextIndex(make_results("领取", "开始挑战", "开始挑战"))
+    hits = index.query(["开始挑战"], include=False)
+    assert [hit.index for hit in hits] == [1, 2]
+    assert all(hit.distance == 0 for hit in hits)
+
+
+def test_normalizes_full_and_half_width():
+    index = OcrTextIndex(make_results("拟造花萼(赤)", "ABC"))
+    assert index.query("拟造花萼（赤）", max_distance=0)[0].index == 0
+    assert index.query("ＡＢＣ", max_distance=0)[0].index == 1
+
+
+def test_fuzzy_match_prefers_exact_line():
+    index = OcrTextIndex(make_results("拟造花萼（金）", "拟造花萼（赤）"))
+    hits = index.query("拟造花萼（赤）")
+    assert [hit.index for hit in hits] == [1]
+
+
+def test_fuzzy_match_rejects_calyx_tie():
+    # "赤" 被误识别后，与 "金" 那一行的编辑距离相同，不能按OCR顺序选中 "金"
+    index = OcrTextIndex(make_results("拟造花萼（金）", "拟造花萼（亦）"))
+    assert index.query("拟造花萼（赤）") == []
+    assert index.query("拟造花萼（赤）", include=True) == []
+
+
+def test_fuzzy_match_accepts_unique_closest_line():
+    index = OcrTextIndex(make_results("蛀星的旧膚", "幽冥之径"))
+    hits = index.query("蛀星的旧靥")
+    assert len(hits) == 1 and hits[0].index == 0 and hits[0].distance == 1
+
+
+def test_short_and_numeric_targets_stay_exact():
+    index = OcrTextIndex(make_results("07", "开始战斗"))
+    assert index.query("01") == []
+    assert index.query("开始挑战") == []
@@ -1,9 +1,17 @@
+import os
 import math
 import cv2
 import numpy as np
 
 
 class ImageUtils:
+    PYRAMID_MIN_TEMPLATE_SIZE = 12  # 缩小后模板的最短边不能小于该值（像素），否则细节丢失过多
+    PYRAMID_MIN_AREA_RATIO = 16  # 截图面积至少为模板面积的该倍数时才使用金字塔匹配
+    PYRAMID_CANDIDATES = 3  # 粗匹配后在原分辨率下精确匹配的最少候选位置数量
+    PYRAMID_MAX_CANDIDATES = 10  # 粗匹配得分与最高分接近的位置较多时，最多精确匹配的候选位置数量
+    PYRAMID_CANDIDATE_MARGIN = 0.15  # 粗匹配得分与最高分相差不超过该值的位置都作为候选
+    PYRAMID_FALLBACK_MARGIN = 0.1  # 精确匹配未达到阈值，但粗匹配得分距阈值不超过该值时，回退到全图匹配
+
     @staticmethod
     def get_image_info(image_path):
         """
@@ -15,7 +23,105 @@ class ImageUtils:
         return template.shape[::-1]
 
     @staticmethod
-    def scale_and_match_template(screenshot, template, threshold=None, scale_range=None, mask=None):
+    def resize_template(template, scale, cache=None):
+        """
+        缩放模板图片。
+        :param template: 模板图片。
+        :param scale: 缩放比例。
+        :param cache: 缩放结果缓存字典，传入时相同模板和比例只缩放一次，通常为 Template.resize_cache。
+        :return: 缩放后的模板图片。
+        """
+        if cache is None:
+            return cv2.resize(template, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        key = (id(template), round(float(scale), 4))
+        entry = cache.get(key)
+        if entry is None or entry[0] is not template:
+            # 同时保存原模板的引用，保证 id 在缓存有效期内不会被复用
+            entry = (template, cv2.resize(template, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA))
+            cache[key] = entry
+        return entry[1]
+
+    @staticmethod
+    def pyramid_factor(screenshot_shape, template_shape):
+        """
+        选择金字塔匹配的缩小倍数。
+        :param screenshot_shape: 截图的形状。
+        :param template_shape: 模板的形状。
+        :return: 缩小倍数，1 表示不适合使用金字塔匹配。
+        """
+        template_height, template_width = template_shape[:2]
+        screenshot_height, screenshot_width = screenshot_shape[:2]
+        if screenshot_height * screenshot_width < ImageUtils.PYRAMID_MIN_AREA_RATIO * template_height * template_width:
+            return 1
+        for factor in (4, 2):
+            if min(template_height, template_width) / factor >= ImageUtils.PYRAMID_MIN_TEMPLATE_SIZE:
+                return factor
+        return 1
+
+    @staticmethod
+    def pyramid_downscale(image, factor, cache=None):
+        """
+        金字塔匹配使用的缩小：先裁掉不足 factor 的边缘行列，再按整数倍缩小，截图和模板缩小后的每个像素都对应原图中对齐的 factor×factor 块。
+        直接按 1/factor 缩放时尺寸会四舍五入（如 43 行缩为 22 行），模板的实际缩放比例与截图不一致，低对比度的模板在粗匹配中会找不到。
+        :param image: 截图或模板图片。
+        :param factor: 缩小倍数。
+        :param cache: 缩小结果缓存字典，可选，通常为 Template.resize_cache。
+        :return: 缩小后的图片。
+        """
+        height, width = image.shape[:2]
+        if cache is None:
+            return cv2.resize(image[:height - height % factor, :width - width % factor], (width // factor, height // factor), interpolation=cv2.INTER_AREA)
+        key = (id(image), "pyramid", factor)
+        entry = cache.get(key)
+        if entry is None or entry[0] is not image:
+            entry = (image, ImageUtils.pyramid_downscale(image, factor))
+            cache[key] = entry
+        return entry[1]
+
+    @staticmethod
+    def pyramid_match_template(screenshot, template, factor, screenshot_small=None, template_cache=None):
+        """
+        金字塔匹配：先在缩小的截图上找出得分最高的几个位置，再只在这些位置附近以原分辨率精确匹配。
+        :param screenshot: 截图。
+        :param template: 模板图片。
+        :param factor: 缩小倍数。
+        :param screenshot_small: 已缩小的截图，可选，不传时在函数内缩小。
+        :param template_cache: 模板缩放结果缓存，可选。
+        :return: 最大匹配值、最佳匹配位置和粗匹配的最高得分。
+        """
+        if screenshot_small is None:
+            screenshot_small = ImageUtils.pyramid_downscale(screenshot, factor)
+        template_small = ImageUtils.pyramid_downscale(template, factor, template_cache)
+        result = cv2.matchTemplate(screenshot_small, template_small, cv2.TM_CCOEFF_NORMED)
+
+        template_height, template_width = template.shape[:2]
+        small_height, small_width = template_small.shape[:2]
+        screenshot_height, screenshot_width = screenshot.shape[:2]
+        pad = factor + 2  # 覆盖缩小带来的坐标误差
+        max_val, max_loc, coarse_val = -math.inf, (0, 0), -math.inf
+        for index in range(ImageUtils.PYRAMID_MAX_CANDIDATES):
+            _, local_coarse_val, _, (x, y) = cv2.minMaxLoc(result)
+            if not math.isfinite(local_coarse_val) or local_coarse_val <= -1:
+                break
+            # 界面中相似的元素较多时，真正的位置在缩小后不一定得分最高，得分接近的位置都需要精确匹配
+            if index >= ImageUtils.PYRAMID_CANDIDATES and local_coarse_val < coarse_val - ImageUtils.PYRAMID_CANDIDATE_MARGIN:
+                break
+            coarse_val = max(coarse_val, local_coarse_val)
+            # 抑制该位置附近的得分，下一个候选取其他区域
+            result[max(0, y - small_height // 2):y + small_height // 2 + 1, max(0, x - small_width // 2):x + small_width // 2 + 1] = -1
+
+            left, top = max(0, x * factor - pad), max(0, y * factor - pad)
+            right = min(screenshot_width, x * factor + template_width + pad)
+            bottom = min(screenshot_height, y * factor + template_height + pad)
+            refined = cv2.matchTemplate(screenshot[top:bottom, left:right], template, cv2.TM_CCOEFF_NORMED)
+            _, local_max_val, _, local_max_loc = cv2.minMaxLoc(refined)
+            if local_max_val > max_val:
+                max_val = local_max_val
+                max_loc = (left + local_max_loc[0], top + local_max_loc[1])
+        return max_val, max_loc, coarse_val
+
+    @staticmethod
+    def scale_and_match_template(screenshot, template, threshold=None, scale_range=None, mask=None, pyramid=False, template_cache=None):
         """
         对模板进行缩放并匹配至截图，找出最佳匹配位置。
         :param screenshot: 截图。
@@ -23,6 +129,8 @@ class ImageUtils:
         :param threshold: 匹配阈值，小于此值的匹配将被忽略。
         :param scale_range: 缩放范围，格式为(start_scale, end_scale)。
         :param mask: 模板的掩码，用于匹配透明区域。
+        :param pyramid: 是否使用金字塔匹配（先缩小匹配再局部精确匹配），仅对无掩码的模板生效。
+        :param template_cache: 模板缩放结果缓存，可选。
         :return: 最大匹配值和最佳匹配位置。
         """
         if mask is not None:
@@ -32,13 +140,15 @@ class ImageUtils:
             result = cv2.matchTemplate(screenshot, template, cv2.TM_SQDIFF, mask=mask) 
             min_val, _, min_loc, _ = cv2.minMaxLoc(result)
             return min_val, min_loc
-        else:
-            result = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
+        if pyramid:
+            return ImageUtils._pyramid_scale_and_match_template(screenshot, template, threshold, scale_range, template_cache)
+
+        result = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
         _, max_val, _, max_loc = cv2.minMaxLoc(result)
 
         if scale_range and (math.isinf(max_val) or threshold is None or max_val < threshold):
             for scale in np.arange(scale_range[0], scale_range[1] + 0.0001, 0.05):
-                scaled_template = cv2.resize(template, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+                scaled_template = ImageUtils.resize_template(template, scale, template_cache)
                 result = cv2.matchTemplate(screenshot, scaled_template, cv2.TM_CCOEFF_NORMED)
                 _, local_max_val, _, local_max_loc = cv2.minMaxLoc(result)
 
@@ -49,17 +159,57 @@ class ImageUtils:
         return max_val, max_loc
 
     @staticmethod
-    def scale_and_match_template_with_multiple_targets(screenshot, template, threshold=None, scale=None):
+    def _pyramid_scale_and_match_template(screenshot, template, threshold, scale_range, template_cache=None):
+        """
+        scale_and_match_template 的金字塔匹配实现。
+        缩放查找时每个缩放比例都做粗匹配，并在各自的候选位置附近以原分辨率精确匹配；
+        相邻比例的粗匹配得分相差很小，不能用来排除比例。
+        精确匹配未达到阈值、但粗匹配得分接近阈值时，回退到原有的全图匹配，保证结果一致。
+        """
+        small_cache = {}
+
+        def match(scaled_template):
+            factor = ImageUtils.pyramid_factor(screenshot.shape, scaled_template.shape)
+            if factor == 1:
+                result = cv2.matchTemplate(screenshot, scaled_template, cv2.TM_CCOEFF_NORMED)
+                _, max_val, _, max_loc = cv2.minMaxLoc(result)
+                return max_val, max_loc, max_val
+            if factor not in small_cache:
+                small_cache[factor] = ImageUtils.pyramid_downscale(screenshot, factor)
+            return ImageUtils.pyramid_match_template(screenshot, scaled_template, factor, small_cache[factor], template_cache)
+
+        def near_threshold(coarse_val):
+            return threshold is not None and coarse_val >= threshold - ImageUtils.PYRAMID_FALLBACK_MARGIN
+
+        max_val, max_loc, coarse_val = match(template)
+        fallback = near_threshold(coarse_val)
+
+        if scale_range and (math.isinf(max_val) or threshold is None or max_val < threshold):
+            for scale in np.arange(scale_range[0], scale_range[1] + 0.0001, 0.05):
+                scaled_template = ImageUtils.resize_template(template, scale, template_cache)
+                local_max_val, local_max_loc, local_coarse_val = match(scaled_template)
+                fallback = fallback or near_threshold(local_coarse_val)
+                if local_max_val > max_val:
+                    max_val = local_max_val
+                    max_loc = local_max_loc
+
+        if threshold is not None and max_val < threshold and fallback:
+            return ImageUtils.scale_and_match_template(screenshot, template, threshold, scale_range, template_cache=template_cache)
+        return max_val, max_loc
+
+    @staticmethod
+    def scale_and_match_template_with_multiple_targets(screenshot, template, threshold=None, scale=None, template_cache=None):
         """
         对模板进行缩放并匹配至截图，找出最佳匹配位置。
         :param screenshot: 截图。
         :param template: 模板图片。
         :param threshold: 匹配阈值，小于此值的匹配将被忽略。
         :param scale: 缩放值。
+        :param template_cache: 模板缩放结果缓存，可选。
         :return: 匹配位置。
         """
         if scale is not None:
-            template = cv2.resize(template, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            template = ImageUtils.resize_template(template, scale, template_cache)
         result = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
         locations = np.where(result >= threshold)
         matches = ImageUtils.filter_overlapping_matches(locations, template.shape[::-1])
@@ -135,18 +285,31 @@ class ImageUtils:
     def filter_overlapping_matches(locations, template_size):
         """过滤掉重叠的匹配。
 
+        按行优先顺序依次保留与已保留匹配都不重叠的位置，结果与逐个调用 is_match_non_overlapping 一致。
+        每保留一个匹配后，用 NumPy 一次性排除其下方 height 行内与它重叠的候选，
+        循环次数只与保留的匹配数量有关，与候选数量无关。
+
         参数:
-        - locations: 匹配的位置数组。
+        - locations: 匹配的位置数组，np.where 的返回值，已按行优先排序。
         - template_size: 模板图片的大小 (宽度, 高度)。
 
         返回:
-        - matches: 不重叠的匹配位置列表。
+        - matches: 不重叠的匹配位置列表，元素为 (x, y)。
         """
-        matches = []
         width, height = template_size
-        for top_left in zip(*locations[::-1]):
-            if ImageUtils.is_match_non_overlapping(top_left, matches, width, height):
-                matches.append(top_left)
+        ys, xs = np.asarray(locations[0]), np.asarray(locations[1])
+        alive = np.ones(ys.size, dtype=bool)
+        matches = []
+        index = 0
+        while index < ys.size:
+            x, y = xs[index], ys[index]
+            matches.append((x, y))
+            # 之后的候选中只有 y 不超过 y + height 的可能与当前匹配重叠
+            end = int(np.searchsorted(ys, y + height, side="right"))
+            window = slice(index + 1, end)
+            alive[window] &= np.abs(xs[window] - x) > width
+            remaining = np.flatnonzero(alive[window])
+            index = index + 1 + int(remaining[0]) if remaining.size else end
         return matches
 
     @staticmethod
@@ -173,3 +336,81 @@ class ImageUtils:
     @staticmethod
     def convert_np_int64_to_int(matches):
         return [(int(a), int(b)) for a, b in matches]
+
+    @staticmethod
+    def benchmark_pyramid_match(image_dir="./assets/images", count=10, frame_size=(960, 540), threshold=0.9, seed=1, templates=None, logger=None):
+        """
+        比较金字塔匹配与原分辨率匹配的结果和耗时。
+        背景画面由其他模板图片随机铺满，模拟界面中相似元素、相似纹理很多的情况；
+        每张模板分别以原尺寸贴到背景上、放大 1.1 倍贴上并按 (0.9, 1.2) 缩放查找、或不贴（不存在），
+        两种方式的找到/未找到判断必须一致，找到时相似度相差不超过 0.01、位置相差不超过 2 像素。
+        :param image_dir: 模板图片目录。
+        :param count: 随机选取的模板数量。
+        :param frame_size: 背景画面的宽、高。
+        :param threshold: 匹配阈值。
+        :param seed: 随机种子，相同的种子得到相同的测试用例。
+        :param templates: 指定的模板路径列表，为None时从模板图片目录中随机选取 count 张。
+        :param logger: 用于输出结果的Logger对象，可选参数。
+        :return: 字典，包含用例数 cases、结果不一致的用例 mismatches（模板路径, 用例类型）、
+                 原分辨率匹配总耗时 exact_time 和金字塔匹配总耗时 pyramid_time（秒）。
+        """
+        import glob
+        import time
+        rng = np.random.default_rng(seed)
+        width, height = frame_size
+        images, candidates = [], []
+        for path in sorted(glob.glob(f"{image_dir}/**/*.png", recursive=True)):
+            image = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+            if image is None or image.ndim != 3 or image.shape[0] >= height or image.shape[1] >= width:
+                continue
+            images.append((os.path.normpath(path), image[:, :, :3]))
+            if image.shape[2] == 3 and min(image.shape[:2]) >= 20 and max(image.shape[:2]) <= 200:
+                candidates.append(images[-1])
+        if templates is None:
+            selected = [candidates[i] for i in rng.choice(len(candidates), min(count, len(candidates)), replace=False)]
+        else:
+            selected = [(os.path.normpath(path), cv2.imread(path, cv2.IMREAD_COLOR)) for path in templates]
+
+        def paste(frame, image):
+            x = int(rng.integers(0, width - image.shape[1]))
+            y = int(rng.integers(0, height - image.shape[0]))
+            frame[y:y + image.shape[0], x:x + image.shape[1]] = image
+
+        def background(exclude):
+            frame = np.full((height, width, 3), 30, dtype=np.uint8)
+            for _ in range(width * height // 2500):
+                path, image = images[rng.integers(len(images))]
+                if path != exclude:
+                    paste(frame, image)
+            return frame
+
+        results = {"cases": 0, "mismatches": [], "exact_time": 0.0, "pyramid_time": 0.0}
+        for path, template in selected:
+            for case in ("present", "scaled", "absent"):
+                frame, scale_range = background(path), None
+                if case != "absent":
+                    placed = template if case == "present" else cv2.resize(template, None, fx=1.1, fy=1.1, interpolation=cv2.INTER_AREA)
+                    scale_range = (0.9, 1.2) if case == "scaled" else None
+                    paste(frame, placed)
+
+                start_time = time.perf_counter()
+                exact_val, exact_loc = ImageUtils.scale_and_match_template(frame, template, threshold, scale_range)
+                results["exact_time"] += time.perf_counter() - start_time
+                start_time = time.perf_counter()
+                pyramid_val, pyramid_loc = ImageUtils.scale_and_match_template(frame, template, threshold, scale_range, pyramid=True)
+                results["pyramid_time"] += time.perf_counter() - start_time
+
+                found = exact_val >= threshold
+                same = found == (pyramid_val >= threshold) and (not found or (
+                    abs(exact_val - pyramid_val) <= 0.01 and abs(exact_loc[0] - pyramid_loc[0]) <= 2 and abs(exact_loc[1] - pyramid_loc[1]) <= 2))
+                results["cases"] += 1
+                if not same:
+                    results["mismatches"].append((path, case))
+
+        if logger is not None:
+            speedup = results["exact_time"] / results["pyramid_time"] if results["pyramid_time"] else 0.0
+            logger.info(f"金字塔匹配：{results['cases']} 个用例，结果不一致 {len(results['mismatches'])} 个，"
+                        f"原分辨率 {results['exact_time']:.2f}s，金字塔 {results['pyramid_time']:.2f}s，加速 {speedup:.1f} 倍")
+            for path, case in results["mismatches"]:
+                logger.warning(f"金字塔匹配结果不一致：{path} {case}")
+        return results